@@ -15,6 +15,99 @@ class CommonConstants:
     # Email Constants
     DURIANPY_CC_EMAIL = 'durianpy.davao@gmail.com'
 
+    # SMTP Constants
+    SMTP_PORT = 587
+    SENDGRID_SMTP_HOST = 'smtp.sendgrid.net'
+    SMTP_SERVICE_DAILY_FREE_TIER_LIMIT = 100
+    SES_DAILY_SEND_QUOTA = 200
+    SMTP_THROTTLING_CODES = (421, 454)
+    INITIAL_SEND_CONCURRENCY = 4
+    MAX_SEND_CONCURRENCY = 16
+    SMTP_TIMEOUT_SECONDS = 30
+    MIN_MESSAGE_TIMEOUT_SECONDS = 1
+    SMTP_POOL_MAX_IDLE_SECONDS = 10
+    SMTP_POOL_MAX_MESSAGES = 100
+
+    # Pipeline Constants
+    RENDER_WORKERS = 2
+    REGISTRATION_WRITERS = 4
+    PIPELINE_QUEUE_SIZE = 32
+
+    # Sender Shard Constants
+    DEFAULT_SENDER_SHARD_ID = 'default'
+    SENDER_SHARD_VIRTUAL_NODES = 100
+
+    # Lane Constants
+    TRANSACTIONAL_LANE_WEIGHT = 4
+    BULK_LANE_WEIGHT = 1
+    BULK_SENDS_PER_SECOND = 5
+    TRANSACTIONAL_QUOTA_RESERVE = 50
+
+    # Send Window Constants
+    SEND_WINDOW_SECONDS = 86400
+    SEND_WINDOW_RELEASE_INTERVAL_SECONDS = 3600
+    SEND_WINDOW_MAX_RELEASE = 500
+    SCHEDULED_EMAIL_TTL_SECONDS = 604800
+    SCHEDULED_EMAIL_KEY_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+    # Delivery Ledger Constants
+    DELIVERY_LOG_TTL_SECONDS = 2592000
+    DELIVERY_LOG_FLUSH_SIZE = 100
+    DELIVERY_LOG_MAX_BUFFER_SIZE = 1000
+    DELIVERY_LOG_KEY_SHARDS = 10
+
+    # Campaign Constants
+    CAMPAIGN_PAGE_SIZE = 100
+    CAMPAIGN_SEND_CHUNK_SIZE = 25
+    CAMPAIGN_CHECKPOINT_TTL_SECONDS = 604800
+
+    # Envelope Constants
+    ENVELOPE_VERSION = 1
+    ENVELOPE_GZIP_ENCODING = 'gzip+base64'
+    ENVELOPE_READ_CHUNK_BYTES = 65536
+    ENVELOPE_MESSAGE_CHUNK_SIZE = 100
+
+    # Attachment Constants
+    ATTACHMENT_READ_CHUNK_BYTES = 57 * 4096  # a multiple of 57 bytes encodes to whole 76 character base64 lines
+    ATTACHMENT_CACHE_SIZE = 8
+    ATTACHMENTS_DIR = '.'
+    DEFAULT_ATTACHMENT_CONTENT_TYPE = 'application/octet-stream'
+
+    # Validation Constants
+    EMAIL_ADDRESS_CACHE_SIZE = 4096
+
+    # Idempotency Constants
+    IDEMPOTENCY_CACHE_SIZE = 10000
+    IDEMPOTENCY_TTL_SECONDS = 172800
+
+    # Suppression Constants
+    SUPPRESSION_BLOOM_ERROR_RATE = 0.001
+    SUPPRESSION_MIN_CAPACITY = 1000
+    SUPPRESSION_REFRESH_SECONDS = 900
+
+    # Metrics Constants
+    METRICS_NAMESPACE = 'SparcsEmailService'
+    METRICS_SERVICE = 'sparcs-email'
+    EMF_MAX_VALUES = 100
+
+    # Profiling Constants
+    PROFILE_DIR = '/tmp/profiles'  # nosec B108
+    PROFILE_TOP_N = 25
+    PROFILE_TRACEBACK_DEPTH = 1
+    PROFILE_LOG_PREFIX = 'PROFILE'
+
+    # Worker Constants
+    WORKER_BATCH_SIZE = 10
+    WORKER_WAIT_TIME_SECONDS = 20
+    WORKER_VISIBILITY_TIMEOUT_SECONDS = 120
+    WORKER_BATCH_TIMEOUT_MS = 900000
+
+    # Lambda Constants
+    TIME_BUDGET_SAFETY_MARGIN_MS = 45000
+
+    # Async DynamoDB Constants
+    ASYNC_DYNAMODB_MAX_CONNECTIONS = 50
+
     # DB Constants
     CLS = 'cls'
     HASH_KEY = 'hashKey'
@@ -53,3 +146,53 @@ class EmailType(str, Enum):
     EVALUATION_EMAIL = 'evaluationEmail'
     EVENT_CREATION_EMAIL = 'eventCreationEmail'
     ADMIN_INVITATION_EMAIL = 'adminInvitationEmail'
+
+
+class EmailLane(str, Enum):
+    TRANSACTIONAL = 'transactional'
+    BULK = 'bulk'
+
+
+class EmailProvider(str, Enum):
+    SES = 'ses'
+    SENDGRID = 'sendgrid'
+
+
+class SenderShardKey(str, Enum):
+    RECIPIENT = 'recipient'
+    EVENT = 'event'
+
+
+class CircuitState(str, Enum):
+    CLOSED = 'CLOSED'
+    OPEN = 'OPEN'
+    HALF_OPEN = 'HALF_OPEN'
+
+
+class SuppressionReason(str, Enum):
+    BOUNCE = 'BOUNCE'
+    COMPLAINT = 'COMPLAINT'
+    MANUAL = 'MANUAL'
+
+
+class MetricName(str, Enum):
+    JSON_PARSE = 'JsonParse'
+    EMAIL_VALIDATION = 'EmailValidation'
+    TEMPLATE_RENDER = 'TemplateRender'
+    MIME_BUILD = 'MimeBuild'
+    MIME_SERIALIZE = 'MimeSerialize'
+    ATTACHMENT_ENCODE = 'AttachmentEncode'
+    QUOTA_CHECK = 'QuotaCheck'
+    SMTP_CONNECT = 'SmtpConnect'
+    SMTP_STARTTLS = 'SmtpStartTls'
+    SMTP_LOGIN = 'SmtpLogin'
+    SMTP_DATA = 'SmtpData'
+    REGISTRATION_UPDATE = 'RegistrationUpdate'
+    CONCURRENCY_WINDOW = 'ConcurrencyWindow'
+    EMAILS_SENT = 'EmailsSent'
+    EMAILS_DEFERRED = 'EmailsDeferred'
+    EMAILS_RELEASED = 'EmailsReleased'
+    DELIVERY_LOG_FLUSH = 'DeliveryLogFlush'
+    RENDER_QUEUE_DEPTH = 'RenderQueueDepth'
+    DELIVERY_QUEUE_DEPTH = 'DeliveryQueueDepth'
+    REGISTRATION_QUEUE_DEPTH = 'RegistrationQueueDepth'
@@ -1,25 +1,193 @@
 import json
 import os
+from contextlib import closing
+from http import HTTPStatus
+from typing import List
 
 import boto3
+from pydantic import ValidationError
 
-from model.email.email import EmailIn
+from constants.common_constants import MetricName
+from model.campaign.campaign import CampaignIn
+from usecase.campaign_usecase import CampaignUsecase
 from usecase.email_usecase import EmailUsecase
+from usecase.idempotency_usecase import IdempotencyUsecase
+from usecase.lane_scheduler import LaneScheduler
+from usecase.payload_usecase import PayloadUsecase
+from usecase.suppression_usecase import SuppressionUsecase
+from usecase.validation_usecase import ValidationUsecase
 from utils.logger import logger
+from utils.metrics import metrics
+from utils.profiler import profile_invocation
+from utils.time_budget import TimeBudget
 
 EMAIL_QUEUE = os.getenv('EMAIL_QUEUE')
+# Payload errors that redelivering the record cannot fix
+PERMANENT_PAYLOAD_ERRORS = (HTTPStatus.BAD_REQUEST, HTTPStatus.NOT_FOUND, HTTPStatus.FORBIDDEN)
 SQS = boto3.client('sqs')
 email_usecase = EmailUsecase()
+idempotency_usecase = IdempotencyUsecase()
+payload_usecase = PayloadUsecase()
+lane_scheduler = LaneScheduler()
+suppression_usecase = SuppressionUsecase()
+validation_usecase = ValidationUsecase()
+campaign_usecase = CampaignUsecase(
+    email_usecase=email_usecase,
+    idempotency_usecase=idempotency_usecase,
+    suppression_usecase=suppression_usecase,
+    validation_usecase=validation_usecase,
+)
 
 
+@profile_invocation
 def send_email_handler(event, context):
-    _ = context
+    time_budget = TimeBudget(context)
     records = event['Records']
-    logger.info(records)
-    for record in records:
-        message_body = json.loads(record['body'])
-        for message in message_body:
-            email_in = EmailIn(**message)
-            email_usecase.send_email(email_in)
-
-        SQS.delete_message(QueueUrl=EMAIL_QUEUE, ReceiptHandle=record['receiptHandle'])
+    logger.info(
+        'Received %s record(s)',
+        len(records),
+        category='handler',
+        messageIds=[record['messageId'] for record in records],
+    )
+    batch_item_failures = []
+    try:
+        for record in lane_scheduler.order_records(records):
+            # Release the rest of the batch once a record is unfinished to keep the FIFO order
+            if batch_item_failures or time_budget.exhausted():
+                batch_item_failures.append({'itemIdentifier': record['messageId']})
+                continue
+
+            try:
+                with metrics.timer(MetricName.JSON_PARSE.value):
+                    payload = json.loads(record['body'])
+            except ValueError as e:
+                logger.error(
+                    '[%s] Dropping record with an invalid body: %s', record['messageId'], e, category='handler'
+                )
+                SQS.delete_message(QueueUrl=EMAIL_QUEUE, ReceiptHandle=record['receiptHandle'])
+                continue
+
+            if isinstance(payload, dict) and 'campaign' in payload:
+                try:
+                    campaign_in = CampaignIn(**payload['campaign'])
+                except ValidationError as e:
+                    logger.error(
+                        '[%s] Dropping invalid campaign command: %s', record['messageId'], e, category='handler'
+                    )
+                    SQS.delete_message(QueueUrl=EMAIL_QUEUE, ReceiptHandle=record['receiptHandle'])
+                    continue
+
+                status = campaign_usecase.run_campaign(
+                    campaign_in, campaign_id=campaign_in.campaignId or record['messageId'], time_budget=time_budget
+                )
+                if status != HTTPStatus.OK:
+                    batch_item_failures.append({'itemIdentifier': record['messageId']})
+                    continue
+
+                SQS.delete_message(QueueUrl=EMAIL_QUEUE, ReceiptHandle=record['receiptHandle'])
+                continue
+
+            status = HTTPStatus.OK
+            chunk_start = 0
+            with closing(payload_usecase.get_message_chunks(payload)) as message_chunks:
+                for status, message_body, message in message_chunks:
+                    if status != HTTPStatus.OK:
+                        break
+
+                    statuses = send_record_emails(
+                        record, message_body, first_index=chunk_start, time_budget=time_budget
+                    )
+                    chunk_start += len(message_body)
+                    if HTTPStatus.REQUEST_TIMEOUT in statuses:
+                        status = HTTPStatus.REQUEST_TIMEOUT
+                        break
+
+            if status in PERMANENT_PAYLOAD_ERRORS:
+                logger.error('[%s] Dropping record: %s', record['messageId'], message, category='handler')
+            elif status == HTTPStatus.REQUEST_TIMEOUT:
+                batch_item_failures.append({'itemIdentifier': record['messageId']})
+                continue
+            elif status != HTTPStatus.OK:
+                logger.error(
+                    '[%s] Failed to get the record payload: %s', record['messageId'], message, category='handler'
+                )
+                batch_item_failures.append({'itemIdentifier': record['messageId']})
+                continue
+
+            SQS.delete_message(QueueUrl=EMAIL_QUEUE, ReceiptHandle=record['receiptHandle'])
+
+    finally:
+        # Write what was buffered even when a record raises, or the outcomes of the sent emails are lost
+        email_usecase.delivery_ledger_usecase.flush()
+        metrics.flush()
+
+    if batch_item_failures:
+        logger.warning(
+            'Releasing %s unfinished record(s) back to the queue',
+            len(batch_item_failures),
+            category='handler',
+        )
+
+    return {'batchItemFailures': batch_item_failures}
+
+
+def send_record_emails(record: dict, message_body: List[dict], first_index: int, time_budget: TimeBudget):
+    """
+    Send a chunk of the email payloads of a record, skipping invalid emails, suppressed recipients and emails
+    already delivered by an earlier attempt of the record.
+
+    Args:
+        record (dict): The SQS record.
+        message_body (List[dict]): The email payloads of the chunk.
+        first_index (int): The index of the first payload of the chunk in the record, used in logs.
+        time_budget (TimeBudget): The time budget of the invocation.
+
+    Returns:
+        List[HTTPStatus]: The send status of each email that was sent.
+    """
+    # Skip emails already delivered by an earlier attempt of this message
+    idempotency_keys = [
+        IdempotencyUsecase.get_idempotency_key(record['messageId'], message) for message in message_body
+    ]
+    delivered_keys = idempotency_usecase.get_delivered_keys(idempotency_keys)
+    pending = [(key, message) for key, message in zip(idempotency_keys, message_body) if key not in delivered_keys]
+    if delivered_keys:
+        logger.info(
+            '[%s] Skipping %s already delivered email(s)',
+            record['messageId'],
+            len(delivered_keys),
+            category='handler',
+        )
+
+    with metrics.timer(MetricName.EMAIL_VALIDATION.value):
+        email_ins, validation_errors = validation_usecase.validate_emails([message for _, message in pending])
+    for index, error in validation_errors:
+        logger.error(
+            '[%s] Skipping invalid email #%s: %s', record['messageId'], first_index + index, error, category='handler'
+        )
+    pending = [(key, email_in) for (key, _), email_in in zip(pending, email_ins) if email_in is not None]
+
+    # Drop suppressed recipients, and emails left without one
+    email_ins = suppression_usecase.remove_suppressed_recipients([email_in for _, email_in in pending])
+    pending = [(key, email_in) for (key, _), email_in in zip(pending, email_ins) if email_in is not None]
+
+    statuses = email_usecase.send_emails([email_in for _, email_in in pending], time_budget=time_budget)
+    idempotency_usecase.mark_delivered(
+        [key for (key, _), status in zip(pending, statuses) if status in (HTTPStatus.OK, HTTPStatus.ACCEPTED)]
+    )
+    return statuses
+
+
+@profile_invocation
+def release_scheduled_emails_handler(event, context):
+    time_budget = TimeBudget(context)
+    send_window_usecase = email_usecase.send_window_usecase
+    scheduled_emails, email_ins = send_window_usecase.get_release_batch()
+    try:
+        if email_ins:
+            statuses = email_usecase.send_emails(email_ins, time_budget=time_budget, defer_overflow=False)
+            send_window_usecase.complete_release(scheduled_emails, statuses)
+
+    finally:
+        email_usecase.delivery_ledger_usecase.flush()
+        metrics.flush()
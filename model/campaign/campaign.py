@@ -0,0 +1,47 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+from pynamodb.attributes import (
+    BooleanAttribute,
+    NumberAttribute,
+    TTLAttribute,
+    UnicodeAttribute,
+)
+
+from constants.common_constants import EmailType
+from model.email.email import CachedEmailStr, EmailAttachmentIn
+from model.entities import Entities
+
+
+class CampaignCheckpoint(Entities, discriminator='CampaignCheckpoint'):
+    # hk: CampaignCheckpoint
+    # rk: <campaign_id>
+    eventId = UnicodeAttribute(null=True)
+    lastEvaluatedKey = UnicodeAttribute(null=True)
+    sentCount = NumberAttribute(default=0)
+    isCompleted = BooleanAttribute(default=False)
+    expiresAt = TTLAttribute(null=True)
+
+
+class CampaignIn(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
+    campaignId: Optional[str] = Field(None, title='ID of the campaign, defaults to the SQS message ID')
+    eventId: str = Field(..., title='Event ID whose registrants are emailed')
+    emailType: EmailType = Field(..., title='Type of the email')
+    subject: str = Field(..., title='Subject of the email')
+    salutation: str = Field(..., title='Salutation of the email, may use {firstName} and {lastName}')
+    body: List[str] = Field(..., title='Body of the email')
+    regards: List[str] = Field(..., title='Regards of the email')
+    cc: Optional[List[CachedEmailStr]] = Field(None, title='CC Email addresses')
+    isDurianPy: bool = Field(default=True, title='Is this a DURIANPY sent email?')
+    attachments: Optional[List[EmailAttachmentIn]] = Field(None, title='Attachments of every email')
+
+
+class CampaignCheckpointIn(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
+    eventId: Optional[str] = Field(None, title='Event ID of the campaign')
+    lastEvaluatedKey: Optional[str] = Field(None, title='JSON key of the last processed registration')
+    sentCount: Optional[int] = Field(None, title='Number of emails sent so far')
+    isCompleted: Optional[bool] = Field(None, title='Has every page been processed?')
@@ -1,10 +1,18 @@
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field, computed_field
-from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, computed_field
+from pydantic.networks import validate_email
+from pynamodb.attributes import (
+    ListAttribute,
+    NumberAttribute,
+    TTLAttribute,
+    UnicodeAttribute,
+)
+from typing_extensions import Annotated
 
-from constants.common_constants import EmailType
+from constants.common_constants import CommonConstants, EmailProvider, EmailType
 from model.entities import Entities
 from template.get_template import html_template
 
@@ -16,6 +24,50 @@ class EmailTracker(Entities, discriminator='EmailTracker'):
     dailyEmailCount = NumberAttribute(null=True)
 
 
+class EmailIdempotency(Entities, discriminator='EmailIdempotency'):
+    # hk: EmailIdempotency
+    # rk: <sqs_message_id>#<email_content_hash>
+    expiresAt = TTLAttribute(null=True)
+
+
+class ScheduledEmail(Entities, discriminator='ScheduledEmail'):
+    # hk: ScheduledEmail
+    # rk: <send_after>#<email_content_hash>
+    sendAfter = UnicodeAttribute(null=False)
+    sendBefore = UnicodeAttribute(null=True)
+    emailType = UnicodeAttribute(null=True)
+    payload = UnicodeAttribute(null=False)
+    expiresAt = TTLAttribute(null=True)
+
+
+class EmailDeliveryLog(Entities, discriminator='EmailDeliveryLog'):
+    # hk: EmailDeliveryLog#<sent_date>#<key_shard>
+    # rk: <sent_at>#<delivery_log_id>
+    recipients = ListAttribute(of=UnicodeAttribute, null=True)
+    emailType = UnicodeAttribute(null=True)
+    eventId = UnicodeAttribute(null=True)
+    provider = UnicodeAttribute(null=True)
+    senderShardId = UnicodeAttribute(null=True)
+    statusCode = NumberAttribute(null=False)
+    failureReason = UnicodeAttribute(null=True)
+    latencyMs = NumberAttribute(null=True)
+    attempts = NumberAttribute(null=True)
+    sentAt = UnicodeAttribute(null=False)
+    expiresAt = TTLAttribute(null=True)
+
+
+@lru_cache(maxsize=CommonConstants.EMAIL_ADDRESS_CACHE_SIZE)
+def validate_email_address(email: str) -> str:
+    """
+    Validate and normalize an email address the same way as EmailStr, memoized per container so repeated
+    addresses (like a fixed CC) only go through email-validator once.
+    """
+    return validate_email(email)[1]
+
+
+CachedEmailStr = Annotated[str, AfterValidator(validate_email_address)]
+
+
 class EmailTrackerIn(BaseModel):
     model_config = ConfigDict(extra='ignore')
 
@@ -23,20 +75,129 @@ class EmailTrackerIn(BaseModel):
     dailyEmailCount: Optional[int] = Field(None, title='Daily email count')
 
 
+class ScheduledEmailIn(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
+    scheduledEmailId: str = Field(..., title='Hash of the email payload')
+    sendAfter: datetime = Field(..., title='Earliest time the email is sent')
+    sendBefore: Optional[datetime] = Field(None, title='Deadline of the email')
+    emailType: Optional[EmailType] = Field(None, title='Type of the email')
+    payload: str = Field(..., title='JSON payload of the email')
+
+
+class EmailDeliveryLogIn(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
+    deliveryLogId: str = Field(..., title='Unique ID of the delivery outcome')
+    recipients: Optional[List[str]] = Field(None, title='Email addresses of the recipients')
+    emailType: Optional[EmailType] = Field(None, title='Type of the email')
+    eventId: Optional[str] = Field(None, title='Event ID of the email')
+    provider: Optional[EmailProvider] = Field(None, title='Provider of the last send attempt')
+    senderShardId: Optional[str] = Field(None, title='Sender shard of the email')
+    statusCode: int = Field(..., title='Send status of the email')
+    failureReason: Optional[str] = Field(None, title='Why the email was not sent')
+    latencyMs: Optional[float] = Field(None, title='Total time spent in the send attempts')
+    attempts: int = Field(default=0, title='Number of providers tried')
+    sentAt: datetime = Field(..., title='Time the outcome was recorded')
+
+
+class SenderShardIn(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
+    shardId: str = Field(..., title='Unique ID of the sender shard')
+    senderEmail: str = Field(..., title='Verified sender identity of the shard')
+    displayName: Optional[str] = Field(None, title='Display name of the sender, defaults to DISPLAY_EMAIL_NAME')
+    smtpHost: Optional[str] = Field(None, title='SES SMTP host of the shard, defaults to SES_SMTP_HOST')
+    smtpPort: Optional[int] = Field(None, title='SMTP port of the shard, defaults to SMTP_PORT')
+    smtpUsernameKey: Optional[str] = Field(None, title='SSM parameter of the SMTP username, or SES_SMTP_USERNAME_KEY')
+    smtpPasswordKey: Optional[str] = Field(None, title='SSM parameter of the SMTP password, or SES_SMTP_PASSWORD_KEY')
+    dailyFreeTierLimit: int = Field(
+        default=CommonConstants.SMTP_SERVICE_DAILY_FREE_TIER_LIMIT, title='Daily emails before SendGrid is preferred'
+    )
+    dailySendQuota: int = Field(default=CommonConstants.SES_DAILY_SEND_QUOTA, title='Daily SES send quota')
+    sendsPerSecond: float = Field(default=0, title='Maximum SES send rate of the shard, 0 for no limit')
+    weight: int = Field(default=1, title='Share of the keys assigned to the shard')
+
+
+class EmailAttachmentIn(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
+    objectKey: str = Field(..., title='S3 object key, or a local file path when there is no bucket')
+    bucket: Optional[str] = Field(None, title='S3 bucket of the attachment, defaults to ATTACHMENTS_BUCKET')
+    fileName: Optional[str] = Field(None, title='File name shown to the recipient')
+    contentType: Optional[str] = Field(None, title='MIME type of the attachment')
+    isShared: bool = Field(default=False, title='Is this attachment sent to many recipients, e.g. a brochure?')
+
+
 class EmailIn(BaseModel):
     model_config = ConfigDict(extra='ignore')
 
-    to: Optional[List[EmailStr]] = Field(None, title='Email address of the recipient')
-    cc: Optional[List[EmailStr]] = Field(None, title='CC Email addresses')
-    bcc: Optional[List[EmailStr]] = Field(None, title='BCC Email address')
+    to: Optional[List[CachedEmailStr]] = Field(None, title='Email address of the recipient')
+    cc: Optional[List[CachedEmailStr]] = Field(None, title='CC Email addresses')
+    bcc: Optional[List[CachedEmailStr]] = Field(None, title='BCC Email address')
     subject: str = Field(..., title='Subject of the email')
     salutation: str = Field(..., title='Salutation of the email')
     body: List[str] = Field(..., title='Body of the email')
     regards: List[str] = Field(..., title='Regards of the email')
     emailType: EmailType = Field(..., title='Type of the email')
     eventId: Optional[str] = Field(None, title='Event ID of the email')
+    registrationId: Optional[str] = Field(None, title='Registration ID of the recipient in the event')
     isDurianPy: bool = Field(default=True, title='Is this a DURIANPY sent email?')
+    attachments: Optional[List[EmailAttachmentIn]] = Field(None, title='Attachments of the email')
+    sendBefore: Optional[datetime] = Field(None, title='Deadline of a bulk email, it is never held back past it')
 
     @computed_field
     def content(self) -> str:
         return html_template(is_durian_py=self.isDurianPy)
+
+
+class EmailRecord(NamedTuple):
+    """
+    The immutable form of a validated EmailIn used by the send pipeline.
+
+    Fields keep the names of EmailIn, lists become tuples, the DurianPy CC is added to cc, and recipients holds
+    every to, cc and bcc address once, in that order.
+    """
+
+    to: Tuple[str, ...]
+    cc: Tuple[str, ...]
+    bcc: Tuple[str, ...]
+    recipients: Tuple[str, ...]
+    subject: str
+    salutation: str
+    body: Tuple[str, ...]
+    regards: Tuple[str, ...]
+    emailType: EmailType
+    eventId: Optional[str]
+    registrationId: Optional[str]
+    isDurianPy: bool
+    attachments: Tuple[EmailAttachmentIn, ...]
+    sendBefore: Optional[datetime]
+
+    @classmethod
+    def from_email_in(cls, email_in: EmailIn) -> 'EmailRecord':
+        to = tuple(email_in.to or ())
+        cc = tuple(email_in.cc or ())
+        if CommonConstants.DURIANPY_CC_EMAIL not in cc:
+            cc += (CommonConstants.DURIANPY_CC_EMAIL,)
+        bcc = tuple(email_in.bcc or ())
+        return cls(
+            to=to,
+            cc=cc,
+            bcc=bcc,
+            recipients=tuple(dict.fromkeys(to + cc + bcc)),
+            subject=email_in.subject,
+            salutation=email_in.salutation,
+            body=tuple(email_in.body),
+            regards=tuple(email_in.regards),
+            emailType=email_in.emailType,
+            eventId=email_in.eventId,
+            registrationId=email_in.registrationId,
+            isDurianPy=email_in.isDurianPy,
+            attachments=tuple(email_in.attachments or ()),
+            sendBefore=email_in.sendBefore,
+        )
+
+    @property
+    def content(self) -> str:
+        return html_template(is_durian_py=self.isDurianPy)
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pynamodb.attributes import UnicodeAttribute
+
+from constants.common_constants import SuppressionReason
+from model.entities import Entities
+
+
+class SuppressedEmail(Entities, discriminator='SuppressedEmail'):
+    # hk: SuppressedEmail
+    # rk: <lowercase email address>
+    reason = UnicodeAttribute(null=True)
+
+
+class SuppressedEmailIn(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
+    email: EmailStr = Field(..., title='Suppressed email address')
+    reason: SuppressionReason = Field(SuppressionReason.MANUAL, title='Reason of the suppression')
@@ -0,0 +1,161 @@
+import asyncio
+import os
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, Optional, Sequence
+
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+from pynamodb.expressions.condition import Condition
+from pynamodb.expressions.update import Action, Update
+
+from constants.common_constants import CommonConstants
+
+
+class AsyncDynamoDB:
+    """
+    A DynamoDB client for asyncio code, shared by the async repositories.
+
+    One aiobotocore client, and with it one pool of HTTP connections, serves every repository on the event loop,
+    so many requests can be in flight at once without a thread each. Conditions and update actions are built
+    with the PynamoDB model attributes, the same way as in the blocking repositories.
+
+    Attributes:
+        region (str): The AWS region.
+        endpoint_url (str): The DynamoDB endpoint, e.g. of DynamoDB Local. None uses the AWS endpoint.
+        max_pool_connections (int): The size of the HTTP connection pool.
+    """
+
+    def __init__(self, region: str = None, endpoint_url: str = None, max_pool_connections: int = None) -> None:
+        self.region = region or os.getenv('REGION')
+        self.endpoint_url = endpoint_url or os.getenv('DYNAMODB_ENDPOINT_URL')
+        self.max_pool_connections = max_pool_connections or int(
+            os.getenv('ASYNC_DYNAMODB_MAX_CONNECTIONS', CommonConstants.ASYNC_DYNAMODB_MAX_CONNECTIONS)
+        )
+        self.session = get_session()
+        self.client = None
+        self.exit_stack: Optional[AsyncExitStack] = None
+        self.lock: Optional[asyncio.Lock] = None
+
+    async def get_client(self):
+        if self.client is not None:
+            return self.client
+
+        # The lock is created lazily so it belongs to the running event loop
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            if self.client is None:
+                exit_stack = AsyncExitStack()
+                self.client = await exit_stack.enter_async_context(
+                    self.session.create_client(
+                        'dynamodb',
+                        region_name=self.region,
+                        endpoint_url=self.endpoint_url,
+                        config=AioConfig(max_pool_connections=self.max_pool_connections),
+                    )
+                )
+                self.exit_stack = exit_stack
+
+        return self.client
+
+    async def close(self) -> None:
+        if self.exit_stack is not None:
+            await self.exit_stack.aclose()
+        self.client = None
+        self.exit_stack = None
+
+    async def __aenter__(self) -> 'AsyncDynamoDB':
+        await self.get_client()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    @staticmethod
+    def get_key(hash_key: str, range_key: str) -> dict:
+        return {CommonConstants.HASH_KEY: {'S': hash_key}, CommonConstants.RANGE_KEY: {'S': range_key}}
+
+    @staticmethod
+    def build_operation_kwargs(
+        operation_kwargs: dict,
+        key_condition: Condition = None,
+        filter_condition: Condition = None,
+        condition: Condition = None,
+        actions: Sequence[Action] = None,
+    ) -> dict:
+        """
+        Add the serialized expressions of PynamoDB conditions and update actions to the kwargs of an operation.
+
+        Args:
+            operation_kwargs (dict): The kwargs of the operation, e.g. TableName and Key.
+            key_condition (Condition, optional): The key condition of a query.
+            filter_condition (Condition, optional): The filter condition of a query.
+            condition (Condition, optional): The condition of a write.
+            actions (Sequence[Action], optional): The actions of an update.
+
+        Returns:
+            dict: The operation kwargs with the expressions and their attribute names and values.
+        """
+        placeholder_names = {}
+        expression_attribute_values = {}
+        operation_kwargs = dict(operation_kwargs)
+        if key_condition is not None:
+            operation_kwargs['KeyConditionExpression'] = key_condition.serialize(
+                placeholder_names, expression_attribute_values
+            )
+        if filter_condition is not None:
+            operation_kwargs['FilterExpression'] = filter_condition.serialize(
+                placeholder_names, expression_attribute_values
+            )
+        if condition is not None:
+            operation_kwargs['ConditionExpression'] = condition.serialize(
+                placeholder_names, expression_attribute_values
+            )
+        if actions:
+            operation_kwargs['UpdateExpression'] = Update(*actions).serialize(
+                placeholder_names, expression_attribute_values
+            )
+
+        if placeholder_names:
+            operation_kwargs['ExpressionAttributeNames'] = {
+                placeholder: name for name, placeholder in placeholder_names.items()
+            }
+        if expression_attribute_values:
+            operation_kwargs['ExpressionAttributeValues'] = expression_attribute_values
+
+        return operation_kwargs
+
+    async def query(self, operation_kwargs: dict) -> AsyncIterator[dict]:
+        """
+        Run a query, following LastEvaluatedKey through every page.
+
+        Args:
+            operation_kwargs (dict): The kwargs of the Query operation.
+
+        Yields:
+            dict: The raw items.
+        """
+        client = await self.get_client()
+        operation_kwargs = dict(operation_kwargs)
+        while True:
+            response = await client.query(**operation_kwargs)
+            for item in response.get('Items', []):
+                yield item
+
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key:
+                return
+            operation_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+    async def get_item(self, operation_kwargs: dict) -> Optional[dict]:
+        client = await self.get_client()
+        response = await client.get_item(**operation_kwargs)
+        return response.get('Item')
+
+    async def put_item(self, operation_kwargs: dict) -> dict:
+        client = await self.get_client()
+        return await client.put_item(**operation_kwargs)
+
+    async def update_item(self, operation_kwargs: dict) -> dict:
+        client = await self.get_client()
+        return await client.update_item(**operation_kwargs)
@@ -0,0 +1,152 @@
+import os
+from datetime import datetime
+from http import HTTPStatus
+from typing import Optional, Tuple
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from constants.common_constants import EntryStatus
+from model.email.email import EmailTracker, EmailTrackerIn
+from repository.async_dynamodb import AsyncDynamoDB
+from utils.logger import logger
+
+
+class AsyncEmailTrackersRepository:
+    """
+    An asyncio counterpart of EmailTrackersRepository for the operations of the email path.
+
+    The daily count is incremented with an atomic ADD that returns the new count, so the increment does not
+    need the tracker to be read first. Like the sync repository, the tracker is only created when it does not
+    exist yet, so a concurrent sender cannot overwrite the count of another.
+
+    Attributes:
+        core_obj (str): The core object name for email_tracker records.
+        current_date (str): The current date and time in ISO format.
+        dynamodb (AsyncDynamoDB): The shared async DynamoDB client.
+        table_name (str): The name of the entities table.
+    """
+
+    def __init__(self, dynamodb: AsyncDynamoDB) -> None:
+        self.core_obj = 'EmailTracker'
+        self.current_date = datetime.utcnow().isoformat()
+        self.range_key = 'v0'
+        self.latest_version = 0
+        self.dynamodb = dynamodb
+        self.table_name = EmailTracker.Meta.table_name
+
+    async def query_email_tracker(self) -> Tuple[HTTPStatus, EmailTracker, str]:
+        """
+        Query the email_tracker record from the database.
+
+        Returns:
+            Tuple[HTTPStatus, EmailTracker, str]: A tuple containing HTTP status, the email_tracker record,
+            and an optional error message.
+        """
+        try:
+            item = await self.dynamodb.get_item(
+                {'TableName': self.table_name, 'Key': AsyncDynamoDB.get_key(self.core_obj, self.range_key)}
+            )
+
+        except (BotoCoreError, ClientError) as e:
+            message = f'Failed to query email_tracker: {str(e)}'
+            logger.error('[%s = %s]: %s', self.core_obj, self.range_key, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        email_tracker = EmailTracker.from_raw_data(item) if item else None
+        if email_tracker is None or email_tracker.entryStatus != EntryStatus.ACTIVE.value:
+            message = f'EmailTracker with id {self.range_key} not found'
+            logger.error('[%s=%s] %s', self.core_obj, self.range_key, message, category='repository')
+            return HTTPStatus.NOT_FOUND, None, message
+
+        logger.info(
+            '[%s = %s]: Fetch EmailTracker data successful', self.core_obj, self.range_key, category='repository'
+        )
+        return HTTPStatus.OK, email_tracker, None
+
+    async def create_update_email_tracker(
+        self,
+        email_tracker_in: EmailTrackerIn,
+        email_tracker_entry: Optional[EmailTracker] = None,
+    ) -> Tuple[HTTPStatus, EmailTracker, str]:
+        """
+        Store the email_tracker record, e.g. to start a new daily window.
+
+        Without an existing record the tracker is created, unless another sender created it first, in which case
+        that tracker is returned.
+
+        Args:
+            email_tracker_in (EmailTrackerIn): The new email_tracker data.
+            email_tracker_entry (EmailTracker, optional): The existing email_tracker record to be replaced.
+
+        Returns:
+            Tuple[HTTPStatus, EmailTracker, str]: A tuple containing HTTP status, the stored email_tracker record,
+            and an optional error message.
+        """
+        email_tracker = EmailTracker(
+            hashKey=self.core_obj,
+            rangeKey=self.range_key,
+            createDate=email_tracker_entry.createDate if email_tracker_entry else self.current_date,
+            updateDate=self.current_date,
+            createdBy=email_tracker_entry.createdBy if email_tracker_entry else os.getenv('CURRENT_USER'),
+            updatedBy=os.getenv('CURRENT_USER'),
+            latestVersion=self.latest_version,
+            entryStatus=EntryStatus.ACTIVE.value,
+            entryId=str(self.latest_version),
+            lastEmailSent=email_tracker_in.lastEmailSent.isoformat(),
+            dailyEmailCount=email_tracker_in.dailyEmailCount,
+        )
+        operation_kwargs = AsyncDynamoDB.build_operation_kwargs(
+            {'TableName': self.table_name, 'Item': email_tracker.serialize()},
+            condition=EmailTracker.hashKey.does_not_exist() if email_tracker_entry is None else None,
+        )
+        try:
+            await self.dynamodb.put_item(operation_kwargs)
+
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                message = f'Failed to save email_tracker: {str(e)}'
+                logger.error('[%s]: %s', self.core_obj, message, category='repository')
+                return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+            # Another sender created the tracker first, its count is kept
+            logger.info('[%s] Email tracker already created', self.range_key, category='repository')
+            return await self.query_email_tracker()
+
+        except BotoCoreError as e:
+            message = f'Failed to save email_tracker: {str(e)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        logger.info('[%s] Save email_tracker data succesful', self.range_key, category='repository')
+        return HTTPStatus.OK, email_tracker, ''
+
+    async def append_email_sent_count(self, append_count: int = 1) -> Tuple[HTTPStatus, EmailTracker, str]:
+        """
+        Add append_count to the daily email count.
+
+        Args:
+            append_count (int): The count to be appended.
+
+        Returns:
+            Tuple[HTTPStatus, EmailTracker, str]: A tuple containing HTTP status, the updated email_tracker record,
+            and an optional error message.
+        """
+        operation_kwargs = AsyncDynamoDB.build_operation_kwargs(
+            {
+                'TableName': self.table_name,
+                'Key': AsyncDynamoDB.get_key(self.core_obj, self.range_key),
+                'ReturnValues': 'ALL_NEW',
+            },
+            condition=EmailTracker.hashKey.exists(),
+            actions=[EmailTracker.dailyEmailCount.add(append_count)],
+        )
+        try:
+            response = await self.dynamodb.update_item(operation_kwargs)
+
+        except (BotoCoreError, ClientError) as e:
+            message = f'Failed to append daily email sent count: {str(e)}'
+            logger.error('[%s] %s', self.range_key, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        logger.info('[%s] Update email data successful', self.range_key, category='repository')
+        return HTTPStatus.OK, EmailTracker.from_raw_data(response['Attributes']), ''
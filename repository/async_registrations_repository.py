@@ -0,0 +1,158 @@
+from datetime import datetime
+from http import HTTPStatus
+from typing import List, Tuple
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from constants.common_constants import EntryStatus
+from model.registrations.registration import Registration, RegistrationIn
+from repository.async_dynamodb import AsyncDynamoDB
+from repository.repository_utils import RepositoryUtils
+from utils.logger import logger
+
+
+class AsyncRegistrationsRepository:
+    """
+    An asyncio counterpart of RegistrationsRepository for the operations of the email path.
+
+    Records are returned as Registration models, like in the blocking repository.
+
+    Attributes:
+        core_obj (str): The core object name for registration records.
+        current_date (str): The current date and time in ISO format.
+        dynamodb (AsyncDynamoDB): The shared async DynamoDB client.
+        table_name (str): The name of the registrations table.
+    """
+
+    def __init__(self, dynamodb: AsyncDynamoDB) -> None:
+        self.core_obj = 'Registration'
+        self.current_date = datetime.utcnow().isoformat()
+        self.dynamodb = dynamodb
+        self.table_name = Registration.Meta.table_name
+
+    async def query_registrations_with_email(
+        self, event_id: str, email: str, exclude_registration_id: str = None
+    ) -> Tuple[HTTPStatus, List[Registration], str]:
+        """
+        Query registrations with email, through the email LSI.
+
+        Args:
+            event_id (str): The event ID to query.
+            email (str): The email to query.
+            exclude_registration_id (str, optional): The registration ID to exclude (default is None).
+
+        Returns:
+            Tuple[HTTPStatus, List[Registration], str]: A tuple containing HTTP status, a list of registration records,
+            and an optional error message.
+        """
+        filter_condition = Registration.entryStatus == EntryStatus.ACTIVE.value
+        if exclude_registration_id:
+            filter_condition &= Registration.registrationId != exclude_registration_id
+
+        operation_kwargs = AsyncDynamoDB.build_operation_kwargs(
+            {'TableName': self.table_name, 'IndexName': Registration.emailLSI.Meta.index_name},
+            key_condition=(Registration.hashKey == event_id) & (Registration.email == email),
+            filter_condition=filter_condition,
+        )
+        try:
+            registration_entries = [
+                Registration.from_raw_data(item) async for item in self.dynamodb.query(operation_kwargs)
+            ]
+
+        except (BotoCoreError, ClientError) as e:
+            message = f'Failed to query registrations: {str(e)}'
+            logger.error('[%s = %s]: %s', self.core_obj, email, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        if not registration_entries:
+            message = f'Registration with email {email} not found'
+            logger.error('[%s=%s] %s', self.core_obj, email, message, category='repository')
+            return HTTPStatus.NOT_FOUND, None, message
+
+        logger.info('[%s]: Fetch Registration with email %s successful', self.core_obj, email, category='repository')
+        return HTTPStatus.OK, registration_entries, None
+
+    async def update_registration(
+        self, registration_entry: Registration, registration_in: RegistrationIn
+    ) -> Tuple[HTTPStatus, Registration, str]:
+        """
+        Update a registration record in the database.
+
+        Args:
+            registration_entry (Registration): The existing registration record to be updated.
+            registration_in (RegistrationIn): The new registration data.
+
+        Returns:
+            Tuple[HTTPStatus, Registration, str]: A tuple containing HTTP status, the updated registration record,
+            and an optional error message.
+        """
+        data = RepositoryUtils.load_data(pydantic_schema_in=registration_in, exclude_unset=True)
+        has_update, updated_data = RepositoryUtils.get_update(
+            old_data=RepositoryUtils.db_model_to_dict(registration_entry), new_data=data
+        )
+        if not has_update:
+            return HTTPStatus.OK, registration_entry, 'No update'
+
+        updated_data.update(updateDate=self.current_date)
+        operation_kwargs = AsyncDynamoDB.build_operation_kwargs(
+            {
+                'TableName': self.table_name,
+                'Key': AsyncDynamoDB.get_key(registration_entry.hashKey, registration_entry.rangeKey),
+                'ReturnValues': 'ALL_NEW',
+            },
+            actions=[getattr(Registration, k).set(v) for k, v in updated_data.items()],
+        )
+        try:
+            response = await self.dynamodb.update_item(operation_kwargs)
+
+        except (BotoCoreError, ClientError) as e:
+            message = f'Failed to update event data: {str(e)}'
+            logger.error('[%s] %s', registration_entry.rangeKey, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        logger.info('[%s] Update event data succesful', registration_entry.rangeKey, category='repository')
+        return HTTPStatus.OK, Registration.from_raw_data(response['Attributes']), ''
+
+    async def update_registration_with_key(
+        self, event_id: str, registration_id: str, registration_in: RegistrationIn
+    ) -> Tuple[HTTPStatus, str]:
+        """
+        Update a registration by its key with one conditional UpdateItem, without reading it first.
+
+        Args:
+            event_id (str): The event ID of the registration (its hash key).
+            registration_id (str): The registration ID (its range key).
+            registration_in (RegistrationIn): The new registration data.
+
+        Returns:
+            Tuple[HTTPStatus, str]: A tuple containing HTTP status (NOT_FOUND when there is no active registration
+            with the key) and an optional error message.
+        """
+        data = RepositoryUtils.load_data(pydantic_schema_in=registration_in, exclude_unset=True)
+        # The repository outlives many updates in the long-running worker, so the clock is read on every update
+        data.update(updateDate=datetime.utcnow().isoformat())
+        operation_kwargs = AsyncDynamoDB.build_operation_kwargs(
+            {'TableName': self.table_name, 'Key': AsyncDynamoDB.get_key(event_id, registration_id)},
+            condition=Registration.hashKey.exists() & (Registration.entryStatus == EntryStatus.ACTIVE.value),
+            actions=[getattr(Registration, k).set(v) for k, v in data.items()],
+        )
+        try:
+            await self.dynamodb.update_item(operation_kwargs)
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                message = f'Registration with id {registration_id} not found'
+                logger.error('[%s=%s] %s', self.core_obj, registration_id, message, category='repository')
+                return HTTPStatus.NOT_FOUND, message
+
+            message = f'Failed to update event data: {str(e)}'
+            logger.error('[%s] %s', registration_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except BotoCoreError as e:
+            message = f'Failed to update event data: {str(e)}'
+            logger.error('[%s] %s', registration_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        logger.info('[%s] Update event data succesful', registration_id, category='repository')
+        return HTTPStatus.OK, ''
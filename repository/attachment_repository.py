@@ -0,0 +1,90 @@
+import mmap
+import os
+from http import HTTPStatus
+from typing import Iterator, Tuple
+
+from constants.common_constants import CommonConstants
+from repository.object_repository import ObjectRepository
+from utils.logger import logger
+
+
+class AttachmentRepository:
+    """
+    A repository class for reading attachment files in chunks, from S3 or from local storage.
+
+    Local files are memory-mapped and S3 objects are streamed, so a file is never held in memory whole.
+
+    Attributes:
+        core_obj (str): The core object name for attachments.
+        attachments_dir (str): The directory local attachment paths are resolved in.
+    """
+
+    def __init__(self) -> None:
+        self.core_obj = 'Attachment'
+        self.object_repository = ObjectRepository()
+        self.attachments_dir = os.path.realpath(os.getenv('ATTACHMENTS_DIR', CommonConstants.ATTACHMENTS_DIR))
+
+    def read_object_chunks(self, bucket: str, key: str, chunk_size: int) -> Tuple[HTTPStatus, Iterator[bytes], str]:
+        """
+        Read an S3 object in chunks.
+
+        Args:
+            bucket (str): The S3 bucket of the object.
+            key (str): The key of the object.
+            chunk_size (int): The maximum number of bytes per chunk.
+
+        Returns:
+            Tuple[HTTPStatus, Iterator[bytes], str]: A tuple containing HTTP status, the chunks,
+            and an optional error message.
+        """
+        status, response, message = self.object_repository.get_object(bucket=bucket, key=key)
+        if status != HTTPStatus.OK:
+            return status, None, message
+
+        return HTTPStatus.OK, self.iter_stream(response['Body'], chunk_size), None
+
+    def read_local_chunks(self, path: str, chunk_size: int) -> Tuple[HTTPStatus, Iterator[bytes], str]:
+        """
+        Read a local file in chunks through a memory map.
+
+        Args:
+            path (str): The file path, relative to the attachments directory.
+            chunk_size (int): The maximum number of bytes per chunk.
+
+        Returns:
+            Tuple[HTTPStatus, Iterator[bytes], str]: A tuple containing HTTP status, the chunks,
+            and an optional error message.
+        """
+        file_path = os.path.realpath(os.path.join(self.attachments_dir, path))
+        if os.path.commonpath([file_path, self.attachments_dir]) != self.attachments_dir:
+            message = f'Attachment path is outside of the attachments directory: {path}'
+            logger.error('[%s = %s]: %s', self.core_obj, path, message, category='repository')
+            return HTTPStatus.BAD_REQUEST, None, message
+
+        if not os.path.isfile(file_path):
+            message = f'Attachment file not found: {path}'
+            logger.error('[%s = %s]: %s', self.core_obj, path, message, category='repository')
+            return HTTPStatus.NOT_FOUND, None, message
+
+        return HTTPStatus.OK, self.iter_mapped_file(file_path, chunk_size), None
+
+    @staticmethod
+    def iter_stream(stream, chunk_size: int) -> Iterator[bytes]:
+        try:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            stream.close()
+
+    @staticmethod
+    def iter_mapped_file(file_path: str, chunk_size: int) -> Iterator[bytes]:
+        with open(file_path, 'rb') as file_handle:
+            if os.fstat(file_handle.fileno()).st_size == 0:
+                return
+
+            with mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                for offset in range(0, len(mapped_file), chunk_size):
+                    yield mapped_file[offset : offset + chunk_size]
@@ -0,0 +1,131 @@
+import os
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import Tuple
+
+from pynamodb.exceptions import (
+    DoesNotExist,
+    GetError,
+    PutError,
+    PynamoDBConnectionError,
+    TableDoesNotExist,
+)
+
+from constants.common_constants import CommonConstants, EntryStatus
+from model.campaign.campaign import CampaignCheckpoint, CampaignCheckpointIn
+from utils.logger import logger
+
+
+class CampaignCheckpointRepository:
+    """
+    A repository class for managing campaign checkpoints in a DynamoDB table.
+
+    A checkpoint records the registration a campaign run stopped at, so a timed out run resumes from there.
+    Checkpoints expire through the DynamoDB TTL on expiresAt.
+
+    Attributes:
+        core_obj (str): The core object name for campaign checkpoints.
+        current_date (str): The current date and time in ISO format.
+        ttl (timedelta): How long a checkpoint is kept.
+    """
+
+    def __init__(self) -> None:
+        self.core_obj = 'CampaignCheckpoint'
+        self.current_date = datetime.utcnow().isoformat()
+        self.ttl = timedelta(
+            seconds=int(os.getenv('CAMPAIGN_CHECKPOINT_TTL_SECONDS', CommonConstants.CAMPAIGN_CHECKPOINT_TTL_SECONDS))
+        )
+
+    def query_campaign_checkpoint(self, campaign_id: str) -> Tuple[HTTPStatus, CampaignCheckpoint, str]:
+        """
+        Fetch the checkpoint of a campaign.
+
+        Args:
+            campaign_id (str): The ID of the campaign.
+
+        Returns:
+            Tuple[HTTPStatus, CampaignCheckpoint, str]: A tuple containing HTTP status, the checkpoint,
+            and an optional error message.
+        """
+        try:
+            campaign_checkpoint = CampaignCheckpoint.get(hash_key=self.core_obj, range_key=campaign_id)
+
+        except DoesNotExist:
+            message = f'CampaignCheckpoint with id {campaign_id} not found'
+            logger.info('[%s=%s] %s', self.core_obj, campaign_id, message, category='repository')
+            return HTTPStatus.NOT_FOUND, None, message
+
+        except GetError as e:
+            message = f'Failed to query campaign checkpoint: {str(e)}'
+            logger.error('[%s = %s]: %s', self.core_obj, campaign_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            logger.error('[%s = %s]: %s', self.core_obj, campaign_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s = %s]: %s', self.core_obj, campaign_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        else:
+            logger.info(
+                '[%s = %s]: Fetch CampaignCheckpoint data successful', self.core_obj, campaign_id, category='repository'
+            )
+            return HTTPStatus.OK, campaign_checkpoint, None
+
+    def save_campaign_checkpoint(
+        self, campaign_id: str, campaign_checkpoint_in: CampaignCheckpointIn
+    ) -> Tuple[HTTPStatus, CampaignCheckpoint, str]:
+        """
+        Store the checkpoint of a campaign, replacing the previous one.
+
+        Args:
+            campaign_id (str): The ID of the campaign.
+            campaign_checkpoint_in (CampaignCheckpointIn): The checkpoint data.
+
+        Returns:
+            Tuple[HTTPStatus, CampaignCheckpoint, str]: A tuple containing HTTP status, the checkpoint,
+            and an optional error message.
+        """
+        try:
+            campaign_checkpoint = CampaignCheckpoint(
+                hashKey=self.core_obj,
+                rangeKey=campaign_id,
+                createDate=self.current_date,
+                updateDate=datetime.utcnow().isoformat(),
+                createdBy=os.getenv('CURRENT_USER'),
+                updatedBy=os.getenv('CURRENT_USER'),
+                latestVersion=0,
+                entryStatus=EntryStatus.ACTIVE.value,
+                entryId=campaign_id,
+                eventId=campaign_checkpoint_in.eventId,
+                lastEvaluatedKey=campaign_checkpoint_in.lastEvaluatedKey,
+                sentCount=campaign_checkpoint_in.sentCount or 0,
+                isCompleted=bool(campaign_checkpoint_in.isCompleted),
+                expiresAt=self.ttl,
+            )
+            campaign_checkpoint.save()
+
+        except PutError as e:
+            message = f'Failed to save campaign checkpoint: {str(e)}'
+            logger.error('[%s = %s]: %s', self.core_obj, campaign_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            logger.error('[%s = %s]: %s', self.core_obj, campaign_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s = %s]: %s', self.core_obj, campaign_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        else:
+            logger.info(
+                '[%s = %s]: Save CampaignCheckpoint data successful', self.core_obj, campaign_id, category='repository'
+            )
+            return HTTPStatus.OK, campaign_checkpoint, None
@@ -0,0 +1,107 @@
+import os
+import zlib
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import List, Tuple
+
+from pynamodb.exceptions import PutError, PynamoDBConnectionError, TableDoesNotExist
+
+from constants.common_constants import CommonConstants, EntryStatus
+from model.email.email import EmailDeliveryLog, EmailDeliveryLogIn
+from utils.logger import logger
+
+
+class EmailDeliveryLogRepository:
+    """
+    A repository class for managing email delivery log records in a DynamoDB table.
+
+    Delivery logs are an append-only ledger of send outcomes. They are only written in bulk: the batch write
+    sends 25 items per BatchWriteItem request and retries the unprocessed items with backoff. The hash key
+    carries the date of the outcome and one of key_shards shards, picked from the delivery log ID, so the writes
+    of a day are spread over several partitions instead of one hot key. The range key starts with the time of
+    the outcome, so each shard reads in time order. Records expire through the DynamoDB TTL on expiresAt.
+
+    Attributes:
+        core_obj (str): The core object name for delivery log records.
+        current_date (str): The current date and time in ISO format.
+        ttl (timedelta): How long a record is kept.
+        key_shards (int): The number of hash keys the outcomes of a day are spread over.
+    """
+
+    def __init__(self) -> None:
+        self.core_obj = 'EmailDeliveryLog'
+        self.current_date = datetime.utcnow().isoformat()
+        self.ttl = timedelta(
+            seconds=int(os.getenv('DELIVERY_LOG_TTL_SECONDS', CommonConstants.DELIVERY_LOG_TTL_SECONDS))
+        )
+        self.key_shards = int(os.getenv('DELIVERY_LOG_KEY_SHARDS', CommonConstants.DELIVERY_LOG_KEY_SHARDS))
+
+    def get_hash_key(self, email_delivery_log_in: EmailDeliveryLogIn) -> str:
+        key_shard = zlib.crc32(email_delivery_log_in.deliveryLogId.encode('utf-8')) % self.key_shards
+        return f'{self.core_obj}#{email_delivery_log_in.sentAt.date().isoformat()}#{key_shard}'
+
+    def store_email_delivery_logs(self, email_delivery_log_ins: List[EmailDeliveryLogIn]) -> Tuple[HTTPStatus, str]:
+        """
+        Store delivery logs in bulk. Storing the same delivery log again overwrites it, so a failed batch can be
+        stored again as a whole.
+
+        Args:
+            email_delivery_log_ins (List[EmailDeliveryLogIn]): The delivery outcomes to store.
+
+        Returns:
+            Tuple[HTTPStatus, str]: A tuple containing HTTP status and an optional error message.
+        """
+        try:
+            with EmailDeliveryLog.batch_write() as batch:
+                for email_delivery_log_in in email_delivery_log_ins:
+                    sent_at = email_delivery_log_in.sentAt.isoformat()
+                    batch.save(
+                        EmailDeliveryLog(
+                            hashKey=self.get_hash_key(email_delivery_log_in),
+                            rangeKey=f'{sent_at}#{email_delivery_log_in.deliveryLogId}',
+                            createDate=self.current_date,
+                            updateDate=self.current_date,
+                            createdBy=os.getenv('CURRENT_USER'),
+                            updatedBy=os.getenv('CURRENT_USER'),
+                            latestVersion=0,
+                            entryStatus=EntryStatus.ACTIVE.value,
+                            entryId=email_delivery_log_in.deliveryLogId,
+                            recipients=email_delivery_log_in.recipients,
+                            emailType=email_delivery_log_in.emailType.value
+                            if email_delivery_log_in.emailType
+                            else None,
+                            eventId=email_delivery_log_in.eventId,
+                            provider=email_delivery_log_in.provider.value if email_delivery_log_in.provider else None,
+                            senderShardId=email_delivery_log_in.senderShardId,
+                            statusCode=email_delivery_log_in.statusCode,
+                            failureReason=email_delivery_log_in.failureReason,
+                            latencyMs=email_delivery_log_in.latencyMs,
+                            attempts=email_delivery_log_in.attempts,
+                            sentAt=sent_at,
+                            expiresAt=email_delivery_log_in.sentAt + self.ttl,
+                        )
+                    )
+
+        except PutError as e:
+            message = f'Failed to save email delivery logs: {str(e)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        else:
+            logger.info(
+                '[%s]: Saved %s email delivery logs',
+                self.core_obj,
+                len(email_delivery_log_ins),
+                category='repository',
+            )
+            return HTTPStatus.OK, ''
@@ -0,0 +1,130 @@
+import os
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import List, Set, Tuple
+
+from pynamodb.exceptions import (
+    GetError,
+    PutError,
+    PynamoDBConnectionError,
+    TableDoesNotExist,
+)
+
+from constants.common_constants import CommonConstants, EntryStatus
+from model.email.email import EmailIdempotency
+from utils.logger import logger
+
+
+class EmailIdempotencyRepository:
+    """
+    A repository class for managing email idempotency records in a DynamoDB table.
+
+    An idempotency record marks an email of an SQS message as delivered, so a redelivered message does not
+    send it again. Records expire through the DynamoDB TTL on expiresAt.
+
+    Attributes:
+        core_obj (str): The core object name for idempotency records.
+        current_date (str): The current date and time in ISO format.
+        ttl (timedelta): How long a record is kept.
+    """
+
+    def __init__(self) -> None:
+        self.core_obj = 'EmailIdempotency'
+        self.current_date = datetime.utcnow().isoformat()
+        self.ttl = timedelta(seconds=int(os.getenv('IDEMPOTENCY_TTL_SECONDS', CommonConstants.IDEMPOTENCY_TTL_SECONDS)))
+
+    def query_delivered_keys(self, idempotency_keys: List[str]) -> Tuple[HTTPStatus, Set[str], str]:
+        """
+        Fetch which of the idempotency keys are already recorded as delivered, in bulk.
+
+        Args:
+            idempotency_keys (List[str]): The idempotency keys to look up.
+
+        Returns:
+            Tuple[HTTPStatus, Set[str], str]: A tuple containing HTTP status, the delivered keys,
+            and an optional error message.
+        """
+        if not idempotency_keys:
+            return HTTPStatus.OK, set(), None
+
+        now = datetime.now(timezone.utc)
+        try:
+            entries = EmailIdempotency.batch_get(
+                [(self.core_obj, idempotency_key) for idempotency_key in set(idempotency_keys)]
+            )
+            # Expired items linger until the TTL sweeper deletes them
+            delivered_keys = {entry.rangeKey for entry in entries if entry.expiresAt is None or entry.expiresAt > now}
+
+        except GetError as e:
+            message = f'Failed to query idempotency records: {str(e)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, set(), message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, set(), message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, set(), message
+
+        else:
+            logger.info(
+                '[%s]: Found %s of %s delivered emails',
+                self.core_obj,
+                len(delivered_keys),
+                len(idempotency_keys),
+                category='repository',
+            )
+            return HTTPStatus.OK, delivered_keys, None
+
+    def store_delivered_keys(self, idempotency_keys: List[str]) -> Tuple[HTTPStatus, str]:
+        """
+        Record the idempotency keys as delivered, in bulk.
+
+        Args:
+            idempotency_keys (List[str]): The idempotency keys of the delivered emails.
+
+        Returns:
+            Tuple[HTTPStatus, str]: A tuple containing HTTP status and an optional error message.
+        """
+        try:
+            with EmailIdempotency.batch_write() as batch:
+                for idempotency_key in set(idempotency_keys):
+                    batch.save(
+                        EmailIdempotency(
+                            hashKey=self.core_obj,
+                            rangeKey=idempotency_key,
+                            createDate=self.current_date,
+                            updateDate=self.current_date,
+                            createdBy=os.getenv('CURRENT_USER'),
+                            updatedBy=os.getenv('CURRENT_USER'),
+                            latestVersion=0,
+                            entryStatus=EntryStatus.ACTIVE.value,
+                            entryId=idempotency_key,
+                            expiresAt=self.ttl,
+                        )
+                    )
+
+        except PutError as e:
+            message = f'Failed to save idempotency records: {str(e)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        else:
+            logger.info(
+                '[%s]: Saved %s idempotency records', self.core_obj, len(idempotency_keys), category='repository'
+            )
+            return HTTPStatus.OK, ''
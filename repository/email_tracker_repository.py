@@ -10,6 +10,7 @@ from pynamodb.exceptions import (
     QueryError,
     TableDoesNotExist,
     TransactWriteError,
+    UpdateError,
 )
 from pynamodb.transactions import TransactWrite
 
@@ -25,16 +26,20 @@ class EmailTrackersRepository:
 
     This class provides methods for storing, querying, updating, and deleting email_tracker records.
 
+    The tracker is shared by every delivery thread and worker process, so it is only created when it does not
+    exist yet, and the daily count is incremented with an atomic ADD instead of being read and written back.
+
     Attributes:
         core_obj (str): The core object name for email_tracker records.
         current_date (str): The current date and time in ISO format.
+        range_key (str): The range key of the email_tracker record, one per sender shard.
         conn (Connection): The PynamoDB connection for database operations.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, range_key: str = 'v0') -> None:
         self.core_obj = 'EmailTracker'
         self.current_date = datetime.utcnow().isoformat()
-        self.range_key = 'v0'
+        self.range_key = range_key
         self.conn = Connection(region=os.getenv('REGION'))
         self.latest_version = 0
 
@@ -58,27 +63,29 @@ class EmailTrackersRepository:
 
             if not email_tracker_entries:
                 message = f'EmailTracker with id {email_tracker_id} not found'
-                logger.error(f'[{self.core_obj}={email_tracker_id}] {message}')
+                logger.error('[%s=%s] %s', self.core_obj, email_tracker_id, message, category='repository')
 
                 return HTTPStatus.NOT_FOUND, None, message
 
         except QueryError as e:
             message = f'Failed to query email_tracker: {str(e)}'
-            logger.error(f'[{self.core_obj} = {email_tracker_id}]: {message}')
+            logger.error('[%s = %s]: %s', self.core_obj, email_tracker_id, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
         except TableDoesNotExist as db_error:
             message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
-            logger.error(f'[{self.core_obj} = {email_tracker_id}]: {message}')
+            logger.error('[%s = %s]: %s', self.core_obj, email_tracker_id, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
         except PynamoDBConnectionError as db_error:
             message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
-            logger.error(f'[{self.core_obj} = {email_tracker_id}]: {message}')
+            logger.error('[%s = %s]: %s', self.core_obj, email_tracker_id, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
         else:
-            logger.info(f'[{self.core_obj} = {email_tracker_id}]: Fetch EmailTracker data successful')
+            logger.info(
+                '[%s = %s]: Fetch EmailTracker data successful', self.core_obj, email_tracker_id, category='repository'
+            )
             return HTTPStatus.OK, email_tracker_entries[0], None
 
     def create_update_email_tracker(
@@ -99,7 +106,7 @@ class EmailTrackersRepository:
         """
         try:
             if email_tracker_entry is None:
-                logger.info(f'[{self.core_obj}] ' f'Creating new email_tracker entry')
+                logger.info('[%s] Creating new email_tracker entry', self.core_obj, category='repository')
                 email_tracker_entry = EmailTracker(
                     hash_key=self.core_obj,
                     rangeKey=self.range_key,
@@ -113,13 +120,22 @@ class EmailTrackersRepository:
                     lastEmailSent=email_tracker_in.lastEmailSent.isoformat(),
                     dailyEmailCount=email_tracker_in.dailyEmailCount,
                 )
-                email_tracker_entry.save()
-                logger.info(f'[{email_tracker_entry.rangeKey}] ' f'Create event data succesful')
+                try:
+                    email_tracker_entry.save(condition=EmailTracker.hashKey.does_not_exist())
+                except PutError as e:
+                    if e.cause_response_code != 'ConditionalCheckFailedException':
+                        raise
+
+                    # Another sender created the tracker first, its count is kept
+                    logger.info('[%s] Email tracker already created', self.range_key, category='repository')
+                    return self.query_email_tracker()
+
+                logger.info('[%s] Create event data succesful', email_tracker_entry.rangeKey, category='repository')
 
                 return HTTPStatus.OK, email_tracker_entry, ''
 
             else:
-                logger.info(f'[{self.core_obj}] ' f'Updating new email_tracker entry')
+                logger.info('[%s] Updating new email_tracker entry', self.core_obj, category='repository')
                 data = RepositoryUtils.load_data(pydantic_schema_in=email_tracker_in, exclude_unset=True)
                 has_update, updated_data = RepositoryUtils.get_update(
                     old_data=RepositoryUtils.db_model_to_dict(email_tracker_entry),
@@ -137,52 +153,63 @@ class EmailTrackersRepository:
                     transaction.update(email_tracker_entry, actions=actions)
 
                 email_tracker_entry.refresh()
-                logger.info(f'[{email_tracker_entry.rangeKey}] ' f'Update event data succesful')
+                logger.info('[%s] Update event data succesful', email_tracker_entry.rangeKey, category='repository')
 
                 return HTTPStatus.OK, email_tracker_entry, ''
 
         except PutError as e:
             message = f'Failed to save discount strategy form: {str(e)}'
-            logger.error(f'[{self.core_obj}]: {message}')
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
         except TableDoesNotExist as db_error:
             message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
-            logger.error(f'[{self.core_obj}]: {message}')
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
         except PynamoDBConnectionError as db_error:
             message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
-            logger.error(f'[{self.core_obj}]: {message}')
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
         except TransactWriteError as e:
             message = f'Failed to update event data: {str(e)}'
-            logger.error(f'[{email_tracker_entry.rangeKey}] {message}')
+            logger.error('[%s] %s', email_tracker_entry.rangeKey, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
-    def append_email_sent_count(self, email_tracker_entry: EmailTracker, append_count: int = 1):
-        """Adds the dailyEmailSent attribute of the email_tracker_entry by append_count
-
-        :param email_tracker_entry: The EmailTracker object to be updated.
-        :type email_tracker_entry: EmailTracker
+    def append_email_sent_count(
+        self, email_tracker_entry: EmailTracker, append_count: int = 1
+    ) -> Tuple[HTTPStatus, EmailTracker, str]:
+        """
+        Add append_count to the daily email count with one conditional UpdateItem ADD.
 
-        :param append_count: The count to be appended.
-        :type append_count: int
+        Concurrent increments from other threads and processes are all kept, and the returned record holds the
+        count including them.
 
-        :return: Tuple containing the HTTP status, the updated EmailTracker object, and a message.
-        :rtype: Tuple[HTTPStatus, EmailTracker, str]
+        Args:
+            email_tracker_entry (EmailTracker): The email_tracker record to be updated.
+            append_count (int): The count to be appended.
 
+        Returns:
+            Tuple[HTTPStatus, EmailTracker, str]: A tuple containing HTTP status, the updated email_tracker record,
+            and an optional error message.
         """
         try:
-            email_tracker_entry.update(actions=[EmailTracker.dailyEmailCount.add(append_count)])
-            email_tracker_entry.save()
+            email_tracker_entry.update(
+                actions=[EmailTracker.dailyEmailCount.add(append_count)],
+                condition=EmailTracker.hashKey.exists(),
+            )
 
-        except PutError as e:
+        except UpdateError as e:
             message = f'Failed to append daily email sent count: {str(e)}'
-            logger.error(f'[{email_tracker_entry.rangeKey}] {message}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+            logger.error('[%s] %s', email_tracker_entry.rangeKey, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s] %s', email_tracker_entry.rangeKey, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
         else:
-            logger.info(f'[{email_tracker_entry.rangeKey}] ' f'Update email data successful')
+            logger.info('[%s] Update email data successful', email_tracker_entry.rangeKey, category='repository')
             return HTTPStatus.OK, email_tracker_entry, ''
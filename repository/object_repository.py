@@ -0,0 +1,59 @@
+import os
+from http import HTTPStatus
+from typing import Tuple
+
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+
+from utils.logger import logger
+
+
+class ObjectRepository:
+    """
+    A repository class for reading objects from S3.
+
+    Objects are returned as streams, so callers read them in bounded chunks instead of loading them whole.
+
+    Attributes:
+        core_obj (str): The core object name for stored objects.
+        s3_client: The S3 client.
+    """
+
+    def __init__(self) -> None:
+        self.core_obj = 'Object'
+        self.s3_client = boto3.client('s3', region_name=os.getenv('REGION'))
+
+    def get_object(self, bucket: str, key: str) -> Tuple[HTTPStatus, dict, str]:
+        """
+        Open an object for streaming.
+
+        Args:
+            bucket (str): The S3 bucket of the object.
+            key (str): The key of the object.
+
+        Returns:
+            Tuple[HTTPStatus, dict, str]: A tuple containing HTTP status, the get_object response (its Body is
+            a StreamingBody), and an optional error message.
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=bucket, Key=key)
+
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code')
+            message = f'Failed to get object: {str(e)}'
+            logger.error('[%s = s3://%s/%s]: %s', self.core_obj, bucket, key, message, category='repository')
+            if error_code in ('NoSuchKey', 'NoSuchBucket', '404'):
+                return HTTPStatus.NOT_FOUND, None, message
+            if error_code in ('AccessDenied', '403'):
+                # S3 also answers AccessDenied for a missing key when ListBucket is not granted
+                return HTTPStatus.FORBIDDEN, None, message
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except BotoCoreError as e:
+            message = f'Connection error occurred while getting object: {str(e)}'
+            logger.error('[%s = s3://%s/%s]: %s', self.core_obj, bucket, key, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        else:
+            logger.info('[%s = s3://%s/%s]: Open object successful', self.core_obj, bucket, key, category='repository')
+            return HTTPStatus.OK, response, None
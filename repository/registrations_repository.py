@@ -10,6 +10,7 @@ from pynamodb.exceptions import (
     QueryError,
     TableDoesNotExist,
     TransactWriteError,
+    UpdateError,
 )
 from pynamodb.transactions import TransactWrite
 
@@ -76,250 +77,91 @@ class RegistrationsRepository:
             if not registration_entries:
                 if registration_id:
                     message = f'Registration with id {registration_id} not found'
-                    logger.error(f'[{self.core_obj}={registration_id}] {message}')
+                    logger.error('[%s=%s] %s', self.core_obj, registration_id, message, category='repository')
                 else:
                     message = 'No registration found'
-                    logger.error(f'[{self.core_obj}] {message}')
+                    logger.error('[%s] %s', self.core_obj, message, category='repository')
 
                 return HTTPStatus.NOT_FOUND, None, message
 
         except QueryError as e:
             message = f'Failed to query registration: {str(e)}'
-            logger.error(f'[{self.core_obj} = {registration_id}]: {message}')
+            logger.error('[%s = %s]: %s', self.core_obj, registration_id, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
         except TableDoesNotExist as db_error:
             message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
-            logger.error(f'[{self.core_obj} = {registration_id}]: {message}')
+            logger.error('[%s = %s]: %s', self.core_obj, registration_id, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
         except PynamoDBConnectionError as db_error:
             message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
-            logger.error(f'[{self.core_obj} = {registration_id}]: {message}')
+            logger.error('[%s = %s]: %s', self.core_obj, registration_id, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
         else:
             if registration_id:
-                logger.info(f'[{self.core_obj} = {registration_id}]: Fetch Registration data successful')
+                logger.info(
+                    '[%s = %s]: Fetch Registration data successful',
+                    self.core_obj,
+                    registration_id,
+                    category='repository',
+                )
                 return HTTPStatus.OK, registration_entries[0], None
 
-            logger.info(f'[{self.core_obj}]: Fetch Registration data successful')
+            logger.info('[%s]: Fetch Registration data successful', self.core_obj, category='repository')
             return HTTPStatus.OK, registration_entries, None
 
-    def query_registrations_with_email(
-        self, event_id: str, email: str, exclude_registration_id: str = None
-    ) -> Tuple[HTTPStatus, List[Registration], str]:
+    def query_registrations_page(
+        self, event_id: str, page_size: int, last_evaluated_key: dict = None
+    ) -> Tuple[HTTPStatus, Tuple[List[Registration], dict], str]:
         """
-        Query registrations with email
+        Query one page of the active registrations of an event.
 
         Args:
-            event_id (str, optional): The event ID to query (default is None to query all records).
-            email (str, optional): The email to query (default is None to query all records).
-            exclude_registration (str, optional): The registration ID to exclude (default is None to query all records).
+            event_id (str): The event ID to query.
+            page_size (int): The maximum number of registrations in the page.
+            last_evaluated_key (dict, optional): The key the previous page stopped at (default is None to start
+                from the first registration).
 
         Returns:
-            Tuple[HTTPStatus, List[Registration], str]: A tuple containing HTTP status, a list of registration records,
-            and an optional error message.
+            Tuple[HTTPStatus, Tuple[List[Registration], dict], str]: A tuple containing HTTP status, the page of
+            registration records with the key to continue from (None after the last page), and an optional
+            error message.
         """
         try:
-            filter_condition = Registration.entryStatus.__eq__(EntryStatus.ACTIVE.value)
-            if exclude_registration_id:
-                filter_condition &= Registration.registrationId != exclude_registration_id
-
-            registration_entries = list(
-                Registration.emailLSI.query(
-                    hash_key=event_id,
-                    range_key_condition=Registration.email.__eq__(email),
-                    filter_condition=filter_condition,
-                )
+            results = Registration.query(
+                hash_key=event_id,
+                filter_condition=Registration.entryStatus == EntryStatus.ACTIVE.value,
+                limit=page_size,
+                page_size=page_size,
+                last_evaluated_key=last_evaluated_key,
             )
-
-            if not registration_entries:
-                message = f'Registration with email {email} not found'
-                logger.error(f'[{self.core_obj}={email}] {message}')
-
-                return HTTPStatus.NOT_FOUND, None, message
+            registration_entries = list(results)
+            next_key = results.last_evaluated_key
 
         except QueryError as e:
             message = f'Failed to query registrations: {str(e)}'
-            logger.error(f'[{self.core_obj} = {email}]: {message}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+            logger.error('[%s = %s]: %s', self.core_obj, event_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, ([], None), message
 
         except TableDoesNotExist as db_error:
             message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
-            logger.error(f'[{self.core_obj} = {email}]: {message}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+            logger.error('[%s = %s]: %s', self.core_obj, event_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, ([], None), message
 
         except PynamoDBConnectionError as db_error:
             message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
-            logger.error(f'[{self.core_obj} = {email}]: {message}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
-        else:
-            logger.info(f'[{self.core_obj}]: Fetch Registration with email {email} successful')
-            return HTTPStatus.OK, registration_entries, None
-
-    def update_registration(
-        self, registration_entry: Registration, registration_in: RegistrationIn
-    ) -> Tuple[HTTPStatus, Registration, str]:
-        """
-        Update a registration record in the database.
-
-        Args:
-            registration_entry (Registration): The existing registration record to be updated.
-            registration_in (RegistrationIn): The new registration data.
-
-        Returns:
-            Tuple[HTTPStatus, Registration, str]: A tuple containing HTTP status, the updated registration record,
-            and an optional error message.
-        """
-        data = RepositoryUtils.load_data(pydantic_schema_in=registration_in, exclude_unset=True)
-        has_update, updated_data = RepositoryUtils.get_update(
-            old_data=RepositoryUtils.db_model_to_dict(registration_entry), new_data=data
-        )
-        if not has_update:
-            return HTTPStatus.OK, registration_entry, 'No update'
-
-        try:
-            with TransactWrite(connection=self.conn) as transaction:
-                # Update Entry
-                updated_data.update(
-                    updateDate=self.current_date,
-                )
-                actions = [getattr(Registration, k).set(v) for k, v in updated_data.items()]
-                transaction.update(registration_entry, actions=actions)
-
-            registration_entry.refresh()
-            logger.info(f'[{registration_entry.rangeKey}] ' f'Update event data succesful')
-            return HTTPStatus.OK, registration_entry, ''
-
-        except TransactWriteError as e:
-            message = f'Failed to update event data: {str(e)}'
-            logger.error(f'[{registration_entry.rangeKey}] {message}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
-
-    def delete_registration(self, registration_entry: Registration) -> HTTPStatus:
-        """
-        Delete a registration record from the database.
-
-        Args:
-            registration_entry (Registration): The registration record to be deleted.
-
-        Returns:
-            HTTPStatus: The HTTP status of the operation.
-        """
-        try:
-            registration_entry.delete()
-            logger.info(f'[{registration_entry.rangeKey}] ' f'Delete event data successful')
-            return HTTPStatus.OK
-
-        except DeleteError as e:
-            message = f'Failed to delete event data: {str(e)}'
-            logger.error(f'[{registration_entry.rangeKey}] {message}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR
-
-import os
-from datetime import datetime
-from http import HTTPStatus
-from typing import List, Tuple
-
-from pynamodb.connection import Connection
-from pynamodb.exceptions import (
-    DeleteError,
-    PynamoDBConnectionError,
-    QueryError,
-    TableDoesNotExist,
-    TransactWriteError,
-)
-from pynamodb.transactions import TransactWrite
+            logger.error('[%s = %s]: %s', self.core_obj, event_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, ([], None), message
 
-from constants.common_constants import EntryStatus
-from model.registrations.registration import Registration, RegistrationIn
-from repository.repository_utils import RepositoryUtils
-from utils.logger import logger
-
-
-class RegistrationsRepository:
-    """
-    A repository class for managing registration records in a DynamoDB table.
-
-    This class provides methods for storing, querying, updating, and deleting registration records.
-
-    Attributes:
-        core_obj (str): The core object name for registration records.
-        current_date (str): The current date and time in ISO format.
-        conn (Connection): The PynamoDB connection for database operations.
-    """
-
-    def __init__(self) -> None:
-        self.core_obj = 'Registration'
-        self.current_date = datetime.utcnow().isoformat()
-        self.conn = Connection(region=os.getenv('REGION'))
-
-    def query_registrations(
-        self, event_id: str = None, registration_id: str = None
-    ) -> Tuple[HTTPStatus, List[Registration], str]:
-        """
-        Query registration records from the database.
-
-        Args:
-            event_id (str, optional): The event ID to query (default is None to query all records).
-            registration_id (str, optional): The registration ID to query (default is None to query all records).
-
-        Returns:
-            Tuple[HTTPStatus, List[Registration], str]: A tuple containing HTTP status, a list of registration records,
-            and an optional error message.
-        """
-        try:
-            if event_id is None:
-                registration_entries = list(
-                    Registration.scan(
-                        filter_condition=Registration.entryStatus == EntryStatus.ACTIVE.value,
-                    )
-                )
-            elif registration_id:
-                registration_entries = list(
-                    Registration.query(
-                        hash_key=event_id,
-                        range_key_condition=Registration.rangeKey.__eq__(registration_id),
-                        filter_condition=Registration.entryStatus == EntryStatus.ACTIVE.value,
-                    )
-                )
-            else:
-                registration_entries = list(
-                    Registration.query(
-                        hash_key=event_id,
-                        filter_condition=Registration.entryStatus == EntryStatus.ACTIVE.value,
-                    )
-                )
-
-            if not registration_entries:
-                if registration_id:
-                    message = f'Registration with id {registration_id} not found'
-                    logger.error(f'[{self.core_obj}={registration_id}] {message}')
-                else:
-                    message = 'No registration found'
-                    logger.error(f'[{self.core_obj}] {message}')
-
-                return HTTPStatus.NOT_FOUND, None, message
-
-        except QueryError as e:
-            message = f'Failed to query registration: {str(e)}'
-            logger.error(f'[{self.core_obj} = {registration_id}]: {message}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
-        except TableDoesNotExist as db_error:
-            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
-            logger.error(f'[{self.core_obj} = {registration_id}]: {message}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
-
-        except PynamoDBConnectionError as db_error:
-            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
-            logger.error(f'[{self.core_obj} = {registration_id}]: {message}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
         else:
-            if registration_id:
-                logger.info(f'[{self.core_obj} = {registration_id}]: Fetch Registration data successful')
-                return HTTPStatus.OK, registration_entries[0], None
-
-            logger.info(f'[{self.core_obj}]: Fetch Registration data successful')
-            return HTTPStatus.OK, registration_entries, None
+            logger.info(
+                '[%s = %s]: Fetch %s registrations successful',
+                self.core_obj,
+                event_id,
+                len(registration_entries),
+                category='repository',
+            )
+            return HTTPStatus.OK, (registration_entries, next_key), None
 
     def query_registrations_with_email(
         self, event_id: str, email: str, exclude_registration_id: str = None
@@ -351,26 +193,28 @@ class RegistrationsRepository:
 
             if not registration_entries:
                 message = f'Registration with email {email} not found'
-                logger.error(f'[{self.core_obj}={email}] {message}')
+                logger.error('[%s=%s] %s', self.core_obj, email, message, category='repository')
 
                 return HTTPStatus.NOT_FOUND, None, message
 
         except QueryError as e:
             message = f'Failed to query registrations: {str(e)}'
-            logger.error(f'[{self.core_obj} = {email}]: {message}')
+            logger.error('[%s = %s]: %s', self.core_obj, email, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
         except TableDoesNotExist as db_error:
             message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
-            logger.error(f'[{self.core_obj} = {email}]: {message}')
+            logger.error('[%s = %s]: %s', self.core_obj, email, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
         except PynamoDBConnectionError as db_error:
             message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
-            logger.error(f'[{self.core_obj} = {email}]: {message}')
+            logger.error('[%s = %s]: %s', self.core_obj, email, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
         else:
-            logger.info(f'[{self.core_obj}]: Fetch Registration with email {email} successful')
+            logger.info(
+                '[%s]: Fetch Registration with email %s successful', self.core_obj, email, category='repository'
+            )
             return HTTPStatus.OK, registration_entries, None
 
     def update_registration(
@@ -404,14 +248,64 @@ class RegistrationsRepository:
                 transaction.update(registration_entry, actions=actions)
 
             registration_entry.refresh()
-            logger.info(f'[{registration_entry.rangeKey}] ' f'Update event data succesful')
+            logger.info('[%s] Update event data succesful', registration_entry.rangeKey, category='repository')
             return HTTPStatus.OK, registration_entry, ''
 
         except TransactWriteError as e:
             message = f'Failed to update event data: {str(e)}'
-            logger.error(f'[{registration_entry.rangeKey}] {message}')
+            logger.error('[%s] %s', registration_entry.rangeKey, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
 
+    def update_registration_with_key(
+        self, event_id: str, registration_id: str, registration_in: RegistrationIn
+    ) -> Tuple[HTTPStatus, str]:
+        """
+        Update a registration by its key with one conditional UpdateItem, without reading it first.
+
+        The update only applies to an active registration that exists, so a wrong key never creates an item.
+
+        Args:
+            event_id (str): The event ID of the registration (its hash key).
+            registration_id (str): The registration ID (its range key).
+            registration_in (RegistrationIn): The new registration data.
+
+        Returns:
+            Tuple[HTTPStatus, str]: A tuple containing HTTP status (NOT_FOUND when there is no active registration
+            with the key) and an optional error message.
+        """
+        data = RepositoryUtils.load_data(pydantic_schema_in=registration_in, exclude_unset=True)
+        # The repository outlives many updates in the long-running worker, so the clock is read on every update
+        data.update(updateDate=datetime.utcnow().isoformat())
+        try:
+            Registration(hash_key=event_id, range_key=registration_id).update(
+                actions=[getattr(Registration, k).set(v) for k, v in data.items()],
+                condition=Registration.hashKey.exists() & (Registration.entryStatus == EntryStatus.ACTIVE.value),
+            )
+
+        except UpdateError as e:
+            if e.cause_response_code == 'ConditionalCheckFailedException':
+                message = f'Registration with id {registration_id} not found'
+                logger.error('[%s=%s] %s', self.core_obj, registration_id, message, category='repository')
+                return HTTPStatus.NOT_FOUND, message
+
+            message = f'Failed to update event data: {str(e)}'
+            logger.error('[%s] %s', registration_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            logger.error('[%s = %s]: %s', self.core_obj, registration_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s = %s]: %s', self.core_obj, registration_id, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        else:
+            logger.info('[%s] Update event data succesful', registration_id, category='repository')
+            return HTTPStatus.OK, ''
+
     def delete_registration(self, registration_entry: Registration) -> HTTPStatus:
         """
         Delete a registration record from the database.
@@ -424,10 +318,10 @@ class RegistrationsRepository:
         """
         try:
             registration_entry.delete()
-            logger.info(f'[{registration_entry.rangeKey}] ' f'Delete event data successful')
+            logger.info('[%s] Delete event data successful', registration_entry.rangeKey, category='repository')
             return HTTPStatus.OK
 
         except DeleteError as e:
             message = f'Failed to delete event data: {str(e)}'
-            logger.error(f'[{registration_entry.rangeKey}] {message}')
+            logger.error('[%s] %s', registration_entry.rangeKey, message, category='repository')
             return HTTPStatus.INTERNAL_SERVER_ERROR
@@ -0,0 +1,177 @@
+import os
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import List, Tuple
+
+from pynamodb.exceptions import (
+    PutError,
+    PynamoDBConnectionError,
+    QueryError,
+    TableDoesNotExist,
+)
+
+from constants.common_constants import CommonConstants, EntryStatus
+from model.email.email import ScheduledEmail, ScheduledEmailIn
+from utils.logger import logger
+
+
+class ScheduledEmailsRepository:
+    """
+    A repository class for managing scheduled email records in a DynamoDB table.
+
+    Scheduled emails are bulk emails held back until the primary SMTP quota has room again. The range key starts
+    with the earliest send time, so the emails that are due are read in send order with a single key range query.
+    Records expire through the DynamoDB TTL on expiresAt.
+
+    Attributes:
+        core_obj (str): The core object name for scheduled email records.
+        current_date (str): The current date and time in ISO format.
+        ttl (timedelta): How long a record is kept after its send time.
+    """
+
+    def __init__(self) -> None:
+        self.core_obj = 'ScheduledEmail'
+        self.current_date = datetime.utcnow().isoformat()
+        self.ttl = timedelta(
+            seconds=int(os.getenv('SCHEDULED_EMAIL_TTL_SECONDS', CommonConstants.SCHEDULED_EMAIL_TTL_SECONDS))
+        )
+
+    @staticmethod
+    def get_time_key(time: datetime) -> str:
+        return time.strftime(CommonConstants.SCHEDULED_EMAIL_KEY_FORMAT)
+
+    def query_due_scheduled_emails(self, now: datetime, limit: int) -> Tuple[HTTPStatus, List[ScheduledEmail], str]:
+        """
+        Query the scheduled emails whose send time has come, earliest first.
+
+        Args:
+            now (datetime): The current time.
+            limit (int): The maximum number of scheduled emails to return.
+
+        Returns:
+            Tuple[HTTPStatus, List[ScheduledEmail], str]: A tuple containing HTTP status, the due scheduled emails,
+            and an optional error message.
+        """
+        try:
+            scheduled_email_entries = list(
+                ScheduledEmail.query(
+                    hash_key=self.core_obj,
+                    # '~' sorts after every character of the content hash
+                    range_key_condition=ScheduledEmail.rangeKey <= f'{self.get_time_key(now)}#~',
+                    filter_condition=ScheduledEmail.entryStatus == EntryStatus.ACTIVE.value,
+                    limit=limit,
+                )
+            )
+
+        except QueryError as e:
+            message = f'Failed to query scheduled emails: {str(e)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, [], message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, [], message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, [], message
+
+        else:
+            logger.info(
+                '[%s]: Fetch %s due scheduled emails successful',
+                self.core_obj,
+                len(scheduled_email_entries),
+                category='repository',
+            )
+            return HTTPStatus.OK, scheduled_email_entries, None
+
+    def store_scheduled_emails(self, scheduled_email_ins: List[ScheduledEmailIn]) -> Tuple[HTTPStatus, str]:
+        """
+        Store scheduled emails in bulk. Storing the same email for the same send time again overwrites it.
+
+        Args:
+            scheduled_email_ins (List[ScheduledEmailIn]): The emails to schedule.
+
+        Returns:
+            Tuple[HTTPStatus, str]: A tuple containing HTTP status and an optional error message.
+        """
+        try:
+            with ScheduledEmail.batch_write() as batch:
+                for scheduled_email_in in scheduled_email_ins:
+                    time_key = self.get_time_key(scheduled_email_in.sendAfter)
+                    range_key = f'{time_key}#{scheduled_email_in.scheduledEmailId}'
+                    batch.save(
+                        ScheduledEmail(
+                            hashKey=self.core_obj,
+                            rangeKey=range_key,
+                            createDate=self.current_date,
+                            updateDate=self.current_date,
+                            createdBy=os.getenv('CURRENT_USER'),
+                            updatedBy=os.getenv('CURRENT_USER'),
+                            latestVersion=0,
+                            entryStatus=EntryStatus.ACTIVE.value,
+                            entryId=scheduled_email_in.scheduledEmailId,
+                            sendAfter=scheduled_email_in.sendAfter.isoformat(),
+                            sendBefore=scheduled_email_in.sendBefore.isoformat()
+                            if scheduled_email_in.sendBefore
+                            else None,
+                            emailType=scheduled_email_in.emailType.value if scheduled_email_in.emailType else None,
+                            payload=scheduled_email_in.payload,
+                            expiresAt=scheduled_email_in.sendAfter + self.ttl,
+                        )
+                    )
+
+        except PutError as e:
+            message = f'Failed to save scheduled emails: {str(e)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        else:
+            logger.info(
+                '[%s]: Saved %s scheduled emails', self.core_obj, len(scheduled_email_ins), category='repository'
+            )
+            return HTTPStatus.OK, ''
+
+    def delete_scheduled_emails(self, scheduled_email_entries: List[ScheduledEmail]) -> Tuple[HTTPStatus, str]:
+        """
+        Delete scheduled emails in bulk.
+
+        Args:
+            scheduled_email_entries (List[ScheduledEmail]): The scheduled emails to delete.
+
+        Returns:
+            Tuple[HTTPStatus, str]: A tuple containing HTTP status and an optional error message.
+        """
+        try:
+            with ScheduledEmail.batch_write() as batch:
+                for scheduled_email_entry in scheduled_email_entries:
+                    batch.delete(scheduled_email_entry)
+
+        except PutError as e:
+            # Batch deletes are sent as batch writes
+            message = f'Failed to delete scheduled emails: {str(e)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        else:
+            logger.info(
+                '[%s]: Deleted %s scheduled emails', self.core_obj, len(scheduled_email_entries), category='repository'
+            )
+            return HTTPStatus.OK, ''
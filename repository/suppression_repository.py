@@ -0,0 +1,166 @@
+import os
+from datetime import datetime
+from http import HTTPStatus
+from typing import List, Set, Tuple
+
+from pynamodb.exceptions import (
+    GetError,
+    PutError,
+    PynamoDBConnectionError,
+    QueryError,
+    TableDoesNotExist,
+)
+
+from constants.common_constants import EntryStatus
+from model.suppression.suppression import SuppressedEmail, SuppressedEmailIn
+from utils.logger import logger
+
+
+class SuppressionRepository:
+    """
+    A repository class for managing suppressed email addresses in a DynamoDB table.
+
+    Addresses are stored lowercased as the range key, so they can be listed with a single paginated query
+    and checked in bulk with BatchGetItem.
+
+    Attributes:
+        core_obj (str): The core object name for suppressed email records.
+        current_date (str): The current date and time in ISO format.
+    """
+
+    def __init__(self) -> None:
+        self.core_obj = 'SuppressedEmail'
+        self.current_date = datetime.utcnow().isoformat()
+
+    def query_suppressed_emails(self) -> Tuple[HTTPStatus, List[str], str]:
+        """
+        Query every suppressed email address.
+
+        Returns:
+            Tuple[HTTPStatus, List[str], str]: A tuple containing HTTP status, the suppressed addresses,
+            and an optional error message.
+        """
+        try:
+            suppressed_emails = [
+                entry.rangeKey
+                for entry in SuppressedEmail.query(
+                    hash_key=self.core_obj,
+                    filter_condition=SuppressedEmail.entryStatus == EntryStatus.ACTIVE.value,
+                )
+            ]
+
+        except QueryError as e:
+            message = f'Failed to query suppressed emails: {str(e)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, [], message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, [], message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, [], message
+
+        else:
+            logger.info(
+                '[%s]: Fetch %s suppressed emails successful',
+                self.core_obj,
+                len(suppressed_emails),
+                category='repository',
+            )
+            return HTTPStatus.OK, suppressed_emails, None
+
+    def query_suppressed_with_emails(self, emails: List[str]) -> Tuple[HTTPStatus, Set[str], str]:
+        """
+        Get which of the email addresses are suppressed, in bulk.
+
+        Args:
+            emails (List[str]): The lowercased email addresses to check.
+
+        Returns:
+            Tuple[HTTPStatus, Set[str], str]: A tuple containing HTTP status, the suppressed addresses,
+            and an optional error message.
+        """
+        if not emails:
+            return HTTPStatus.OK, set(), None
+
+        try:
+            suppressed_emails = {
+                entry.rangeKey
+                for entry in SuppressedEmail.batch_get([(self.core_obj, email) for email in set(emails)])
+                if entry.entryStatus == EntryStatus.ACTIVE.value
+            }
+
+        except GetError as e:
+            message = f'Failed to query suppressed emails: {str(e)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, set(), message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, set(), message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, set(), message
+
+        else:
+            return HTTPStatus.OK, suppressed_emails, None
+
+    def import_suppressed_emails(self, suppressed_email_ins: List[SuppressedEmailIn]) -> Tuple[HTTPStatus, str]:
+        """
+        Store suppressed email addresses in bulk.
+
+        Args:
+            suppressed_email_ins (List[SuppressedEmailIn]): The addresses to suppress.
+
+        Returns:
+            Tuple[HTTPStatus, str]: A tuple containing HTTP status and an optional error message.
+        """
+        try:
+            with SuppressedEmail.batch_write() as batch:
+                for suppressed_email_in in suppressed_email_ins:
+                    email = suppressed_email_in.email.lower()
+                    batch.save(
+                        SuppressedEmail(
+                            hashKey=self.core_obj,
+                            rangeKey=email,
+                            createDate=self.current_date,
+                            updateDate=self.current_date,
+                            createdBy=os.getenv('CURRENT_USER'),
+                            updatedBy=os.getenv('CURRENT_USER'),
+                            latestVersion=0,
+                            entryStatus=EntryStatus.ACTIVE.value,
+                            entryId=email,
+                            reason=suppressed_email_in.reason.value,
+                        )
+                    )
+
+        except PutError as e:
+            message = f'Failed to save suppressed emails: {str(e)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            logger.error('[%s]: %s', self.core_obj, message, category='repository')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        else:
+            logger.info(
+                '[%s]: Import %s suppressed emails successful',
+                self.core_obj,
+                len(suppressed_email_ins),
+                category='repository',
+            )
+            return HTTPStatus.OK, ''
@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+from collections import defaultdict
+
+PROFILE_LOG_PREFIX = 'PROFILE'
+
+
+def load_artifacts(paths):
+    """
+    Loads profile artifacts from JSON files, directories of JSON files, or exported log files
+
+    :param paths: files or directories to read
+    :return: list of artifact dicts
+    """
+    file_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            file_paths.extend(os.path.join(path, name) for name in sorted(os.listdir(path)))
+        else:
+            file_paths.append(path)
+
+    artifacts = []
+    for file_path in file_paths:
+        with open(file_path, 'r', encoding='utf-8') as file_handle:
+            for line in file_handle:
+                line = line.strip()
+                if PROFILE_LOG_PREFIX in line:
+                    line = line.split(PROFILE_LOG_PREFIX, 1)[1].strip()
+                if not line.startswith('{'):
+                    continue
+                try:
+                    artifacts.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+
+    return artifacts
+
+
+def aggregate_profiles(artifacts, top_n):
+    """
+    Prints the hottest functions and allocation sites across profile artifacts
+
+    :param artifacts: list of artifact dicts
+    :param top_n: number of rows to print per table
+    :return: None
+    """
+    functions = defaultdict(lambda: {'calls': 0, 'totalTime': 0.0, 'cumulativeTime': 0.0, 'profiles': 0})
+    allocations = defaultdict(lambda: {'sizeKiB': 0.0, 'count': 0, 'profiles': 0})
+    for artifact in artifacts:
+        for function in artifact['functions']:
+            entry = functions[function['function']]
+            entry['calls'] += function['calls']
+            entry['totalTime'] += function['totalTime']
+            entry['cumulativeTime'] += function['cumulativeTime']
+            entry['profiles'] += 1
+        for allocation in artifact['allocations']:
+            entry = allocations[allocation['location']]
+            entry['sizeKiB'] += allocation['sizeKiB']
+            entry['count'] += allocation['count']
+            entry['profiles'] += 1
+
+    durations = sorted(artifact['durationMs'] for artifact in artifacts)
+    peaks = sorted(artifact['peakMemoryKiB'] for artifact in artifacts)
+    print(f'Profiles: {len(artifacts)}')
+    print(f'Duration ms: p50={durations[len(durations) // 2]:.1f} max={durations[-1]:.1f}')
+    print(f'Peak traced memory KiB: p50={peaks[len(peaks) // 2]:.1f} max={peaks[-1]:.1f}')
+
+    print(f'\n{"cumulative s":>13} {"total s":>10} {"calls":>9} {"seen":>5}  function')
+    for name, entry in sorted(functions.items(), key=lambda item: item[1]['cumulativeTime'], reverse=True)[:top_n]:
+        print(
+            f'{entry["cumulativeTime"]:>13.4f} {entry["totalTime"]:>10.4f} {entry["calls"]:>9} '
+            f'{entry["profiles"]:>5}  {name}'
+        )
+
+    print(f'\n{"avg KiB":>10} {"avg blocks":>11} {"seen":>5}  location')
+    for name, entry in sorted(allocations.items(), key=lambda item: item[1]['sizeKiB'], reverse=True)[:top_n]:
+        print(
+            f'{entry["sizeKiB"] / entry["profiles"]:>10.1f} {entry["count"] // entry["profiles"]:>11} '
+            f'{entry["profiles"]:>5}  {name}'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Aggregates profile artifacts written by the send email handler')
+    parser.add_argument('paths', nargs='+', help='Profile JSON files, directories (e.g. /tmp/profiles) or log exports')
+    parser.add_argument('-n', '--top', type=int, default=20, help='Rows per table (default: 20)')
+    args = parser.parse_args()
+
+    profile_artifacts = load_artifacts(args.paths)
+    if not profile_artifacts:
+        print('No profile artifacts found')
+    else:
+        aggregate_profiles(profile_artifacts, args.top)
@@ -0,0 +1,314 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from http import HTTPStatus
+from unittest import mock
+
+# Keep the benchmarked code quiet and off the network before it is imported
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ.setdefault('METRICS_EXPORTER', 'none')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-southeast-1')
+os.environ.setdefault('REGION', 'ap-southeast-1')
+
+import jinja2  # noqa: E402
+
+from model.email.email import EmailIn  # noqa: E402
+from model.registrations.registration import Registration, RegistrationIn  # noqa: E402
+from repository.repository_utils import RepositoryUtils  # noqa: E402
+from usecase.validation_usecase import ValidationUsecase  # noqa: E402
+
+DEFAULT_BASELINE_PATH = '.benchmarks/baseline.json'
+TEMPLATE_DIR = 'template'
+
+EMAIL_DATA = {
+    'to': ['juan.delacruz@example.com'],
+    'cc': ['organizer@example.com'],
+    'bcc': None,
+    'subject': 'PyCon Davao Registration Confirmation',
+    'salutation': 'Good day Juan,',
+    'body': [
+        'Thank you for registering for the upcoming PyCon Davao!',
+        "We're thrilled to have you join us. If you have any questions, please don't hesitate to reach out.",
+        'See you soon!',
+    ],
+    'regards': ['Best Regards,', 'DurianPy Team'],
+    'emailType': 'registrationEmail',
+    'eventId': 'pycon-davao',
+    'isDurianPy': True,
+}
+
+
+class FakeSMTP:
+    """
+    Accepts every message without touching the network
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.timeout = kwargs.get('timeout')
+        self.sock = mock.Mock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        pass
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        return {}
+
+    def noop(self):
+        return 250, b'OK'
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeEmailTracker:
+    lastEmailSent = '2099-01-01T00:00:00+00:00'
+    dailyEmailCount = 0
+
+
+def measure(func, min_time: float, allocation_runs: int = 5) -> dict:
+    """
+    Measures the throughput and the peak traced memory of a function
+
+    :param func: function without arguments to benchmark
+    :param min_time: minimum measuring time in seconds
+    :param allocation_runs: number of single calls traced with tracemalloc
+    :return: dict with ops_per_sec and peak_kib_per_op
+    """
+    for _ in range(3):
+        func()
+
+    iterations = 0
+    start_time = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        func()
+        iterations += 1
+        elapsed = time.perf_counter() - start_time
+
+    peaks = []
+    for _ in range(allocation_runs):
+        tracemalloc.start()
+        func()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        'ops_per_sec': round(iterations / elapsed, 1),
+        'peak_kib_per_op': round(min(peaks) / 1024, 2),
+    }
+
+
+def get_benchmarks(handler_batch_size: int) -> dict:
+    """
+    Builds the benchmarked hot path functions
+
+    :param handler_batch_size: number of emails in the SQS record of the handler benchmark
+    :return: dict of benchmark name to function
+    """
+    email_batch = [EMAIL_DATA] * handler_batch_size
+    benchmarks = {
+        'email_in_validation': lambda: EmailIn(**EMAIL_DATA),
+        f'email_bulk_validation[{handler_batch_size} emails]': lambda: ValidationUsecase().validate_emails(email_batch),
+    }
+
+    j2 = jinja2.Environment()
+    dist_dir = os.path.join(TEMPLATE_DIR, 'dist')
+    template_files = sorted(os.listdir(TEMPLATE_DIR))
+    if os.path.isdir(dist_dir):
+        template_files += [f'dist/{template_file}' for template_file in sorted(os.listdir(dist_dir))]
+    for template_file in template_files:
+        if not template_file.endswith('.html'):
+            continue
+        with open(os.path.join(TEMPLATE_DIR, template_file), 'r', encoding='utf-8') as file_handle:
+            template_content = file_handle.read()
+
+        def render(template_content=template_content):
+            return j2.from_string(template_content).render(
+                frontend_url='https://example.com',
+                salutation=EMAIL_DATA['salutation'],
+                body=EMAIL_DATA['body'],
+                regards=EMAIL_DATA['regards'],
+            )
+
+        benchmarks[f'template_render[{template_file}]'] = render
+
+    with mock.patch('utils.utils.Utils.get_secret', return_value=''):
+        from usecase.email_usecase import EmailUsecase
+
+        email_usecase = EmailUsecase()
+
+    content = benchmarks.get(
+        'template_render[dist/durianPyEmailTemplate.html]', benchmarks['template_render[durianPyEmailTemplate.html]']
+    )()
+
+    def create_email():
+        msg = email_usecase.create_email(
+            sender_email='SPARCS <sparcs@example.com>',
+            subject=EMAIL_DATA['subject'],
+            content=content,
+            to_email=EMAIL_DATA['to'],
+            cc=EMAIL_DATA['cc'],
+        )
+        return email_usecase.serialize_email(msg)
+
+    benchmarks['create_email_as_string'] = create_email
+
+    registration = Registration(
+        hashKey='pycon-davao',
+        rangeKey='registration-id',
+        registrationId='registration-id',
+        entryStatus='ACTIVE',
+        createDate='2024-01-01T00:00:00',
+        updateDate='2024-01-01T00:00:00',
+        email='juan.delacruz@example.com',
+        firstName='Juan',
+        lastName='Dela Cruz',
+    )
+    registration_in = RegistrationIn(registrationEmailSent=True)
+    benchmarks['db_model_to_dict'] = lambda: RepositoryUtils.db_model_to_dict(registration)
+    benchmarks['get_update'] = lambda: RepositoryUtils.get_update(
+        old_data=RepositoryUtils.db_model_to_dict(registration),
+        new_data=RepositoryUtils.load_data(pydantic_schema_in=registration_in, exclude_unset=True),
+    )
+
+    benchmarks[f'handler_record[{handler_batch_size} emails]'] = get_handler_benchmark(handler_batch_size)
+    return benchmarks
+
+
+def get_handler_benchmark(batch_size: int):
+    """
+    Builds the handler benchmark, with SQS, DynamoDB, SSM and SMTP stubbed out
+
+    :param batch_size: number of emails in the SQS record
+    :return: function running the handler on one record
+    """
+    email_data = dict(EMAIL_DATA, eventId=None)
+    patches = [
+        mock.patch('utils.utils.Utils.get_secret', return_value=''),
+        mock.patch('boto3.client'),
+        mock.patch('smtplib.SMTP', FakeSMTP),
+        mock.patch(
+            'repository.suppression_repository.SuppressionRepository.query_suppressed_emails',
+            return_value=(HTTPStatus.OK, [], None),
+        ),
+        mock.patch(
+            'repository.email_idempotency_repository.EmailIdempotencyRepository.query_delivered_keys',
+            return_value=(HTTPStatus.OK, set(), None),
+        ),
+        mock.patch(
+            'repository.email_idempotency_repository.EmailIdempotencyRepository.store_delivered_keys',
+            return_value=(HTTPStatus.OK, ''),
+        ),
+        mock.patch(
+            'repository.email_tracker_repository.EmailTrackersRepository.query_email_tracker',
+            return_value=(HTTPStatus.OK, FakeEmailTracker(), None),
+        ),
+        mock.patch(
+            'repository.email_tracker_repository.EmailTrackersRepository.append_email_sent_count',
+            return_value=(HTTPStatus.OK, FakeEmailTracker(), ''),
+        ),
+        mock.patch(
+            'repository.email_delivery_log_repository.EmailDeliveryLogRepository.store_email_delivery_logs',
+            return_value=(HTTPStatus.OK, ''),
+        ),
+    ]
+    for patch in patches:
+        patch.start()
+
+    import handler
+
+    counter = {'record': 0}
+
+    def run_handler():
+        counter['record'] += 1
+        event = {
+            'Records': [
+                {
+                    'messageId': f'message-{counter["record"]}',
+                    'receiptHandle': 'receipt-handle',
+                    'body': json.dumps([email_data] * batch_size),
+                }
+            ]
+        }
+        return handler.send_email_handler(event, None)
+
+    return run_handler
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compares results against a baseline
+
+    :param results: current benchmark results
+    :param baseline: stored benchmark results
+    :param threshold: allowed relative slowdown or memory growth, e.g. 0.2 for 20%
+    :return: list of regression descriptions
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        if result['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            regressions.append(f'{name}: {result["ops_per_sec"]} ops/s vs baseline {base["ops_per_sec"]} ops/s')
+        if result['peak_kib_per_op'] > base['peak_kib_per_op'] * (1 + threshold) + 1:
+            regressions.append(
+                f'{name}: {result["peak_kib_per_op"]} KiB/op vs baseline {base["peak_kib_per_op"]} KiB/op'
+            )
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Micro-benchmarks of the email sending hot path')
+    parser.add_argument('-t', '--min-time', type=float, default=1.0, help='Seconds per benchmark (default: 1.0)')
+    parser.add_argument('-k', '--filter', default='', help='Only run benchmarks whose name contains this text')
+    parser.add_argument('-b', '--baseline', default=DEFAULT_BASELINE_PATH, help='Baseline file path')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Regression threshold (default: 0.2)')
+    parser.add_argument('--batch-size', type=int, default=50, help='Emails per record in the handler benchmark')
+    args = parser.parse_args()
+
+    benchmark_results = {}
+    print(f'{"benchmark":<50} {"ops/sec":>12} {"peak KiB/op":>12}')
+    for benchmark_name, benchmark in get_benchmarks(args.batch_size).items():
+        if args.filter not in benchmark_name:
+            continue
+        benchmark_results[benchmark_name] = measure(benchmark, args.min_time)
+        result = benchmark_results[benchmark_name]
+        print(f'{benchmark_name:<50} {result["ops_per_sec"]:>12} {result["peak_kib_per_op"]:>12}')
+
+    if args.save_baseline:
+        baseline_results = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as file_handle:
+                baseline_results = json.load(file_handle)
+        baseline_results.update(benchmark_results)
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as file_handle:
+            json.dump(baseline_results, file_handle, indent=2, sort_keys=True)
+        print(f'Baseline saved to {args.baseline}')
+
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as file_handle:
+            found_regressions = compare(benchmark_results, json.load(file_handle), args.threshold)
+        if found_regressions:
+            print('\nRegressions:')
+            for regression in found_regressions:
+                print(f'  {regression}')
+            sys.exit(1)
+        print('\nNo regressions against the baseline')
@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+DEFAULT_ENDPOINT_URL = 'http://localhost:8000'
+BENCHMARK_EVENT_ID = 'benchmark-event'
+
+
+def configure_environment(endpoint_url: str) -> None:
+    """
+    Points both the blocking and the async repositories at DynamoDB Local; must run before any model is imported
+
+    :param endpoint_url: DynamoDB Local endpoint
+    :return: None
+    """
+    os.environ.update(
+        {
+            'AWS_ACCESS_KEY_ID': 'local',
+            'AWS_SECRET_ACCESS_KEY': 'local',  # nosec B105
+            'AWS_DEFAULT_REGION': 'ap-southeast-1',
+            'REGION': 'ap-southeast-1',
+            'AWS_ENDPOINT_URL_DYNAMODB': endpoint_url,
+            'DYNAMODB_ENDPOINT_URL': endpoint_url,
+            'ENTITIES_TABLE': 'benchmark-entities',
+            'REGISTRATIONS_TABLE': 'benchmark-registrations',
+        }
+    )
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+
+def percentile(values: list, percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+def seed(recipients: list) -> None:
+    """
+    Creates the tables and the registrations of the recipients, and resets the email tracker
+
+    :param recipients: recipient addresses
+    :return: None
+    """
+    from datetime import datetime, timezone
+
+    from model.email.email import EmailTrackerIn
+    from model.entities import Entities
+    from model.registrations.registration import Registration
+    from repository.email_tracker_repository import EmailTrackersRepository
+
+    for model in (Entities, Registration):
+        if not model.exists():
+            model.create_table(wait=True)
+
+    with Registration.batch_write() as batch:
+        for index, recipient in enumerate(recipients):
+            registration_id = f'registration-{index}'
+            batch.save(
+                Registration(
+                    hashKey=BENCHMARK_EVENT_ID,
+                    rangeKey=registration_id,
+                    registrationId=registration_id,
+                    entryStatus='ACTIVE',
+                    createDate='2024-01-01T00:00:00',
+                    updateDate='2024-01-01T00:00:00',
+                    eventId=BENCHMARK_EVENT_ID,
+                    email=recipient,
+                    registrationEmailSent=False,
+                )
+            )
+
+    email_tracker_in = EmailTrackerIn(lastEmailSent=datetime.now(timezone.utc), dailyEmailCount=0)
+    repository = EmailTrackersRepository()
+    status, email_tracker, _ = repository.query_email_tracker()
+    repository.create_update_email_tracker(
+        email_tracker_in=email_tracker_in, email_tracker_entry=email_tracker if status == HTTPStatus.OK else None
+    )
+
+
+def run_blocking(recipients: list, threads: int) -> tuple:
+    """
+    Runs the DynamoDB work of the email path (email lookup, flag update, tracker increment) per recipient on threads
+
+    :param recipients: recipient addresses
+    :param threads: number of threads
+    :return: elapsed seconds and per recipient latencies in milliseconds
+    """
+    from model.registrations.registration import RegistrationIn
+    from repository.email_tracker_repository import EmailTrackersRepository
+    from repository.registrations_repository import RegistrationsRepository
+
+    registrations_repository = RegistrationsRepository()
+    email_tracker_repository = EmailTrackersRepository()
+
+    def email_path(recipient: str) -> float:
+        start_time = time.perf_counter()
+        _, registrations, _ = registrations_repository.query_registrations_with_email(BENCHMARK_EVENT_ID, recipient)
+        registrations_repository.update_registration(
+            registration_entry=registrations[0], registration_in=RegistrationIn(registrationEmailSent=True)
+        )
+        _, email_tracker, _ = email_tracker_repository.query_email_tracker()
+        email_tracker_repository.append_email_sent_count(email_tracker_entry=email_tracker)
+        return (time.perf_counter() - start_time) * 1000
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(email_path, recipients))
+    return time.perf_counter() - start_time, latencies
+
+
+async def run_async(recipients: list, concurrency: int) -> tuple:
+    """
+    Runs the same work with the async repositories on one event loop
+
+    :param recipients: recipient addresses
+    :param concurrency: number of recipients in flight at once
+    :return: elapsed seconds and per recipient latencies in milliseconds
+    """
+    from model.registrations.registration import RegistrationIn
+    from repository.async_dynamodb import AsyncDynamoDB
+    from repository.async_email_tracker_repository import AsyncEmailTrackersRepository
+    from repository.async_registrations_repository import AsyncRegistrationsRepository
+
+    async with AsyncDynamoDB(max_pool_connections=concurrency) as dynamodb:
+        registrations_repository = AsyncRegistrationsRepository(dynamodb)
+        email_tracker_repository = AsyncEmailTrackersRepository(dynamodb)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def email_path(recipient: str) -> float:
+            async with semaphore:
+                start_time = time.perf_counter()
+                _, registrations, _ = await registrations_repository.query_registrations_with_email(
+                    BENCHMARK_EVENT_ID, recipient
+                )
+                await registrations_repository.update_registration(
+                    registration_entry=registrations[0], registration_in=RegistrationIn(registrationEmailSent=True)
+                )
+                await email_tracker_repository.append_email_sent_count()
+                return (time.perf_counter() - start_time) * 1000
+
+        start_time = time.perf_counter()
+        latencies = await asyncio.gather(*(email_path(recipient) for recipient in recipients))
+        return time.perf_counter() - start_time, list(latencies)
+
+
+def report(name: str, elapsed: float, latencies: list) -> None:
+    print(
+        f'{name:<28} {len(latencies) / elapsed:>10.1f} {percentile(latencies, 50):>10.1f} '
+        f'{percentile(latencies, 99):>10.1f}'
+    )
+
+
+def run_benchmark(args) -> None:
+    configure_environment(args.endpoint_url)
+    print(f'{"email path DB work":<28} {"emails/s":>10} {"p50 ms":>10} {"p99 ms":>10}')
+    for threads in (1, args.concurrency):
+        recipients = [f'attendee{index}@example.com' for index in range(args.emails)]
+        seed(recipients)
+        report(f'blocking, {threads} thread(s)', *run_blocking(recipients, threads))
+
+    recipients = [f'attendee{index}@example.com' for index in range(args.emails)]
+    seed(recipients)
+    report(f'async, {args.concurrency} in flight', *asyncio.run(run_async(recipients, args.concurrency)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compares the blocking and the async repositories of the email path against DynamoDB Local'
+    )
+    parser.add_argument(
+        '--endpoint-url',
+        default=DEFAULT_ENDPOINT_URL,
+        help=f'DynamoDB Local endpoint (default: {DEFAULT_ENDPOINT_URL})',
+    )
+    parser.add_argument('--emails', type=int, default=200, help='Emails to simulate per run (default: 200)')
+    parser.add_argument('--concurrency', type=int, default=16, help='Threads, or async emails in flight (default: 16)')
+    run_benchmark(parser.parse_args())
@@ -0,0 +1,290 @@
+import argparse
+import base64
+import os
+import re
+import sys
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'template')
+DIST_DIR = os.path.join(TEMPLATE_DIR, 'dist')
+
+# Whitespace next to these tags does not render, so it can be dropped instead of collapsed to one space
+BLOCK_TAGS = {
+    'html', 'head', 'body', 'meta', 'title', 'style', 'link', 'center', 'header', 'footer', 'div', 'p', 'table',
+    'thead', 'tbody', 'tr', 'td', 'th', 'ul', 'ol', 'li', 'br', 'hr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+}  # fmt: skip
+JINJA_PATTERN = re.compile(r'{{.*?}}|{%.*?%}|{#.*?#}', re.DOTALL)
+TOKEN_PATTERN = re.compile(r'<!--.*?-->|<![^>]*>|<[^>]*>|\x00\d+\x00|[^<\x00]+', re.DOTALL)
+TAG_NAME_PATTERN = re.compile(r'</?([a-zA-Z0-9]+)')
+STYLE_ATTRIBUTE_PATTERN = re.compile(r'(\sstyle=)(["\'])(.*?)\2', re.DOTALL)
+CLASS_ATTRIBUTE_PATTERN = re.compile(r'\sclass=(["\'])(.*?)\1', re.DOTALL)
+STYLE_BLOCK_PATTERN = re.compile(r'<style[^>]*>(.*?)</style>', re.DOTALL | re.IGNORECASE)
+CSS_RULE_PATTERN = re.compile(r'([^{}]+){([^{}]*)}')
+SIMPLE_CLASS_SELECTOR_PATTERN = re.compile(r'\.([a-zA-Z0-9_-]+)')
+ENTITY_END_PATTERN = re.compile(r'&(#[0-9]+|#x[0-9a-fA-F]+|[a-zA-Z]+)$')
+
+
+def protect_jinja(html: str) -> tuple:
+    """
+    Replaces the Jinja tags with placeholders so minifying cannot change them
+
+    :param html: template source
+    :return: the source with placeholders, and the Jinja tags by placeholder index
+    """
+    jinja_tags = []
+
+    def replace(match) -> str:
+        jinja_tags.append(match.group(0))
+        return f'\x00{len(jinja_tags) - 1}\x00'
+
+    return JINJA_PATTERN.sub(replace, html), jinja_tags
+
+
+def restore_jinja(html: str, jinja_tags: list) -> str:
+    return re.sub(r'\x00(\d+)\x00', lambda match: jinja_tags[int(match.group(1))], html)
+
+
+def split_declarations(style: str) -> list:
+    """
+    Splits a CSS declaration list on the semicolons outside of quotes, parentheses and HTML entities like &quot;
+
+    :param style: declaration list, e.g. the value of a style attribute
+    :return: (property, value) pairs
+    """
+    declarations = []
+    current = []
+    quote = None
+    depth = 0
+    for char in style:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '"\'':
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ';' and depth == 0 and not ENTITY_END_PATTERN.search(''.join(current[-10:])):
+            declarations.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    declarations.append(''.join(current))
+
+    pairs = []
+    for declaration in declarations:
+        name, separator, value = declaration.partition(':')
+        if separator and name.strip() and value.strip():
+            pairs.append((name.strip().lower(), ' '.join(value.split())))
+    return pairs
+
+
+def minify_declarations(style: str) -> str:
+    """
+    Minifies a CSS declaration list and drops the declarations overridden by a later one of the same property
+
+    A declaration is kept when the later one uses var(), since it is then a fallback for email clients
+    without custom property support.
+
+    :param style: declaration list
+    :return: minified declaration list
+    """
+    pairs = split_declarations(style)
+    kept = []
+    for index, (name, value) in enumerate(pairs):
+        later_values = [later_value for later_name, later_value in pairs[index + 1 :] if later_name == name]
+        if later_values and not ('var(' in later_values[-1] and 'var(' not in value):
+            continue
+        kept.append(f'{name}:{value}')
+    return ';'.join(kept)
+
+
+def minify_css(css: str) -> str:
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = ' '.join(css.split())
+    css = re.sub(r'\s*([{},>])\s*', r'\1', css)
+    return CSS_RULE_PATTERN.sub(lambda match: f'{match.group(1)}{{{minify_declarations(match.group(2))}}}', css)
+
+
+def inline_css(html: str) -> str:
+    """
+    Moves the style block rules of plain class selectors into the style attributes of their elements
+
+    Rules the style attribute cannot express, like :hover or media queries, stay in the style block. Inlined
+    declarations go before the element's own, so its own still win.
+
+    :param html: template with placeholders
+    :return: template with the rules inlined
+    """
+    inline_rules = []
+
+    def extract_rules(match) -> str:
+        kept_rules = []
+        css = match.group(1)
+        if '@' in css:
+            return match.group(0)
+
+        for rule in CSS_RULE_PATTERN.finditer(css):
+            selector, declarations = rule.group(1).strip(), rule.group(2)
+            if SIMPLE_CLASS_SELECTOR_PATTERN.fullmatch(selector):
+                inline_rules.append((selector[1:], declarations))
+            else:
+                kept_rules.append(rule.group(0))
+        return f'<style>{"".join(kept_rules)}</style>' if kept_rules else ''
+
+    html = STYLE_BLOCK_PATTERN.sub(extract_rules, html)
+    if not inline_rules:
+        return html
+
+    def inline_tag(match) -> str:
+        tag = match.group(0)
+        class_attribute = CLASS_ATTRIBUTE_PATTERN.search(tag)
+        if not class_attribute:
+            return tag
+
+        classes = class_attribute.group(2).split()
+        declarations = ';'.join(rule for class_name, rule in inline_rules if class_name in classes)
+        if not declarations:
+            return tag
+
+        style_attribute = STYLE_ATTRIBUTE_PATTERN.search(tag)
+        if style_attribute:
+            quote = style_attribute.group(2)
+            style = f'{declarations};{style_attribute.group(3)}'
+            return f'{tag[: style_attribute.start()]} style={quote}{style}{quote}{tag[style_attribute.end() :]}'
+
+        end = -2 if tag.endswith('/>') else -1
+        return f'{tag[:end]} style="{declarations}"{tag[end:]}'
+
+    return re.sub(r'<[a-zA-Z][^>]*>', inline_tag, html)
+
+
+def minify_tag(tag: str) -> str:
+    """
+    Collapses the whitespace of a tag and minifies its style attribute
+
+    :param tag: start or end tag
+    :return: minified tag
+    """
+    tag = STYLE_ATTRIBUTE_PATTERN.sub(
+        lambda match: f'{match.group(1)}{match.group(2)}{minify_declarations(match.group(3))}{match.group(2)}', tag
+    )
+    tag = ' '.join(tag.split())
+    return tag.replace(' >', '>').replace(' />', '/>')
+
+
+def get_token_kind(token: str, jinja_tags: list) -> str:
+    if token.startswith('\x00'):
+        return 'expression' if jinja_tags[int(token.strip('\x00'))].startswith('{{') else 'statement'
+    if token.startswith('<!'):
+        return 'block'
+    if token.startswith('<'):
+        tag_name = TAG_NAME_PATTERN.match(token)
+        return 'block' if tag_name and tag_name.group(1).lower() in BLOCK_TAGS else 'inline'
+    return 'text'
+
+
+def minify_html(html: str) -> str:
+    """
+    Minifies an email template: drops comments, collapses whitespace, inlines and minifies the CSS
+
+    Jinja tags are kept as they are. Whitespace that renders (between inline elements and text) is collapsed
+    to one space rather than removed.
+
+    :param html: template source
+    :return: minified template
+    """
+    html, jinja_tags = protect_jinja(html)
+    html = inline_css(html)
+    html = STYLE_BLOCK_PATTERN.sub(lambda match: f'<style>{minify_css(match.group(1))}</style>', html)
+
+    tokens = []
+    for token in TOKEN_PATTERN.findall(html):
+        if token.startswith('<!--') and not token.startswith('<!--['):
+            continue
+        tokens.append(minify_tag(token) if token.startswith('<') else token)
+
+    kinds = [get_token_kind(token, jinja_tags) for token in tokens]
+    output = []
+    for index, token in enumerate(tokens):
+        if kinds[index] != 'text':
+            output.append(token)
+            continue
+
+        previous_kind = kinds[index - 1] if index > 0 else 'block'
+        next_kind = kinds[index + 1] if index + 1 < len(kinds) else 'block'
+        text = ' '.join(token.split())
+        if not text:
+            # Whitespace between a block tag or a Jinja statement and another tag does not render
+            boundary_kinds = {previous_kind, next_kind}
+            if 'block' in boundary_kinds or ('statement' in boundary_kinds and 'expression' not in boundary_kinds):
+                continue
+            output.append(' ')
+            continue
+
+        if token[:1].isspace() and previous_kind not in ('block', 'statement'):
+            text = f' {text}'
+        if token[-1:].isspace() and next_kind not in ('block', 'statement'):
+            text = f'{text} '
+        output.append(text)
+
+    return restore_jinja(''.join(output), jinja_tags)
+
+
+def encoded_size(content: str) -> int:
+    return len(base64.encodebytes(content.encode('utf-8')))
+
+
+def build_templates(check: bool = False) -> int:
+    """
+    Writes the minified templates to template/dist and reports the size savings
+
+    :param check: only verify that template/dist is up to date
+    :return: exit code, 1 if a checked template is out of date
+    """
+    os.makedirs(DIST_DIR, exist_ok=True)
+    outdated = []
+    total_source = total_built = 0
+    print(f'{"template":<34} {"source":>8} {"built":>8} {"saved":>7} {"base64 saved":>13}')
+    for file_name in sorted(os.listdir(TEMPLATE_DIR)):
+        if not file_name.endswith('.html'):
+            continue
+
+        with open(os.path.join(TEMPLATE_DIR, file_name), 'r', encoding='utf-8') as file_handle:
+            source = file_handle.read()
+        built = minify_html(source)
+        if protect_jinja(source)[1] != protect_jinja(built)[1]:
+            raise ValueError(f'Jinja tags of {file_name} changed while minifying')
+
+        dist_path = os.path.join(DIST_DIR, file_name)
+        if check:
+            current = None
+            if os.path.exists(dist_path):
+                with open(dist_path, 'r', encoding='utf-8') as file_handle:
+                    current = file_handle.read()
+            if current != built:
+                outdated.append(file_name)
+        else:
+            with open(dist_path, 'w', encoding='utf-8') as file_handle:
+                file_handle.write(built)
+
+        source_size, built_size = len(source.encode('utf-8')), len(built.encode('utf-8'))
+        total_source += source_size
+        total_built += built_size
+        print(
+            f'{file_name:<34} {source_size:>8} {built_size:>8} {1 - built_size / source_size:>7.1%} '
+            f'{encoded_size(source) - encoded_size(built):>13}'
+        )
+
+    print(f'{"total":<34} {total_source:>8} {total_built:>8} {1 - total_built / max(total_source, 1):>7.1%}')
+    if outdated:
+        print(f'Out of date, run python -m scripts.build_templates: {", ".join(outdated)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Minifies the email templates and inlines their CSS into template/dist'
+    )
+    parser.add_argument('--check', action='store_true', help='Fail if template/dist is not up to date')
+    sys.exit(build_templates(check=parser.parse_args().check))
@@ -0,0 +1,44 @@
+import argparse
+import csv
+
+from dotenv import load_dotenv
+from pydantic import ValidationError
+
+from model.suppression.suppression import SuppressedEmailIn
+from usecase.suppression_usecase import SuppressionUsecase
+
+load_dotenv()
+
+
+def import_suppressions(file_path: str, default_reason: str):
+    """
+    Imports suppressed email addresses from a CSV file with an email column and an optional reason column
+
+    :param file_path: path of the CSV file
+    :param default_reason: reason used for rows without one
+    :return: None
+    """
+    suppressed_email_ins = []
+    with open(file_path, 'r', encoding='utf-8', newline='') as file_handle:
+        for row in csv.reader(file_handle):
+            if not row or not row[0].strip() or row[0].strip().lower() == 'email':
+                continue
+
+            reason = row[1].strip() if len(row) > 1 and row[1].strip() else default_reason
+            try:
+                suppressed_email_ins.append(SuppressedEmailIn(email=row[0].strip(), reason=reason))
+            except ValidationError as e:
+                print(f'Skipping invalid row {row}: {e}')
+
+    suppression_usecase = SuppressionUsecase()
+    status, message = suppression_usecase.import_suppressed_emails(suppressed_email_ins)
+    print(f'Imported {len(suppressed_email_ins)} suppressed emails: {status.phrase} {message}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk import of suppressed email addresses')
+    parser.add_argument('file', help='CSV file with email[,reason] rows')
+    parser.add_argument('-r', '--reason', default='MANUAL', help='Reason for rows without one (default: MANUAL)')
+    args = parser.parse_args()
+
+    import_suppressions(args.file, args.reason)
@@ -0,0 +1,348 @@
+import argparse
+import gzip
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+
+from moto import mock_dynamodb, mock_s3, mock_sqs, mock_ssm
+
+from constants.common_constants import EmailType
+from scripts.local_smtp_sink import LocalSmtpSink
+from usecase.lane_scheduler import LaneScheduler
+from utils.envelope import RecordEnvelope
+
+LOAD_TEST_EVENT_ID = 'load-test-event'
+LOAD_TEST_PAYLOAD_BUCKET = 'load-test-email-payloads'
+LAMBDA_TIMEOUT_MS = 900000
+
+
+class LambdaContext:
+    """
+    Minimal stand-in for the Lambda context object
+    """
+
+    def __init__(self, timeout_ms: int = LAMBDA_TIMEOUT_MS):
+        self.aws_request_id = str(uuid.uuid4())
+        self.deadline = time.monotonic() + timeout_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        return int((self.deadline - time.monotonic()) * 1000)
+
+
+def percentile(values: list, percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+def configure_environment(smtp_port: int, shard_ports: list) -> None:
+    """
+    Points the service at the local stand-ins; must run before any service module is imported
+
+    :param smtp_port: port of the local SMTP sink
+    :param shard_ports: ports of the local SMTP sinks standing in for the accounts of the sender shards
+    :return: None
+    """
+    os.environ.update(
+        {
+            'AWS_ACCESS_KEY_ID': 'testing',
+            'AWS_SECRET_ACCESS_KEY': 'testing',  # nosec B105
+            'AWS_DEFAULT_REGION': 'ap-southeast-1',
+            'REGION': 'ap-southeast-1',
+            'ENTITIES_TABLE': 'load-test-entities',
+            'REGISTRATIONS_TABLE': 'load-test-registrations',
+            'EMAIL_PAYLOAD_BUCKET': LOAD_TEST_PAYLOAD_BUCKET,
+            'SES_SMTP_HOST': '127.0.0.1',
+            'SENDGRID_SMTP_HOST': '127.0.0.1',
+            'SMTP_PORT': str(smtp_port),
+            'SENDER_EMAIL': 'sparcs@example.com',
+            'DISPLAY_EMAIL_NAME': 'SPARCS Load Test',
+            'FRONTEND_URL': 'https://example.com',
+        }
+    )
+    if shard_ports:
+        os.environ['SENDER_SHARDS'] = json.dumps(
+            [
+                {
+                    'shardId': f'shard-{index}',
+                    'senderEmail': f'sparcs{index}@example.com',
+                    'smtpPort': port,
+                    'dailyFreeTierLimit': 1000000,
+                }
+                for index, port in enumerate(shard_ports)
+            ]
+        )
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.environ.setdefault('METRICS_EXPORTER', 'none')
+
+
+def count_dynamodb_calls() -> Counter:
+    """
+    Counts DynamoDB operations issued through PynamoDB
+
+    :return: Counter of operation name to number of calls
+    """
+    from pynamodb.connection.base import Connection
+
+    calls = Counter()
+    dispatch = Connection.dispatch
+
+    def counting_dispatch(self, operation_name, operation_kwargs, *args, **kwargs):
+        calls[operation_name] += 1
+        return dispatch(self, operation_name, operation_kwargs, *args, **kwargs)
+
+    Connection.dispatch = counting_dispatch
+    return calls
+
+
+def seed_registrations(recipients: list) -> None:
+    from model.entities import Entities
+    from model.registrations.registration import Registration
+
+    Entities.create_table(wait=True)
+    Registration.create_table(wait=True)
+    with Registration.batch_write() as batch:
+        for index, recipient in enumerate(recipients):
+            registration_id = f'registration-{index}'
+            batch.save(
+                Registration(
+                    hashKey=LOAD_TEST_EVENT_ID,
+                    rangeKey=registration_id,
+                    registrationId=registration_id,
+                    entryStatus='ACTIVE',
+                    createDate='2024-01-01T00:00:00',
+                    updateDate='2024-01-01T00:00:00',
+                    eventId=LOAD_TEST_EVENT_ID,
+                    email=recipient,
+                    firstName=f'Attendee {index}',
+                )
+            )
+
+
+def build_record_body(
+    record_index: int, emails_per_record: int, recipients: list, with_registration_id: bool = True
+) -> list:
+    """
+    Builds an SQS message body in the format send_email_handler parses: a list of EmailIn dicts
+
+    :param record_index: index of the record, used in the subjects
+    :param emails_per_record: number of emails in the record
+    :param recipients: recipient addresses to cycle through
+    :param with_registration_id: carry the registration ID of the recipient, like current producers
+    :return: list of email dicts
+    """
+    messages = []
+    for email_index in range(emails_per_record):
+        recipient_index = (record_index * emails_per_record + email_index) % len(recipients)
+        recipient = recipients[recipient_index]
+        messages.append(
+            {
+                'to': [recipient],
+                'subject': f'Load Test Registration #{record_index}-{email_index}',
+                'salutation': f'Good day {recipient.split("@")[0]},',
+                'body': [
+                    'Thank you for registering for the upcoming Load Test Conference!',
+                    "We're thrilled to have you join us. If you have any questions, please reach out to us.",
+                    'See you soon!',
+                ],
+                'regards': ['Best Regards,', 'DurianPy Team'],
+                'emailType': 'registrationEmail',
+                'eventId': LOAD_TEST_EVENT_ID,
+                'registrationId': f'registration-{recipient_index}' if with_registration_id else None,
+                'isDurianPy': True,
+            }
+        )
+    return messages
+
+
+def produce(sqs, s3, queue_url: str, args, recipients: list, enqueued_at: dict) -> None:
+    """
+    Sends records to the queue at the configured rate
+
+    :return: None
+    """
+    start_time = time.monotonic()
+    for record_index in range(args.records):
+        scheduled_time = start_time + record_index / args.rate
+        delay = scheduled_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        body = build_record_body(
+            record_index, args.emails_per_record, recipients, with_registration_id=not args.legacy_payloads
+        )
+        if args.body_format == 'list':
+            message_body = json.dumps(body)
+        elif args.body_format == 'claim-check':
+            key = f'load-test/record-{record_index}.ndjson.gz'
+            s3.put_object(
+                Bucket=LOAD_TEST_PAYLOAD_BUCKET, Key=key, Body=gzip.compress(RecordEnvelope.encode_ndjson(body))
+            )
+            message_body = RecordEnvelope.encode_claim_check(LOAD_TEST_PAYLOAD_BUCKET, key)
+        else:
+            message_body = RecordEnvelope.encode(body, compress=args.body_format == 'gzip')
+        enqueued_at[record_index] = time.time()
+        sqs.send_message(
+            QueueUrl=queue_url,
+            MessageBody=message_body,
+            MessageGroupId=LaneScheduler.get_message_group_id(
+                EmailType.REGISTRATION_EMAIL, f'group-{record_index % args.message_groups}'
+            ),
+            MessageDeduplicationId=str(uuid.uuid4()),
+        )
+
+
+def run_load_test(args) -> None:
+    smtp_sink = LocalSmtpSink(latency=args.smtp_latency_ms / 1000, throttle_rate=args.throttle_rate).start()
+    shard_sinks = [
+        LocalSmtpSink(latency=args.smtp_latency_ms / 1000, throttle_rate=args.throttle_rate).start()
+        for _ in range(args.shards)
+    ]
+    configure_environment(smtp_sink.port, [shard_sink.port for shard_sink in shard_sinks])
+    smtp_sinks = [smtp_sink, *shard_sinks]
+
+    def delivered_count() -> int:
+        return sum(len(sink.messages) for sink in smtp_sinks)
+
+    with mock_dynamodb(), mock_s3(), mock_sqs(), mock_ssm():
+        import boto3
+
+        sqs = boto3.client('sqs')
+        queue_url = sqs.create_queue(
+            QueueName='load-test-email-queue.fifo',
+            Attributes={'FifoQueue': 'true', 'VisibilityTimeout': '900'},
+        )['QueueUrl']
+        os.environ['EMAIL_QUEUE'] = queue_url
+        s3 = boto3.client('s3')
+        s3.create_bucket(
+            Bucket=LOAD_TEST_PAYLOAD_BUCKET,
+            CreateBucketConfiguration={'LocationConstraint': os.environ['AWS_DEFAULT_REGION']},
+        )
+
+        recipients = [f'attendee{index}@example.com' for index in range(args.recipients)]
+        seed_registrations(recipients)
+        dynamodb_calls = count_dynamodb_calls()
+
+        import handler
+
+        dynamodb_calls.clear()
+        enqueued_at = {}
+        producer = threading.Thread(target=produce, args=(sqs, s3, queue_url, args, recipients, enqueued_at))
+        total_emails = args.records * args.emails_per_record
+        invocation_durations = []
+        records_processed = 0
+
+        start_time = time.time()
+        producer.start()
+        if args.worker:
+            from worker import QueueWorker
+
+            # Batches run in this process, where the moto stand-ins live
+            QueueWorker(queue_url=queue_url, processes=0, batch_size=args.batch_size, wait_time_seconds=1, sqs=sqs).run(
+                until=lambda: not producer.is_alive() and delivered_count() >= total_emails
+            )
+            records_processed = args.records
+
+        while records_processed < args.records:
+            response = sqs.receive_message(
+                QueueUrl=queue_url,
+                MaxNumberOfMessages=args.batch_size,
+                AttributeNames=['All'],
+            )
+            messages = response.get('Messages', [])
+            if not messages:
+                if not producer.is_alive() and delivered_count() >= total_emails:
+                    break
+                time.sleep(0.01)
+                continue
+
+            event = {
+                'Records': [
+                    {
+                        'messageId': message['MessageId'],
+                        'receiptHandle': message['ReceiptHandle'],
+                        'body': message['Body'],
+                        'attributes': message.get('Attributes', {}),
+                        'eventSource': 'aws:sqs',
+                    }
+                    for message in messages
+                ]
+            }
+            invocation_start = time.perf_counter()
+            result = handler.send_email_handler(event, LambdaContext())
+            invocation_durations.append((time.perf_counter() - invocation_start) * 1000)
+            records_processed += len(messages) - len(result['batchItemFailures'])
+
+        producer.join()
+        elapsed = time.time() - start_time
+
+    for sink in smtp_sinks:
+        sink.stop()
+    report(args, smtp_sinks, enqueued_at, invocation_durations, dynamodb_calls, total_emails, elapsed)
+
+
+def report(args, smtp_sinks, enqueued_at, invocation_durations, dynamodb_calls, total_emails, elapsed) -> None:
+    messages = [message for sink in smtp_sinks for message in sink.messages]
+    latencies = []
+    for message in messages:
+        record_index = int(message['subject'].rsplit('#', 1)[1].split('-')[0])
+        latencies.append((message['receivedAt'] - enqueued_at[record_index]) * 1000)
+
+    delivered = len(messages)
+    total_dynamodb_calls = sum(dynamodb_calls.values())
+    print(
+        f'\nRecords: {args.records} x {args.emails_per_record} emails, {args.rate} records/s, '
+        f'batch size {args.batch_size}, SMTP latency {args.smtp_latency_ms} ms, throttle rate {args.throttle_rate}'
+    )
+    print(f'Emails delivered:       {delivered} / {total_emails}')
+    print(f'Elapsed:                {elapsed:.2f} s')
+    print(f'Throughput:             {delivered / elapsed:.1f} emails/s')
+    print(
+        f'Email latency (ms):     p50={percentile(latencies, 50):.1f} p90={percentile(latencies, 90):.1f} '
+        f'p99={percentile(latencies, 99):.1f} max={max(latencies, default=0):.1f}'
+    )
+    print(
+        f'Invocation (ms):        n={len(invocation_durations)} p50={percentile(invocation_durations, 50):.1f} '
+        f'p99={percentile(invocation_durations, 99):.1f}'
+    )
+    if len(smtp_sinks) > 1:
+        shard_counts = ' '.join(f'shard-{index}={len(sink.messages)}' for index, sink in enumerate(smtp_sinks[1:]))
+        print(f'Emails per sink:        SendGrid={len(smtp_sinks[0].messages)} {shard_counts}')
+    print(f'DynamoDB calls/email:   {total_dynamodb_calls / max(delivered, 1):.2f}')
+    for operation_name, calls in dynamodb_calls.most_common():
+        print(f'  {operation_name:<20} {calls / max(delivered, 1):.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='End-to-end load test of send_email_handler with local stand-ins')
+    parser.add_argument('--records', type=int, default=50, help='SQS records to send (default: 50)')
+    parser.add_argument('--emails-per-record', type=int, default=10, help='Emails per record (default: 10)')
+    parser.add_argument('--rate', type=float, default=10.0, help='Records enqueued per second (default: 10)')
+    parser.add_argument('--batch-size', type=int, default=10, help='Records per invocation (default: 10)')
+    parser.add_argument('--message-groups', type=int, default=10, help='FIFO message groups (default: 10)')
+    parser.add_argument('--recipients', type=int, default=200, help='Distinct registered recipients (default: 200)')
+    parser.add_argument('--smtp-latency-ms', type=float, default=20.0, help='SMTP DATA latency (default: 20)')
+    parser.add_argument(
+        '--body-format',
+        choices=('list', 'envelope', 'gzip', 'claim-check'),
+        default='list',
+        help='Record body format: a list of emails, an envelope, a gzip+base64 envelope, or a claim-check '
+        'of a gzipped NDJSON envelope in S3 (default: list)',
+    )
+    parser.add_argument(
+        '--worker', action='store_true', help='Drive the queue with the long-running worker instead of invocations'
+    )
+    parser.add_argument(
+        '--shards', type=int, default=0, help='Sender shards, each with its own local SMTP sink (default: 0)'
+    )
+    parser.add_argument(
+        '--legacy-payloads',
+        action='store_true',
+        help='Leave out the registration IDs, so registrations are looked up by email',
+    )
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of 454 RCPT replies (default: 0)')
+    run_load_test(parser.parse_args())
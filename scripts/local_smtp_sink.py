@@ -0,0 +1,200 @@
+import base64
+import datetime
+import os
+import random
+import socketserver
+import ssl
+import tempfile
+import threading
+import time
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+
+def create_tls_context() -> ssl.SSLContext:
+    """
+    Creates a server TLS context with a throwaway self-signed certificate
+
+    smtplib's starttls() does not verify certificates by default, so this is enough for local runs.
+
+    :return: server side SSLContext
+    """
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'localhost')])
+    now = datetime.datetime.utcnow()
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cert_path = os.path.join(temp_dir, 'cert.pem')
+        key_path = os.path.join(temp_dir, 'key.pem')
+        with open(cert_path, 'wb') as file_handle:
+            file_handle.write(certificate.public_bytes(serialization.Encoding.PEM))
+        with open(key_path, 'wb') as file_handle:
+            file_handle.write(
+                key.private_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PrivateFormat.TraditionalOpenSSL,
+                    serialization.NoEncryption(),
+                )
+            )
+        context.load_cert_chain(cert_path, key_path)
+
+    return context
+
+
+class SmtpSinkHandler(socketserver.StreamRequestHandler):
+    """
+    Speaks enough ESMTP (EHLO, STARTTLS, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA) for smtplib, and records messages
+    """
+
+    def reply(self, line: str) -> None:
+        self.connection.sendall(f'{line}\r\n'.encode('utf-8'))
+
+    def read_line(self) -> str:
+        return self.rfile.readline().decode('utf-8', errors='replace').rstrip('\r\n')
+
+    def start_tls(self) -> None:
+        self.connection = self.server.tls_context.wrap_socket(self.connection, server_side=True)
+        self.rfile = self.connection.makefile('rb')
+
+    def handle(self) -> None:
+        sink = self.server
+        tls = False
+        recipients = []
+        self.reply('220 localhost ESMTP local sink')
+        while True:
+            line = self.read_line()
+            if not line:
+                return
+
+            verb = line.split(' ', 1)[0].upper()
+            if verb in ('EHLO', 'HELO'):
+                extensions = ['AUTH PLAIN LOGIN', '8BITMIME'] if tls else ['STARTTLS', 'AUTH PLAIN LOGIN', '8BITMIME']
+                self.reply('250-localhost')
+                for extension in extensions[:-1]:
+                    self.reply(f'250-{extension}')
+                self.reply(f'250 {extensions[-1]}')
+
+            elif verb == 'STARTTLS':
+                self.reply('220 Ready to start TLS')
+                self.start_tls()
+                tls = True
+
+            elif verb == 'AUTH':
+                parts = line.split(' ')
+                if parts[1].upper() == 'LOGIN':
+                    self.reply('334 VXNlcm5hbWU6')
+                    self.read_line()
+                    self.reply('334 UGFzc3dvcmQ6')
+                    self.read_line()
+                elif len(parts) == 2:
+                    self.reply('334 ')
+                    base64.b64decode(self.read_line())
+                self.reply('235 Authentication successful')
+
+            elif verb == 'MAIL':
+                recipients = []
+                self.reply('250 OK')
+
+            elif verb == 'RCPT':
+                if sink.throttle_rate and random.random() < sink.throttle_rate:  # nosec B311
+                    self.reply('454 Throttling failure: Maximum sending rate exceeded')
+                    continue
+                recipients.append(line.split(':', 1)[1].strip())
+                self.reply('250 OK')
+
+            elif verb == 'DATA':
+                if not recipients:
+                    self.reply('554 No valid recipients')
+                    continue
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data_lines = []
+                while True:
+                    data_line = self.read_line()
+                    if data_line == '.':
+                        break
+                    data_lines.append(data_line)
+                if sink.latency:
+                    time.sleep(sink.latency)
+                sink.record(recipients, data_lines)
+                self.reply('250 OK queued')
+
+            elif verb in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+
+            else:
+                self.reply('502 Command not implemented')
+
+
+class LocalSmtpSink(socketserver.ThreadingTCPServer):
+    """
+    A local SMTP server standing in for SES or SendGrid in load tests
+
+    Attributes:
+        latency (float): seconds added before accepting each message
+        throttle_rate (float): share of RCPT commands answered with a 454 throttling reply
+        messages (list): recorded messages as dicts with receivedAt, subject, recipients and size
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, throttle_rate: float = 0.0):
+        super().__init__((host, port), SmtpSinkHandler)
+        self.tls_context = create_tls_context()
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.messages = []
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def record(self, recipients: list, data_lines: list) -> None:
+        subject = next((line[len('Subject:') :].strip() for line in data_lines if line.startswith('Subject:')), '')
+        with self.lock:
+            self.messages.append(
+                {
+                    'receivedAt': time.time(),
+                    'subject': subject,
+                    'recipients': list(recipients),
+                    'size': sum(len(line) + 2 for line in data_lines),
+                }
+            )
+
+    def start(self) -> 'LocalSmtpSink':
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == '__main__':
+    smtp_sink = LocalSmtpSink(port=int(os.getenv('SMTP_PORT', '2525')))
+    print(f'Local SMTP sink listening on 127.0.0.1:{smtp_sink.port}')
+    try:
+        smtp_sink.serve_forever()
+    except KeyboardInterrupt:
+        smtp_sink.server_close()
@@ -1,6 +1,6 @@
 from dotenv import load_dotenv
 
-from model.email.email import EmailIn
+from model.email.email import EmailIn, EmailRecord
 from usecase.email_usecase import EmailUsecase
 
 load_dotenv()
@@ -26,7 +26,7 @@ def send_email_test():
         'isDurianPy': False,
     }
     email_body = EmailIn(**email_data)
-    email_usecase.send_email(email_body)
+    email_usecase.send_email(EmailRecord.from_email_in(email_body))
 
 
 if __name__ == '__main__':
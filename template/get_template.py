@@ -1,6 +1,14 @@
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
 def html_template(is_durian_py=True):
     template_file = 'durianPyEmailTemplate.html' if is_durian_py else 'nonDurianPyEmailTemplate.html'
-    template_path = f'./template/{template_file}'
+    # Prefer the minified build of scripts/build_templates.py, and fall back to the source template
+    template_path = f'./template/dist/{template_file}'
+    if not os.path.exists(template_path):
+        template_path = f'./template/{template_file}'
     with open(template_path, 'r') as template:
         content = template.read()
     return content
@@ -0,0 +1,13 @@
+import os
+
+# Models and clients read their configuration when they are imported, so it is set before any test module loads
+for name, value in {
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'REGION': 'us-east-1',
+    'ENTITIES_TABLE': 'entities',
+    'REGISTRATIONS_TABLE': 'registrations',
+    'EMAIL_QUEUE': 'email-queue',
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,197 @@
+import asyncio
+from datetime import datetime, timezone
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from constants.common_constants import EntryStatus
+from model.email.email import EmailTracker, EmailTrackerIn
+from model.registrations.registration import Registration, RegistrationIn
+from repository.async_dynamodb import AsyncDynamoDB
+from repository.async_email_tracker_repository import AsyncEmailTrackersRepository
+from repository.async_registrations_repository import AsyncRegistrationsRepository
+
+
+@pytest.fixture
+def client():
+    return MagicMock(get_item=AsyncMock(), put_item=AsyncMock(), update_item=AsyncMock(), query=AsyncMock())
+
+
+@pytest.fixture
+def dynamodb(client):
+    dynamodb = AsyncDynamoDB(region='us-east-1')
+    dynamodb.client = client
+    return dynamodb
+
+
+def make_email_tracker(daily_email_count: int) -> EmailTracker:
+    return EmailTracker(
+        hashKey='EmailTracker',
+        rangeKey='v0',
+        latestVersion=0,
+        entryStatus=EntryStatus.ACTIVE.value,
+        entryId='0',
+        lastEmailSent=datetime.now(timezone.utc).isoformat(),
+        dailyEmailCount=daily_email_count,
+    )
+
+
+def make_registration(registration_id: str, **kwargs) -> Registration:
+    return Registration(
+        hashKey='event-1',
+        rangeKey=registration_id,
+        registrationId=registration_id,
+        entryStatus=EntryStatus.ACTIVE.value,
+        createDate='2024-01-01T00:00:00',
+        updateDate='2024-01-01T00:00:00',
+        email='member@example.com',
+        **kwargs,
+    )
+
+
+def test_operation_kwargs_carry_the_serialized_expressions():
+    operation_kwargs = AsyncDynamoDB.build_operation_kwargs(
+        {'TableName': 'entities'},
+        condition=EmailTracker.hashKey.exists(),
+        actions=[EmailTracker.dailyEmailCount.add(2)],
+    )
+
+    assert operation_kwargs == {
+        'TableName': 'entities',
+        'ConditionExpression': 'attribute_exists (#0)',
+        'UpdateExpression': 'ADD #1 :0',
+        'ExpressionAttributeNames': {'#0': 'hashKey', '#1': 'dailyEmailCount'},
+        'ExpressionAttributeValues': {':0': {'N': '2'}},
+    }
+
+
+def test_append_email_sent_count_returns_the_new_count(dynamodb, client):
+    client.update_item.return_value = {'Attributes': make_email_tracker(daily_email_count=5).serialize()}
+
+    status, email_tracker, _ = asyncio.run(AsyncEmailTrackersRepository(dynamodb).append_email_sent_count(2))
+
+    assert status == HTTPStatus.OK
+    assert email_tracker.dailyEmailCount == 5
+    operation_kwargs = client.update_item.call_args.kwargs
+    assert operation_kwargs['UpdateExpression'] == 'ADD #1 :0'
+    assert operation_kwargs['ConditionExpression'] == 'attribute_exists (#0)'
+    assert operation_kwargs['ReturnValues'] == 'ALL_NEW'
+
+
+def test_a_missing_email_tracker_is_not_found(dynamodb, client):
+    client.get_item.return_value = {}
+
+    status, email_tracker, _ = asyncio.run(AsyncEmailTrackersRepository(dynamodb).query_email_tracker())
+
+    assert (status, email_tracker) == (HTTPStatus.NOT_FOUND, None)
+
+
+def test_client_errors_are_internal_errors(dynamodb, client):
+    client.put_item.side_effect = ClientError({'Error': {'Code': 'InternalServerError'}}, 'PutItem')
+    email_tracker_in = EmailTrackerIn(lastEmailSent=datetime.now(timezone.utc), dailyEmailCount=0)
+
+    status, email_tracker, _ = asyncio.run(
+        AsyncEmailTrackersRepository(dynamodb).create_update_email_tracker(email_tracker_in=email_tracker_in)
+    )
+
+    assert (status, email_tracker) == (HTTPStatus.INTERNAL_SERVER_ERROR, None)
+
+
+def test_a_new_email_tracker_does_not_overwrite_one_created_concurrently(dynamodb, client):
+    client.put_item.side_effect = ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'PutItem')
+    client.get_item.return_value = {'Item': make_email_tracker(daily_email_count=3).serialize()}
+    email_tracker_in = EmailTrackerIn(lastEmailSent=datetime.now(timezone.utc), dailyEmailCount=0)
+
+    status, email_tracker, _ = asyncio.run(
+        AsyncEmailTrackersRepository(dynamodb).create_update_email_tracker(email_tracker_in=email_tracker_in)
+    )
+
+    assert (status, email_tracker.dailyEmailCount) == (HTTPStatus.OK, 3)
+    assert client.put_item.call_args.kwargs['ConditionExpression'] == 'attribute_not_exists (#0)'
+
+
+def test_registration_queries_follow_every_page(dynamodb, client):
+    last_evaluated_key = {'hashKey': {'S': 'event-1'}, 'rangeKey': {'S': 'registration-1'}}
+    client.query.side_effect = [
+        {'Items': [make_registration('registration-1').serialize()], 'LastEvaluatedKey': last_evaluated_key},
+        {'Items': [make_registration('registration-2').serialize()]},
+    ]
+
+    status, registrations, _ = asyncio.run(
+        AsyncRegistrationsRepository(dynamodb).query_registrations_with_email('event-1', 'member@example.com')
+    )
+
+    assert status == HTTPStatus.OK
+    assert [registration.registrationId for registration in registrations] == ['registration-1', 'registration-2']
+    first_page_kwargs, second_page_kwargs = [call.kwargs for call in client.query.call_args_list]
+    assert first_page_kwargs['IndexName'] == Registration.emailLSI.Meta.index_name
+    assert 'ExclusiveStartKey' not in first_page_kwargs
+    assert second_page_kwargs['ExclusiveStartKey'] == last_evaluated_key
+
+
+def test_registration_updates_skip_unchanged_registrations(dynamodb, client):
+    registration = make_registration('registration-1', confirmationEmailSent=False)
+    client.update_item.return_value = {
+        'Attributes': make_registration('registration-1', confirmationEmailSent=True).serialize()
+    }
+    registrations_repository = AsyncRegistrationsRepository(dynamodb)
+
+    status, updated_registration, _ = asyncio.run(
+        registrations_repository.update_registration(registration, RegistrationIn(confirmationEmailSent=True))
+    )
+
+    assert status == HTTPStatus.OK
+    assert updated_registration.confirmationEmailSent
+    assert {'confirmationEmailSent', 'updateDate'} <= set(
+        client.update_item.call_args.kwargs['ExpressionAttributeNames'].values()
+    )
+
+    client.update_item.reset_mock()
+    status, _, message = asyncio.run(
+        registrations_repository.update_registration(updated_registration, RegistrationIn(confirmationEmailSent=True))
+    )
+
+    assert (status, message) == (HTTPStatus.OK, 'No update')
+    client.update_item.assert_not_called()
+
+
+def test_registration_updates_by_key_need_an_active_registration(dynamodb, client):
+    registrations_repository = AsyncRegistrationsRepository(dynamodb)
+
+    status, _ = asyncio.run(
+        registrations_repository.update_registration_with_key(
+            'event-1', 'registration-1', RegistrationIn(confirmationEmailSent=True)
+        )
+    )
+
+    assert status == HTTPStatus.OK
+    operation_kwargs = client.update_item.call_args.kwargs
+    assert operation_kwargs['Key'] == {'hashKey': {'S': 'event-1'}, 'rangeKey': {'S': 'registration-1'}}
+    assert operation_kwargs['ConditionExpression'].startswith('(attribute_exists (#0) AND')
+
+    client.update_item.side_effect = ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'UpdateItem')
+    status, _ = asyncio.run(
+        registrations_repository.update_registration_with_key(
+            'event-1', 'registration-2', RegistrationIn(confirmationEmailSent=True)
+        )
+    )
+
+    assert status == HTTPStatus.NOT_FOUND
+
+
+def test_registration_updates_by_key_are_stamped_with_the_time_of_the_update(dynamodb, client):
+    registrations_repository = AsyncRegistrationsRepository(dynamodb)
+    registrations_repository.current_date = '2024-01-01T00:00:00'
+    updated_after = datetime.utcnow().isoformat()
+
+    asyncio.run(
+        registrations_repository.update_registration_with_key(
+            'event-1', 'registration-1', RegistrationIn(confirmationEmailSent=True)
+        )
+    )
+
+    expression_attribute_values = client.update_item.call_args.kwargs['ExpressionAttributeValues'].values()
+    update_dates = [value['S'] for value in expression_attribute_values if value.get('S', '')[:1].isdigit()]
+    assert update_dates and min(update_dates) >= updated_after
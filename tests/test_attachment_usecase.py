@@ -0,0 +1,71 @@
+import base64
+from http import HTTPStatus
+
+import pytest
+
+from model.email.email import EmailAttachmentIn
+from usecase.attachment_usecase import AttachmentUsecase
+
+CONTENT = bytes(range(256)) * 10
+
+
+@pytest.fixture
+def attachment_usecase(monkeypatch, tmp_path):
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    monkeypatch.setenv('ATTACHMENTS_DIR', str(tmp_path))
+    monkeypatch.setenv('ATTACHMENT_READ_CHUNK_BYTES', '100')
+    monkeypatch.delenv('ATTACHMENTS_BUCKET', raising=False)
+    (tmp_path / 'brochure.pdf').write_bytes(CONTENT)
+    return AttachmentUsecase()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 56, 57, 58, 100, 4096])
+def test_chunked_encoding_matches_encoding_the_whole_file(chunk_size):
+    chunks = (CONTENT[offset : offset + chunk_size] for offset in range(0, len(CONTENT), chunk_size))
+    encoded = b''.join(AttachmentUsecase.encode_base64_lines(chunks))
+    assert encoded == base64.encodebytes(CONTENT).replace(b'\n', b'\r\n')
+
+
+def test_local_attachments_are_encoded_and_described(attachment_usecase):
+    status, attachments, _ = attachment_usecase.get_attachments([EmailAttachmentIn(objectKey='brochure.pdf')])
+
+    assert status == HTTPStatus.OK
+    assert attachments[0].file_name == 'brochure.pdf'
+    assert attachments[0].content_type == 'application/pdf'
+    assert base64.b64decode(attachments[0].data) == CONTENT
+
+
+def test_shared_attachments_are_read_once(attachment_usecase, mocker):
+    read_local_chunks = mocker.spy(attachment_usecase.attachment_repository, 'read_local_chunks')
+    attachment_in = EmailAttachmentIn(objectKey='brochure.pdf', fileName='Brochure.pdf', isShared=True)
+
+    _, first, _ = attachment_usecase.get_attachments([attachment_in])
+    _, second, _ = attachment_usecase.get_attachments([attachment_in])
+
+    assert read_local_chunks.call_count == 1
+    assert first[0].data is second[0].data
+    assert second[0].file_name == 'Brochure.pdf'
+
+
+def test_unshared_attachments_are_read_per_email(attachment_usecase, mocker):
+    read_local_chunks = mocker.spy(attachment_usecase.attachment_repository, 'read_local_chunks')
+    attachment_in = EmailAttachmentIn(objectKey='brochure.pdf')
+
+    attachment_usecase.get_attachments([attachment_in])
+    attachment_usecase.get_attachments([attachment_in])
+
+    assert read_local_chunks.call_count == 2
+
+
+@pytest.mark.parametrize(
+    'object_key, expected_status',
+    [('missing.pdf', HTTPStatus.NOT_FOUND), ('../outside.pdf', HTTPStatus.BAD_REQUEST)],
+)
+def test_unavailable_attachments_fail_the_email(attachment_usecase, object_key, expected_status):
+    status, attachments, message = attachment_usecase.get_attachments(
+        [EmailAttachmentIn(objectKey='brochure.pdf'), EmailAttachmentIn(objectKey=object_key)]
+    )
+
+    assert status == expected_status
+    assert attachments == []
+    assert object_key in message
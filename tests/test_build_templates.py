@@ -0,0 +1,42 @@
+import jinja2
+
+from scripts.build_templates import build_templates, minify_declarations, minify_html
+
+SOURCE = """<html><head><style>.title { color: red; } a:hover { color: blue; }</style></head>
+<body>
+  <!-- comment -->
+  <p class="title" style="margin: 0">Hi   <b>{{ salutation }}</b> there</p>
+  {% for line in body %}
+    <p>{{ line }}</p>
+  {% endfor %}
+</body></html>"""
+
+
+def test_overridden_declarations_are_dropped():
+    assert minify_declarations('color: red; margin : 0 ; color:blue') == 'margin:0;color:blue'
+
+
+def test_declarations_followed_by_a_var_are_kept_as_fallbacks():
+    assert minify_declarations('color: #000; color: var(--text)') == 'color:#000;color:var(--text)'
+
+
+def test_minify_inlines_class_rules_and_keeps_rendered_whitespace():
+    assert minify_html(SOURCE) == (
+        '<html><head><style>a:hover{color:blue}</style></head><body>'
+        '<p class="title" style="color:red;margin:0">Hi <b>{{ salutation }}</b> there</p>'
+        '{% for line in body %}<p>{{ line }}</p>{% endfor %}</body></html>'
+    )
+
+
+def test_minified_templates_render_the_same_content():
+    context = {'salutation': 'Juan', 'body': ['First line', 'Second line']}
+    rendered_source = jinja2.Environment().from_string(SOURCE).render(**context)
+    rendered_built = jinja2.Environment().from_string(minify_html(SOURCE)).render(**context)
+
+    for text in ('Hi <b>Juan</b> there', '<p>First line</p>', '<p>Second line</p>'):
+        assert text in rendered_built
+        assert text in ' '.join(rendered_source.split())
+
+
+def test_dist_templates_are_up_to_date(capsys):
+    assert build_templates(check=True) == 0
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+from constants.common_constants import EmailType
+from model.campaign.campaign import CampaignIn
+from usecase.campaign_usecase import CampaignUsecase
+from usecase.idempotency_usecase import IdempotencyUsecase
+from usecase.validation_usecase import ValidationUsecase
+
+REGISTRATIONS = [
+    SimpleNamespace(
+        registrationId=f'registration-{index}',
+        email=f'member{index}@example.com',
+        firstName=f'Member {index}',
+        lastName=None,
+        registrationEmailSent=False,
+        confirmationEmailSent=False,
+        evaluationEmailSent=False,
+    )
+    for index in range(4)
+]
+
+
+@pytest.fixture
+def campaign_usecase(mocker):
+    stored_keys = set()
+    idempotency_repository = mocker.patch('usecase.idempotency_usecase.EmailIdempotencyRepository').return_value
+    idempotency_repository.query_delivered_keys.side_effect = lambda keys: (
+        HTTPStatus.OK,
+        stored_keys.intersection(keys),
+        None,
+    )
+    idempotency_repository.store_delivered_keys.side_effect = stored_keys.update
+    registrations_repository = mocker.patch('usecase.campaign_usecase.RegistrationsRepository').return_value
+    registrations_repository.query_registrations_page.return_value = (HTTPStatus.OK, (REGISTRATIONS, None), None)
+    checkpoint_repository = mocker.patch('usecase.campaign_usecase.CampaignCheckpointRepository').return_value
+    checkpoint_repository.query_campaign_checkpoint.return_value = (HTTPStatus.NOT_FOUND, None, None)
+
+    suppression_usecase = mocker.Mock()
+    suppression_usecase.remove_suppressed_recipients.side_effect = lambda email_ins: email_ins
+    campaign_usecase = CampaignUsecase(
+        email_usecase=mocker.Mock(),
+        idempotency_usecase=IdempotencyUsecase(),
+        suppression_usecase=suppression_usecase,
+        validation_usecase=ValidationUsecase(),
+    )
+    campaign_usecase.chunk_size = 2
+    return campaign_usecase
+
+
+def make_campaign_in(email_type: EmailType) -> CampaignIn:
+    return CampaignIn(
+        eventId='event',
+        emailType=email_type,
+        subject='Subject',
+        salutation='Hi {firstName},',
+        body=['Body'],
+        regards=['Regards'],
+    )
+
+
+def make_time_budget() -> SimpleNamespace:
+    return SimpleNamespace(exhausted=lambda: False)
+
+
+def sent_registration_ids(email_usecase) -> list:
+    return [email_in.registrationId for call in email_usecase.send_emails.call_args_list for email_in in call.args[0]]
+
+
+def test_redone_page_skips_sent_and_deferred_registrants(campaign_usecase):
+    email_usecase = campaign_usecase.email_usecase
+    email_usecase.send_emails.side_effect = [
+        [HTTPStatus.OK, HTTPStatus.ACCEPTED],
+        [HTTPStatus.OK, HTTPStatus.REQUEST_TIMEOUT],
+    ]
+    campaign_in = make_campaign_in(EmailType.PREREGISTRATION_EMAIL)
+
+    status = campaign_usecase.run_campaign(campaign_in, campaign_id='campaign', time_budget=make_time_budget())
+    assert status == HTTPStatus.REQUEST_TIMEOUT
+    assert sent_registration_ids(email_usecase) == [registration.registrationId for registration in REGISTRATIONS]
+
+    email_usecase.send_emails.reset_mock(side_effect=True)
+    email_usecase.send_emails.return_value = [HTTPStatus.OK]
+    status = campaign_usecase.run_campaign(campaign_in, campaign_id='campaign', time_budget=make_time_budget())
+    assert status == HTTPStatus.OK
+    assert sent_registration_ids(email_usecase) == ['registration-3']
+
+
+def test_idempotency_keys_are_scoped_to_the_campaign(campaign_usecase):
+    email_usecase = campaign_usecase.email_usecase
+    email_usecase.send_emails.side_effect = lambda email_ins, time_budget: [HTTPStatus.OK] * len(email_ins)
+    campaign_in = make_campaign_in(EmailType.PREREGISTRATION_EMAIL)
+
+    campaign_usecase.run_campaign(campaign_in, campaign_id='first', time_budget=make_time_budget())
+    campaign_usecase.run_campaign(campaign_in, campaign_id='second', time_budget=make_time_budget())
+
+    assert len(sent_registration_ids(email_usecase)) == 2 * len(REGISTRATIONS)
@@ -0,0 +1,91 @@
+import threading
+from http import HTTPStatus
+
+from usecase.concurrency_limiter import AIMDConcurrencyLimiter
+
+
+class TickingClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 1.0
+        return self.now
+
+
+def make_limiter(**kwargs) -> AIMDConcurrencyLimiter:
+    return AIMDConcurrencyLimiter(clock=TickingClock(), **kwargs)
+
+
+def test_healthy_sends_grow_the_window_additively():
+    limiter = make_limiter(initial_limit=4, max_limit=16)
+    for _ in range(3):
+        limiter.release(limiter.acquire(), 0.1, HTTPStatus.OK)
+    assert limiter.limit == 4
+
+    for _ in range(2):
+        limiter.release(limiter.acquire(), 0.1, HTTPStatus.OK)
+    assert limiter.limit == 5
+
+
+def test_window_is_capped_at_max_limit():
+    limiter = make_limiter(initial_limit=2, max_limit=3)
+    for _ in range(50):
+        limiter.release(limiter.acquire(), 0.1, HTTPStatus.BAD_REQUEST)
+    assert limiter.window == 3.0
+
+
+def test_slow_sends_do_not_grow_the_window():
+    limiter = make_limiter(initial_limit=4, latency_threshold=1.0)
+    for _ in range(8):
+        limiter.release(limiter.acquire(), 2.0, HTTPStatus.OK)
+    assert limiter.window == 4.0
+
+
+def test_throttling_halves_the_window_once_per_congestion_event():
+    limiter = make_limiter(initial_limit=8)
+    tokens = [limiter.acquire() for _ in range(4)]
+    for acquired_at in tokens:
+        limiter.release(acquired_at, 0.1, HTTPStatus.TOO_MANY_REQUESTS)
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+    limiter.release(limiter.acquire(), 0.1, HTTPStatus.GATEWAY_TIMEOUT)
+    assert limiter.limit == 2
+
+
+def test_window_never_drops_below_min_limit():
+    limiter = make_limiter(initial_limit=2, min_limit=1)
+    for _ in range(5):
+        limiter.release(limiter.acquire(), 0.1, HTTPStatus.TOO_MANY_REQUESTS)
+    assert limiter.limit == 1
+
+
+def test_acquire_blocks_until_a_slot_is_released():
+    limiter = make_limiter(initial_limit=1, max_limit=1)
+    acquired_at = limiter.acquire()
+    acquired = threading.Event()
+
+    def acquire_second():
+        limiter.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=acquire_second)
+    thread.start()
+    assert not acquired.wait(0.1)
+
+    limiter.release(acquired_at, 0.1, HTTPStatus.OK)
+    assert acquired.wait(1.0)
+    thread.join()
+    assert limiter.in_flight == 1
+
+
+def test_acquire_gives_up_after_the_timeout():
+    limiter = make_limiter(initial_limit=1)
+    acquired_at = limiter.acquire()
+
+    assert limiter.acquire(timeout=0.01) is None
+    assert limiter.in_flight == 1
+
+    limiter.release(acquired_at, 0.1, HTTPStatus.OK)
+    assert limiter.acquire(timeout=0.01) is not None
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+import pytest
+
+from constants.common_constants import EmailProvider, EmailType
+from model.email.email import EmailDeliveryLogIn, EmailIn
+from repository.email_delivery_log_repository import EmailDeliveryLogRepository
+from usecase.delivery_ledger_usecase import DeliveryLedgerUsecase
+
+EMAIL_BODY = EmailIn(
+    to=['member@example.com'],
+    subject='Subject',
+    salutation='Hi',
+    body=['Body'],
+    regards=['Regards'],
+    emailType=EmailType.CONFIRMATION_EMAIL,
+    eventId='event-1',
+)
+
+
+@pytest.fixture
+def repository(mocker):
+    repository = mocker.patch('usecase.delivery_ledger_usecase.EmailDeliveryLogRepository').return_value
+    repository.store_email_delivery_logs.return_value = (HTTPStatus.OK, '')
+    return repository
+
+
+@pytest.fixture
+def delivery_ledger_usecase(monkeypatch, repository):
+    monkeypatch.setenv('DELIVERY_LOG_FLUSH_SIZE', '3')
+    monkeypatch.setenv('DELIVERY_LOG_MAX_BUFFER_SIZE', '4')
+    monkeypatch.delenv('DELIVERY_LOG_ENABLED', raising=False)
+    return DeliveryLedgerUsecase()
+
+
+def get_stored_batches(repository) -> list:
+    return [call.args[0] for call in repository.store_email_delivery_logs.call_args_list]
+
+
+def test_full_buffers_are_written_in_their_own_batch_by_the_next_flush(delivery_ledger_usecase, repository):
+    delivery_ledger_usecase.record(EMAIL_BODY, HTTPStatus.OK, provider=EmailProvider.SES, latency=0.25, attempts=1)
+    delivery_ledger_usecase.record(EMAIL_BODY, HTTPStatus.SERVICE_UNAVAILABLE, attempts=2)
+    delivery_ledger_usecase.record(EMAIL_BODY, HTTPStatus.BAD_REQUEST, attempts=1)
+    delivery_ledger_usecase.record(EMAIL_BODY, HTTPStatus.OK)
+    repository.store_email_delivery_logs.assert_not_called()
+    assert len(delivery_ledger_usecase.full_buffers) == 1
+
+    delivery_ledger_usecase.flush()
+
+    batch, rest = get_stored_batches(repository)
+    assert [email_delivery_log_in.statusCode for email_delivery_log_in in batch] == [200, 503, 400]
+    assert batch[0].latencyMs == 250.0
+    assert batch[0].failureReason is None
+    assert batch[1].failureReason == HTTPStatus.SERVICE_UNAVAILABLE.phrase
+    assert batch[1].latencyMs is None
+    assert len(rest) == 1
+    assert (delivery_ledger_usecase.full_buffers, delivery_ledger_usecase.buffer) == ([], [])
+
+
+def test_flush_writes_a_partial_buffer(delivery_ledger_usecase, repository):
+    delivery_ledger_usecase.record(EMAIL_BODY, HTTPStatus.OK)
+    delivery_ledger_usecase.flush()
+    delivery_ledger_usecase.flush()
+
+    assert [len(batch) for batch in get_stored_batches(repository)] == [1]
+
+
+def test_failed_writes_are_retried_and_the_oldest_outcomes_dropped(delivery_ledger_usecase, repository):
+    repository.store_email_delivery_logs.return_value = (HTTPStatus.INTERNAL_SERVER_ERROR, 'error')
+    for _ in range(3):
+        delivery_ledger_usecase.record(EMAIL_BODY, HTTPStatus.OK)
+    delivery_ledger_usecase.flush()
+    first_batch = get_stored_batches(repository)[0]
+    assert delivery_ledger_usecase.buffer == first_batch
+
+    for _ in range(2):
+        delivery_ledger_usecase.record(EMAIL_BODY, HTTPStatus.GATEWAY_TIMEOUT)
+    delivery_ledger_usecase.flush()
+
+    assert len(delivery_ledger_usecase.buffer) == 4
+    assert delivery_ledger_usecase.buffer[0] is first_batch[1]
+
+    repository.store_email_delivery_logs.return_value = (HTTPStatus.OK, '')
+    delivery_ledger_usecase.flush()
+    assert delivery_ledger_usecase.buffer == []
+    assert len(get_stored_batches(repository)[-1]) == 4
+
+
+def test_nothing_is_recorded_when_the_ledger_is_disabled(monkeypatch, repository):
+    monkeypatch.setenv('DELIVERY_LOG_ENABLED', 'false')
+    delivery_ledger_usecase = DeliveryLedgerUsecase()
+
+    delivery_ledger_usecase.record(EMAIL_BODY, HTTPStatus.OK)
+    delivery_ledger_usecase.flush()
+
+    assert delivery_ledger_usecase.buffer == []
+    repository.store_email_delivery_logs.assert_not_called()
+
+
+def test_delivery_logs_are_spread_over_dated_hash_keys(monkeypatch):
+    monkeypatch.setenv('DELIVERY_LOG_KEY_SHARDS', '4')
+    email_delivery_log_repository = EmailDeliveryLogRepository()
+    sent_at = datetime(2024, 5, 1, 23, 59, tzinfo=timezone.utc)
+
+    hash_keys = {
+        email_delivery_log_repository.get_hash_key(
+            EmailDeliveryLogIn(deliveryLogId=f'log-{index}', statusCode=200, sentAt=sent_at)
+        )
+        for index in range(100)
+    }
+
+    assert hash_keys == {f'EmailDeliveryLog#2024-05-01#{key_shard}' for key_shard in range(4)}
@@ -0,0 +1,56 @@
+import pytest
+
+from constants.common_constants import CommonConstants, EmailType
+from model.email.email import EmailIn, EmailRecord
+
+
+def make_email_in(**kwargs) -> EmailIn:
+    fields = {
+        'to': ['member@example.com'],
+        'subject': 'Subject',
+        'salutation': 'Hi',
+        'body': ['Body'],
+        'regards': ['Regards'],
+        'emailType': EmailType.CONFIRMATION_EMAIL,
+    }
+    fields.update(kwargs)
+    return EmailIn(**fields)
+
+
+def test_records_add_the_durianpy_cc_once():
+    assert EmailRecord.from_email_in(make_email_in()).cc == (CommonConstants.DURIANPY_CC_EMAIL,)
+
+    email_record = EmailRecord.from_email_in(make_email_in(cc=[CommonConstants.DURIANPY_CC_EMAIL]))
+
+    assert email_record.cc == (CommonConstants.DURIANPY_CC_EMAIL,)
+
+
+def test_recipients_hold_every_address_once_in_order():
+    email_in = make_email_in(
+        to=['member@example.com', 'other@example.com'],
+        cc=['other@example.com'],
+        bcc=['hidden@example.com', 'member@example.com'],
+    )
+
+    email_record = EmailRecord.from_email_in(email_in)
+
+    assert email_record.recipients == (
+        'member@example.com',
+        'other@example.com',
+        CommonConstants.DURIANPY_CC_EMAIL,
+        'hidden@example.com',
+    )
+
+
+def test_records_do_not_change_with_the_request_model():
+    email_in = make_email_in()
+
+    email_record = EmailRecord.from_email_in(email_in)
+    email_in.to.append('late@example.com')
+    email_in.body.append('Late line')
+
+    assert email_record.to == ('member@example.com',)
+    assert email_record.body == ('Body',)
+    assert email_in.cc is None
+    with pytest.raises(AttributeError):
+        email_record.subject = 'Changed'
@@ -0,0 +1,157 @@
+import email
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+from constants.common_constants import EmailProvider, EmailType
+from model.email.email import EmailIn, EmailRecord
+from usecase.attachment_usecase import AttachmentUsecase, EncodedAttachment
+from usecase.email_usecase import EmailUsecase
+
+
+def make_email_in(email_type: EmailType = EmailType.CONFIRMATION_EMAIL, **kwargs) -> EmailIn:
+    fields = {
+        'to': ['member@example.com'],
+        'subject': 'Subject',
+        'salutation': 'Hi',
+        'body': ['Body'],
+        'regards': ['Regards'],
+        'emailType': email_type,
+        'eventId': 'event-1',
+    }
+    fields.update(kwargs)
+    return EmailIn(**fields)
+
+
+def make_email_record(email_type: EmailType = EmailType.CONFIRMATION_EMAIL, **kwargs) -> EmailRecord:
+    return EmailRecord.from_email_in(make_email_in(email_type, **kwargs))
+
+
+@pytest.fixture
+def registrations_repository(mocker):
+    return mocker.patch('usecase.email_usecase.RegistrationsRepository').return_value
+
+
+@pytest.fixture
+def email_usecase(mocker, monkeypatch, registrations_repository):
+    monkeypatch.delenv('SENDER_SHARDS', raising=False)
+    mocker.patch('utils.utils.Utils.get_secret', return_value='secret')
+    mocker.patch('usecase.sender_pool.EmailTrackersRepository')
+    return EmailUsecase()
+
+
+def test_registrations_are_updated_by_key_when_the_email_carries_it(email_usecase, registrations_repository):
+    registrations_repository.update_registration_with_key.return_value = (HTTPStatus.OK, '')
+
+    email_usecase.update_db_success_sent(make_email_record(registrationId='registration-1'))
+
+    registrations_repository.update_registration_with_key.assert_called_once()
+    call_kwargs = registrations_repository.update_registration_with_key.call_args.kwargs
+    assert (call_kwargs['event_id'], call_kwargs['registration_id']) == ('event-1', 'registration-1')
+    assert call_kwargs['registration_in'].confirmationEmailSent
+    registrations_repository.query_registrations_with_email.assert_not_called()
+
+
+def test_legacy_payloads_look_the_registrations_up_by_email(email_usecase, registrations_repository):
+    registration = object()
+    registrations_repository.query_registrations_with_email.return_value = (HTTPStatus.OK, [registration], '')
+    registrations_repository.update_registration.return_value = (HTTPStatus.OK, None, '')
+
+    email_usecase.update_db_success_sent(make_email_record(EmailType.EVALUATION_EMAIL))
+
+    registrations_repository.update_registration_with_key.assert_not_called()
+    call_kwargs = registrations_repository.update_registration.call_args.kwargs
+    assert call_kwargs['registration_entry'] is registration
+    assert call_kwargs['registration_in'].evaluationEmailSent
+
+
+def test_email_types_without_a_sent_flag_skip_the_registration(email_usecase, registrations_repository):
+    email_usecase.update_db_success_sent(
+        make_email_record(EmailType.EVENT_CREATION_EMAIL, registrationId='registration-1')
+    )
+
+    registrations_repository.update_registration_with_key.assert_not_called()
+    registrations_repository.query_registrations_with_email.assert_not_called()
+
+
+class ShortTimeBudget:
+    def exhausted(self) -> bool:
+        return False
+
+    def message_timeout(self) -> float:
+        return 0.05
+
+
+def test_emails_stuck_in_the_pipeline_time_out_without_failing_the_batch(mocker, email_usecase):
+    def put(future, queued_email):
+        if queued_email.email_body.subject == 'Raises':
+            future.set_exception(RuntimeError('render failed'))
+        elif queued_email.email_body.subject == 'Sent':
+            future.set_result(HTTPStatus.OK)
+
+    mocker.patch.object(email_usecase.render_stage, 'put', side_effect=put)
+    email_bodies = [make_email_in(subject=subject) for subject in ('Sent', 'Stuck', 'Raises')]
+
+    statuses = email_usecase.send_emails(email_bodies, time_budget=ShortTimeBudget(), defer_overflow=False)
+
+    assert statuses == [HTTPStatus.OK, HTTPStatus.REQUEST_TIMEOUT, HTTPStatus.INTERNAL_SERVER_ERROR]
+
+
+def test_emails_without_a_free_send_slot_are_throttled(mocker, email_usecase):
+    sender_shard = SimpleNamespace(shard_id='a', email_from='a@example.com', daily_free_tier_limit=100)
+    mocker.patch.object(email_usecase, 'reserve_sender_shard', return_value=(sender_shard, 1))
+    mocker.patch.object(email_usecase, 'delivery_ledger_usecase')
+    send_ses_email = mocker.patch.object(email_usecase, 'send_ses_email')
+    email_usecase.email_senders[EmailProvider.SES] = send_ses_email
+    limiter = email_usecase.concurrency_limiter
+    acquired_at = [limiter.acquire() for _ in range(limiter.limit)]
+
+    status = email_usecase.deliver_email(make_email_record(), content='<p>Hi</p>', attachments=(), timeout=0.01)
+
+    assert status == HTTPStatus.TOO_MANY_REQUESTS
+    send_ses_email.assert_not_called()
+    assert all(breaker.probes_in_flight == 0 for breaker in email_usecase.provider_router.breakers.values())
+    assert len(acquired_at) == limiter.in_flight
+
+
+def test_emails_counted_by_the_send_window_are_not_counted_again(mocker, email_usecase):
+    (sender_shard,) = email_usecase.sender_pool.sender_shards.values()
+    reserve_sender_shard = mocker.patch.object(email_usecase, 'reserve_sender_shard')
+    mocker.patch.object(email_usecase, 'delivery_ledger_usecase')
+    send_ses_email = mocker.patch.object(email_usecase, 'send_ses_email', return_value=HTTPStatus.OK)
+    email_usecase.email_senders[EmailProvider.SES] = send_ses_email
+
+    status = email_usecase.deliver_email(
+        make_email_record(EmailType.EVALUATION_EMAIL),
+        content='<p>Hi</p>',
+        attachments=(),
+        timeout=1,
+        sender_shard=sender_shard,
+    )
+
+    assert status == HTTPStatus.OK
+    reserve_sender_shard.assert_not_called()
+    assert send_ses_email.call_args.kwargs['sender_shard'] is sender_shard
+
+
+def test_attachments_are_joined_into_the_serialized_message(email_usecase):
+    data = bytes(range(256)) * 4
+    attachment = EncodedAttachment(
+        file_name='Certificate.pdf',
+        content_type='application/pdf',
+        data=b''.join(AttachmentUsecase.encode_base64_lines([data])),
+    )
+    msg = email_usecase.create_email(
+        sender_email='sparcs@example.com', subject='Subject', content='<p>Hi</p>', to_email=['member@example.com']
+    )
+
+    msg_bytes = email_usecase.serialize_email(msg, [attachment, attachment])
+
+    assert b'\n' not in msg_bytes.replace(b'\r\n', b'')
+    parsed = email.message_from_bytes(msg_bytes)
+    html_part, *attachment_parts = parsed.get_payload()
+    assert html_part.get_payload(decode=True) == b'<p>Hi</p>'
+    assert [part.get_filename() for part in attachment_parts] == ['Certificate.pdf'] * 2
+    assert all(part.get_payload(decode=True) == data for part in attachment_parts)
+    assert email_usecase.serialize_email(msg) == msg.as_string().replace('\n', '\r\n').encode('ascii')
@@ -0,0 +1,107 @@
+import base64
+import gzip
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+
+from usecase.payload_usecase import PayloadUsecase
+from utils.envelope import RecordEnvelope
+
+MESSAGES = [
+    {
+        'to': [f'member{index}@example.com'],
+        'subject': 'Subject',
+        'salutation': f'Good day Member {index},',
+        'body': ['Body'],
+        'regards': ['Regards'],
+        'emailType': 'confirmationEmail',
+    }
+    for index in range(5)
+]
+
+
+@pytest.mark.parametrize('compress', [False, True], ids=['inline', 'compressed'])
+def test_encode_decode_round_trip(compress):
+    body = RecordEnvelope.encode(MESSAGES, compress=compress)
+    assert list(RecordEnvelope.decode(body)) == MESSAGES
+
+
+def test_encode_stores_shared_fields_once():
+    envelope = json.loads(RecordEnvelope.encode(MESSAGES))
+    assert envelope['columns'] == ['to', 'salutation']
+    assert envelope['shared']['subject'] == 'Subject'
+    assert len(envelope['rows']) == len(MESSAGES)
+
+
+def test_decode_list_body():
+    assert list(RecordEnvelope.decode(json.dumps(MESSAGES))) == MESSAGES
+
+
+def test_decode_stream_across_chunk_boundaries():
+    stream = io.BytesIO(RecordEnvelope.encode_ndjson(MESSAGES))
+    assert list(RecordEnvelope.decode_stream(stream, chunk_size=7)) == MESSAGES
+
+
+@pytest.fixture
+def payload_usecase(mocker):
+    mocker.patch('usecase.payload_usecase.ObjectRepository')
+    return PayloadUsecase()
+
+
+def test_get_message_chunks_decodes_envelopes(payload_usecase):
+    payload_usecase.message_chunk_size = 2
+    payload = json.loads(RecordEnvelope.encode(MESSAGES, compress=True))
+    assert list(payload_usecase.get_message_chunks(payload)) == [
+        (HTTPStatus.OK, MESSAGES[0:2], None),
+        (HTTPStatus.OK, MESSAGES[2:4], None),
+        (HTTPStatus.OK, MESSAGES[4:5], None),
+    ]
+
+
+def test_inline_envelopes_are_decoded_one_chunk_at_a_time(payload_usecase):
+    payload_usecase.message_chunk_size = 2
+    payload = {'version': 1, 'shared': {}, 'columns': ['to'], 'rows': [[['a@example.com']], [['b@example.com']], None]}
+
+    chunks = payload_usecase.get_message_chunks(payload)
+
+    assert next(chunks) == (HTTPStatus.OK, [{'to': ['a@example.com']}, {'to': ['b@example.com']}], None)
+    status, messages, _ = next(chunks)
+    assert (status, messages) == (HTTPStatus.BAD_REQUEST, [])
+
+
+@pytest.mark.parametrize(
+    'payload',
+    [
+        {'version': 2, 'shared': {}, 'columns': [], 'rows': []},
+        {'version': 1, 'encoding': 'brotli', 'data': ''},
+        {'version': 1, 'shared': {}, 'columns': ['to']},
+        {'version': 1, 'shared': None, 'columns': ['to'], 'rows': [[['member@example.com']]]},
+        {'version': 1, 'encoding': 'gzip+base64', 'data': 'not base64!'},
+        {'version': 1, 'encoding': 'gzip+base64', 'data': base64.b64encode(b'not gzip').decode('ascii')},
+        {
+            'version': 1,
+            'encoding': 'gzip+base64',
+            'data': base64.b64encode(gzip.compress(RecordEnvelope.encode_ndjson(MESSAGES))[:-12]).decode('ascii'),
+        },
+        {'version': 1, 'claimCheck': {'bucket': 'payloads'}},
+        'not an envelope',
+    ],
+    ids=[
+        'version',
+        'encoding',
+        'missing-rows',
+        'bad-shared',
+        'bad-base64',
+        'bad-gzip',
+        'truncated-gzip',
+        'claim-check-without-key',
+        'string',
+    ],
+)
+def test_get_message_chunks_rejects_bad_envelopes(payload_usecase, payload):
+    ((status, messages, message),) = payload_usecase.get_message_chunks(payload)
+    assert status == HTTPStatus.BAD_REQUEST
+    assert messages == []
+    assert message
@@ -0,0 +1,57 @@
+import importlib
+import json
+from types import SimpleNamespace
+
+import pytest
+from moto import mock_dynamodb, mock_s3, mock_sqs, mock_ssm
+
+from utils.envelope import RecordEnvelope
+
+
+@pytest.fixture
+def handler(mocker):
+    with mock_dynamodb(), mock_s3(), mock_sqs(), mock_ssm():
+        handler = importlib.import_module('handler')
+        mocker.patch.object(handler, 'SQS')
+        yield handler
+
+
+def make_event(*bodies: str) -> dict:
+    return {
+        'Records': [
+            {'messageId': f'message-{index}', 'receiptHandle': f'receipt-{index}', 'body': body, 'attributes': {}}
+            for index, body in enumerate(bodies)
+        ]
+    }
+
+
+def make_context() -> SimpleNamespace:
+    return SimpleNamespace(aws_request_id='invocation', get_remaining_time_in_millis=lambda: 60000)
+
+
+@pytest.mark.parametrize(
+    'body',
+    [
+        'not json',
+        json.dumps({'version': 2, 'shared': {}, 'columns': [], 'rows': []}),
+        RecordEnvelope.encode_claim_check('missing-bucket', 'campaigns/missing.ndjson'),
+    ],
+    ids=['json', 'envelope', 'missing-claim-check'],
+)
+def test_records_with_permanent_payload_errors_are_deleted(handler, body):
+    response = handler.send_email_handler(make_event(body), make_context())
+
+    assert response == {'batchItemFailures': []}
+    handler.SQS.delete_message.assert_called_once_with(QueueUrl=handler.EMAIL_QUEUE, ReceiptHandle='receipt-0')
+
+
+def test_outcomes_are_flushed_when_a_record_raises(handler, mocker):
+    mocker.patch.object(handler, 'send_record_emails', side_effect=RuntimeError('send failed'))
+    ledger_flush = mocker.patch.object(handler.email_usecase.delivery_ledger_usecase, 'flush')
+    metrics_flush = mocker.patch.object(handler.metrics, 'flush')
+
+    with pytest.raises(RuntimeError):
+        handler.send_email_handler(make_event(json.dumps([{'subject': 'Subject'}])), make_context())
+
+    ledger_flush.assert_called_once_with()
+    metrics_flush.assert_called_once_with()
@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+
+from usecase.idempotency_usecase import IdempotencyUsecase
+
+
+@pytest.fixture
+def repository(mocker):
+    repository = mocker.patch('usecase.idempotency_usecase.EmailIdempotencyRepository').return_value
+    repository.query_delivered_keys.return_value = (HTTPStatus.OK, set(), '')
+    return repository
+
+
+def test_key_ignores_the_field_order_of_the_payload():
+    first_key = IdempotencyUsecase.get_idempotency_key('message-1', {'to': ['a@example.com'], 'subject': 'Hi'})
+    second_key = IdempotencyUsecase.get_idempotency_key('message-1', {'subject': 'Hi', 'to': ['a@example.com']})
+    assert first_key == second_key
+    assert first_key.startswith('message-1#')
+
+
+def test_key_changes_with_the_message_id_and_the_content():
+    message = {'to': ['a@example.com'], 'subject': 'Hi'}
+    key = IdempotencyUsecase.get_idempotency_key('message-1', message)
+
+    assert IdempotencyUsecase.get_idempotency_key('message-2', message) != key
+    assert IdempotencyUsecase.get_idempotency_key('message-1', {**message, 'subject': 'Hello'}) != key
+
+
+def test_stored_keys_are_looked_up_once_and_then_served_from_the_cache(repository):
+    repository.query_delivered_keys.return_value = (HTTPStatus.OK, {'key-1'}, '')
+    idempotency_usecase = IdempotencyUsecase()
+
+    assert idempotency_usecase.get_delivered_keys(['key-1', 'key-2']) == {'key-1'}
+    repository.query_delivered_keys.assert_called_once_with(['key-1', 'key-2'])
+
+    repository.query_delivered_keys.reset_mock()
+    repository.query_delivered_keys.return_value = (HTTPStatus.OK, set(), '')
+    assert idempotency_usecase.get_delivered_keys(['key-1', 'key-2']) == {'key-1'}
+    repository.query_delivered_keys.assert_called_once_with(['key-2'])
+
+
+def test_cached_keys_skip_the_database(repository):
+    idempotency_usecase = IdempotencyUsecase()
+    idempotency_usecase.mark_delivered(['key-1'])
+
+    assert idempotency_usecase.get_delivered_keys(['key-1']) == {'key-1'}
+    repository.query_delivered_keys.assert_not_called()
+    repository.store_delivered_keys.assert_called_once_with(['key-1'])
+
+
+def test_failed_lookups_treat_emails_as_not_delivered(repository):
+    repository.query_delivered_keys.return_value = (HTTPStatus.INTERNAL_SERVER_ERROR, set(), 'error')
+    idempotency_usecase = IdempotencyUsecase()
+
+    assert idempotency_usecase.get_delivered_keys(['key-1']) == set()
+
+
+def test_marking_no_keys_writes_nothing(repository):
+    IdempotencyUsecase().mark_delivered([])
+    repository.store_delivered_keys.assert_not_called()
@@ -0,0 +1,53 @@
+from constants.common_constants import EmailLane, EmailType
+from usecase.lane_scheduler import LaneScheduler
+
+
+def make_record(message_id: str, message_group_id: str = None, email_lane: str = None) -> dict:
+    record = {'messageId': message_id, 'attributes': {}, 'messageAttributes': {}}
+    if message_group_id:
+        record['attributes']['MessageGroupId'] = message_group_id
+    if email_lane:
+        record['messageAttributes']['emailLane'] = {'stringValue': email_lane, 'dataType': 'String'}
+    return record
+
+
+def test_email_types_map_to_lanes():
+    assert LaneScheduler.get_email_lane(EmailType.EVALUATION_EMAIL) == EmailLane.BULK
+    assert LaneScheduler.get_email_lane(EmailType.CONFIRMATION_EMAIL.value) == EmailLane.TRANSACTIONAL
+
+
+def test_message_group_ids_carry_the_lane():
+    message_group_id = LaneScheduler.get_message_group_id(EmailType.EVALUATION_EMAIL, 'event-1')
+    assert LaneScheduler.get_record_lane(make_record('1', message_group_id=message_group_id)) == EmailLane.BULK
+
+
+def test_record_lanes_fall_back_to_transactional():
+    assert LaneScheduler.get_record_lane(make_record('1')) == EmailLane.TRANSACTIONAL
+    assert LaneScheduler.get_record_lane(make_record('2', message_group_id='event-1')) == EmailLane.TRANSACTIONAL
+    assert LaneScheduler.get_record_lane(make_record('3', email_lane='unknown')) == EmailLane.TRANSACTIONAL
+
+
+def test_the_lane_attribute_wins_over_the_message_group_id():
+    record = make_record('1', message_group_id=f'{EmailLane.TRANSACTIONAL.value}#event-1', email_lane='bulk')
+    assert LaneScheduler.get_record_lane(record) == EmailLane.BULK
+
+
+def test_lanes_are_interleaved_by_weight_keeping_the_order_within_a_lane():
+    bulk_group = f'{EmailLane.BULK.value}#event-1'
+    records = [make_record(f'bulk{index}', message_group_id=bulk_group) for index in range(4)]
+    records += [make_record(f'transactional{index}') for index in range(5)]
+
+    scheduler = LaneScheduler(weights={EmailLane.TRANSACTIONAL: 2, EmailLane.BULK: 1})
+    ordered_ids = [record['messageId'] for record in scheduler.order_records(records)]
+
+    assert ordered_ids == [
+        'transactional0',
+        'transactional1',
+        'bulk0',
+        'transactional2',
+        'transactional3',
+        'bulk1',
+        'transactional4',
+        'bulk2',
+        'bulk3',
+    ]
@@ -0,0 +1,76 @@
+import json
+import logging
+
+import pytest
+
+from utils.logger import JsonFormatter, StructuredLogger, redact
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+class ExplodingArgument:
+    def __str__(self) -> str:
+        raise AssertionError('formatted a disabled log call')
+
+
+@pytest.fixture
+def recording_handler():
+    return RecordingHandler()
+
+
+def make_logger(recording_handler: RecordingHandler, name: str, level: int = logging.DEBUG, **kwargs):
+    structured_logger = StructuredLogger(name, **kwargs)
+    structured_logger.logger.propagate = False
+    structured_logger.logger.handlers = [recording_handler]
+    structured_logger.setLevel(level)
+    return structured_logger
+
+
+def test_redact_masks_addresses_in_nested_values():
+    assert redact('Sent to juan@example.com') == 'Sent to j***@example.com'
+    assert redact({'to': ['ana@mail.example.org'], 'count': 2}) == {'to': ['a***@mail.example.org'], 'count': 2}
+
+
+def test_parse_sample_rates():
+    assert StructuredLogger.parse_sample_rates(' repository=0.1, smtp = 0.5,') == {'repository': 0.1, 'smtp': 0.5}
+    assert StructuredLogger.parse_sample_rates('') == {}
+
+
+def test_disabled_levels_are_not_formatted(recording_handler):
+    structured_logger = make_logger(recording_handler, 'test-disabled', level=logging.WARNING)
+    structured_logger.info('Value %s', ExplodingArgument())
+    assert recording_handler.records == []
+
+
+def test_categories_below_warning_are_sampled(recording_handler, mocker):
+    structured_logger = make_logger(recording_handler, 'test-sampled', sample_rates={'smtp': 0.25})
+    mocker.patch('utils.logger.random.random', return_value=0.5)
+
+    structured_logger.info('dropped', category='smtp')
+    structured_logger.info('kept, no sample rate', category='repository')
+    structured_logger.info('kept, no category')
+    structured_logger.warning('kept, warnings are never sampled', category='smtp')
+
+    assert [record.getMessage() for record in recording_handler.records] == [
+        'kept, no sample rate',
+        'kept, no category',
+        'kept, warnings are never sampled',
+    ]
+
+
+def test_json_lines_carry_the_category_and_redacted_fields(recording_handler):
+    structured_logger = make_logger(recording_handler, 'test-json')
+    structured_logger.info('Sent to %s', 'juan@example.com', category='smtp', to=['juan@example.com'], attempts=2)
+
+    entry = json.loads(JsonFormatter().format(recording_handler.records[0]))
+    assert entry['message'] == 'Sent to j***@example.com'
+    assert entry['category'] == 'smtp'
+    assert entry['to'] == ['j***@example.com']
+    assert entry['attempts'] == 2
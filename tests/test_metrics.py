@@ -0,0 +1,65 @@
+import json
+
+from constants.common_constants import CommonConstants
+from utils.metrics import EmfExporter, Metrics
+
+
+class RecordingExporter:
+    def __init__(self) -> None:
+        self.exports = []
+
+    def export(self, namespace, dimensions, samples, units) -> None:
+        self.exports.append((namespace, dimensions, samples, units))
+
+
+def test_flush_exports_the_samples_once_and_resets():
+    exporter = RecordingExporter()
+    metrics = Metrics(namespace='Test', exporter=exporter)
+    metrics.put_metric('EmailsSent', 3)
+    with metrics.timer('SmtpData'):
+        pass
+
+    metrics.flush()
+    metrics.flush()
+
+    assert len(exporter.exports) == 1
+    namespace, _, samples, units = exporter.exports[0]
+    assert namespace == 'Test'
+    assert samples['EmailsSent'] == [3]
+    assert len(samples['SmtpData']) == 1
+    assert units == {'EmailsSent': 'Count', 'SmtpData': 'Milliseconds'}
+
+
+def test_timer_records_when_the_block_raises():
+    exporter = RecordingExporter()
+    metrics = Metrics(exporter=exporter)
+    try:
+        with metrics.timer('TemplateRender'):
+            raise ValueError
+    except ValueError:
+        pass
+
+    metrics.flush()
+    assert len(exporter.exports[0][2]['TemplateRender']) == 1
+
+
+def test_emf_documents_split_large_samples(capsys):
+    value_count = CommonConstants.EMF_MAX_VALUES + 1
+    EmfExporter().export(
+        'Test',
+        {'Service': 'email'},
+        {'SmtpData': list(range(value_count)), 'EmailsSent': [1]},
+        {'SmtpData': 'Milliseconds', 'EmailsSent': 'Count'},
+    )
+
+    documents = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(documents) == 2
+    assert len(documents[0]['SmtpData']) == CommonConstants.EMF_MAX_VALUES
+    assert documents[1]['SmtpData'] == [CommonConstants.EMF_MAX_VALUES]
+    assert 'EmailsSent' not in documents[1]
+
+    metric_directive = documents[0]['_aws']['CloudWatchMetrics'][0]
+    assert metric_directive['Namespace'] == 'Test'
+    assert metric_directive['Dimensions'] == [['Service']]
+    assert documents[0]['Service'] == 'email'
+    assert {'Name': 'EmailsSent', 'Unit': 'Count'} in metric_directive['Metrics']
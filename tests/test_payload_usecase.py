@@ -0,0 +1,115 @@
+import gzip
+from http import HTTPStatus
+
+import boto3
+import pytest
+from moto import mock_s3
+
+from usecase.payload_usecase import PayloadUsecase
+from utils.envelope import RecordEnvelope
+
+BUCKET = 'email-payloads'
+MESSAGES = [
+    {
+        'to': [f'member{index}@example.com'],
+        'subject': 'Subject',
+        'salutation': f'Good day Member {index},',
+        'body': ['Body'],
+        'regards': ['Regards'],
+        'emailType': 'confirmationEmail',
+    }
+    for index in range(5)
+]
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv('EMAIL_PAYLOAD_BUCKET', BUCKET)
+    with mock_s3():
+        s3_client = boto3.client('s3', region_name='us-east-1')
+        s3_client.create_bucket(Bucket=BUCKET)
+        yield s3_client
+
+
+@pytest.fixture
+def payload_usecase(s3):
+    payload_usecase = PayloadUsecase()
+    payload_usecase.read_chunk_size = 64
+    payload_usecase.message_chunk_size = 2
+    return payload_usecase
+
+
+def claim_check(key: str, bucket: str = BUCKET) -> dict:
+    return {'version': 1, 'claimCheck': {'bucket': bucket, 'key': key}}
+
+
+def get_messages(payload_usecase: PayloadUsecase, payload: dict):
+    chunks = list(payload_usecase.get_message_chunks(payload))
+    statuses = [status for status, _, _ in chunks]
+    messages = [message for _, chunk, _ in chunks for message in chunk]
+    return statuses, messages
+
+
+def test_plain_claim_check_is_streamed_in_chunks(s3, payload_usecase):
+    s3.put_object(Bucket=BUCKET, Key='campaigns/plain.ndjson', Body=RecordEnvelope.encode_ndjson(MESSAGES))
+
+    statuses, messages = get_messages(payload_usecase, claim_check('campaigns/plain.ndjson'))
+
+    assert statuses == [HTTPStatus.OK] * 3
+    assert messages == MESSAGES
+
+
+def test_gzip_claim_check_is_decompressed(s3, payload_usecase):
+    s3.put_object(
+        Bucket=BUCKET, Key='campaigns/campaign.ndjson.gz', Body=gzip.compress(RecordEnvelope.encode_ndjson(MESSAGES))
+    )
+    s3.put_object(
+        Bucket=BUCKET,
+        Key='campaigns/encoded.ndjson',
+        Body=gzip.compress(RecordEnvelope.encode_ndjson(MESSAGES)),
+        ContentEncoding='gzip',
+    )
+
+    for key in ('campaigns/campaign.ndjson.gz', 'campaigns/encoded.ndjson'):
+        statuses, messages = get_messages(payload_usecase, claim_check(key))
+        assert statuses == [HTTPStatus.OK] * 3
+        assert messages == MESSAGES
+
+
+def test_claim_check_without_bucket_uses_the_default_bucket(s3, payload_usecase):
+    s3.put_object(Bucket=BUCKET, Key='campaigns/plain.ndjson', Body=RecordEnvelope.encode_ndjson(MESSAGES))
+
+    _, messages = get_messages(payload_usecase, {'version': 1, 'claimCheck': {'key': 'campaigns/plain.ndjson'}})
+
+    assert messages == MESSAGES
+
+
+@pytest.mark.parametrize('bucket', [BUCKET, 'missing-bucket'])
+def test_missing_claim_check_object_is_not_found(payload_usecase, bucket):
+    ((status, messages, message),) = payload_usecase.get_message_chunks(claim_check('campaigns/missing.ndjson', bucket))
+
+    assert status == HTTPStatus.NOT_FOUND
+    assert messages == []
+    assert message
+
+
+def test_corrupt_claim_check_object_ends_with_bad_request(s3, payload_usecase):
+    body = RecordEnvelope.encode_ndjson(MESSAGES) + b'\n{not json'
+    s3.put_object(Bucket=BUCKET, Key='campaigns/corrupt.ndjson', Body=body)
+
+    statuses, messages = get_messages(payload_usecase, claim_check('campaigns/corrupt.ndjson'))
+
+    assert statuses == [HTTPStatus.OK, HTTPStatus.OK, HTTPStatus.BAD_REQUEST]
+    assert messages == MESSAGES[:4]
+
+
+def test_closing_early_closes_the_object_body(s3, payload_usecase, mocker):
+    s3.put_object(Bucket=BUCKET, Key='campaigns/plain.ndjson', Body=RecordEnvelope.encode_ndjson(MESSAGES))
+    get_object = mocker.spy(payload_usecase.object_repository, 'get_object')
+
+    message_chunks = payload_usecase.get_message_chunks(claim_check('campaigns/plain.ndjson'))
+    status, chunk, _ = next(message_chunks)
+    message_chunks.close()
+
+    assert (status, chunk) == (HTTPStatus.OK, MESSAGES[:2])
+    assert get_object.spy_return[1]['Body']._raw_stream.closed
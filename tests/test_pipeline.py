@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import Future
+
+from utils.pipeline import PipelineStage
+
+
+def make_stage(handler, workers: int = 2, queue_size: int = 4, name: str = 'stage') -> PipelineStage:
+    return PipelineStage(
+        name=name, handler=handler, workers=workers, queue_size=queue_size, depth_metric_name=f'{name}Depth'
+    )
+
+
+def test_items_flow_through_chained_stages():
+    second = make_stage(lambda future, item: future.set_result(item + 1), name='second')
+    first = make_stage(lambda future, item: second.put(future, item * 10), name='first')
+
+    futures = [Future() for _ in range(10)]
+    for index, future in enumerate(futures):
+        first.put(future, index)
+
+    assert [future.result(timeout=5) for future in futures] == [index * 10 + 1 for index in range(10)]
+
+
+def test_handler_exceptions_are_set_on_the_future():
+    def handler(future, item):
+        raise ValueError(f'bad item {item}')
+
+    stage = make_stage(handler)
+    future = Future()
+    stage.put(future, 1)
+
+    assert isinstance(future.exception(timeout=5), ValueError)
+
+
+def test_workers_start_on_the_first_put():
+    stage = make_stage(lambda future, item: future.set_result(item), workers=3)
+    assert stage.threads == []
+
+    future = Future()
+    stage.put(future, 1)
+
+    assert future.result(timeout=5) == 1
+    assert len(stage.threads) == 3
+
+
+def test_put_blocks_while_the_queue_is_full():
+    release = threading.Event()
+
+    def handler(future, item):
+        release.wait(5)
+        future.set_result(item)
+
+    stage = make_stage(handler, workers=1, queue_size=1)
+    futures = [Future() for _ in range(3)]
+    stage.put(futures[0], 0)
+    stage.put(futures[1], 1)
+
+    third_put = threading.Thread(target=stage.put, args=(futures[2], 2))
+    third_put.start()
+    third_put.join(0.2)
+    assert third_put.is_alive()
+
+    release.set()
+    third_put.join(5)
+    assert [future.result(timeout=5) for future in futures] == [0, 1, 2]
@@ -0,0 +1,48 @@
+import json
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+from utils.pipeline import PipelineStage
+from utils.profiler import profile_invocation
+
+
+def render_in_worker(item: int) -> int:
+    return item * 2
+
+
+def test_profile_includes_pipeline_worker_threads(monkeypatch, tmp_path):
+    monkeypatch.setattr(profile_invocation, 'sample_rate', 1)
+    monkeypatch.setattr(profile_invocation, 'output', 'tmp')
+    monkeypatch.setattr(profile_invocation, 'profile_dir', str(tmp_path))
+    monkeypatch.setattr(profile_invocation, 'top_n', 10000)
+    stage = PipelineStage(
+        name='render',
+        handler=lambda future, item: future.set_result(render_in_worker(item)),
+        workers=2,
+        queue_size=4,
+        depth_metric_name='RenderQueueDepth',
+    )
+
+    @profile_invocation
+    def handler(event, context):
+        futures = [Future() for _ in event]
+        for future, item in zip(futures, event):
+            stage.put(future, item)
+        results = [future.result() for future in futures]
+        stage.queue.join()
+        return results
+
+    assert handler([1, 2, 3], SimpleNamespace(aws_request_id='invocation')) == [2, 4, 6]
+
+    with open(tmp_path / 'profile-invocation.json', encoding='utf-8') as file_handle:
+        artifact = json.load(file_handle)
+    functions = {function['function']: function for function in artifact['functions']}
+    (render_function,) = [name for name in functions if name.endswith('(render_in_worker)')]
+    assert functions[render_function]['calls'] == 3
+    assert profile_invocation.thread_profilers is None
+
+
+def test_profile_thread_is_a_no_op_outside_a_profiled_invocation():
+    with profile_invocation.profile_thread():
+        assert render_in_worker(1) == 2
+    assert profile_invocation.thread_profilers is None
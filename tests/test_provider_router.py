@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+from constants.common_constants import CircuitState, EmailProvider
+from usecase.provider_router import CircuitBreaker, ProviderRouter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(provider: EmailProvider, clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(provider, minimum_calls=4, failure_rate_threshold=0.5, open_seconds=30.0, clock=clock)
+
+
+def make_router(clock: FakeClock) -> ProviderRouter:
+    return ProviderRouter({provider: make_breaker(provider, clock) for provider in EmailProvider})
+
+
+def test_breaker_opens_on_failure_rate():
+    breaker = make_breaker(EmailProvider.SES, FakeClock())
+    breaker.record_success(0.1)
+    breaker.record_success(0.1)
+    breaker.record_failure(0.1)
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure(0.1)
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_counts_slow_calls_as_unhealthy():
+    breaker = CircuitBreaker(EmailProvider.SES, minimum_calls=2, slow_call_seconds=1.0, clock=FakeClock())
+    breaker.record_success(5.0)
+    breaker.record_success(5.0)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_breaker_opens_immediately_when_throttled():
+    breaker = make_breaker(EmailProvider.SES, FakeClock())
+    breaker.record_failure(0.1, throttled=True)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_breaker_half_opens_after_cooldown_and_closes_on_probe_success():
+    clock = FakeClock()
+    breaker = make_breaker(EmailProvider.SES, clock)
+    breaker.record_failure(0.1, throttled=True)
+
+    clock.now = 29.0
+    assert not breaker.allow_request()
+    assert breaker.state == CircuitState.OPEN
+
+    clock.now = 30.0
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_breaker_reopens_on_probe_failure():
+    clock = FakeClock()
+    breaker = make_breaker(EmailProvider.SES, clock)
+    breaker.record_failure(0.1, throttled=True)
+
+    clock.now = 30.0
+    assert breaker.allow_request()
+    breaker.record_failure(0.1)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.opened_at == 30.0
+    assert not breaker.allow_request()
+
+
+def test_router_fails_over_to_next_closed_provider():
+    router = make_router(FakeClock())
+    router.breakers[EmailProvider.SES].record_failure(0.1, throttled=True)
+
+    provider, is_permitted = router.select_provider([EmailProvider.SES, EmailProvider.SENDGRID])
+    assert provider == EmailProvider.SENDGRID
+    assert is_permitted
+
+
+def test_router_ignores_permanent_recipient_errors():
+    router = make_router(FakeClock())
+    for _ in range(4):
+        router.record_result(EmailProvider.SES, 0.1, HTTPStatus.BAD_REQUEST)
+    assert router.breakers[EmailProvider.SES].state == CircuitState.CLOSED
+
+
+def test_router_all_open_fallback_leaves_breakers_untouched():
+    clock = FakeClock()
+    router = make_router(clock)
+    for breaker in router.breakers.values():
+        breaker.record_failure(0.1, throttled=True)
+
+    clock.now = 10.0
+    provider, is_permitted = router.select_provider([EmailProvider.SES, EmailProvider.SENDGRID])
+    assert provider == EmailProvider.SES
+    assert not is_permitted
+
+    router.record_result(provider, 0.1, HTTPStatus.OK, is_permitted=is_permitted)
+    router.record_result(provider, 0.1, HTTPStatus.SERVICE_UNAVAILABLE, is_permitted=is_permitted)
+    breaker = router.breakers[EmailProvider.SES]
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.opened_at == 0.0
+    assert breaker.probes_in_flight == 0
+
+    clock.now = 30.0
+    provider, is_permitted = router.select_provider([EmailProvider.SES, EmailProvider.SENDGRID])
+    assert provider == EmailProvider.SES
+    assert is_permitted
+    assert breaker.state == CircuitState.HALF_OPEN
@@ -0,0 +1,183 @@
+import json
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+from constants.common_constants import EmailType
+from model.email.email import EmailIn
+from usecase.send_window_usecase import SendWindowUsecase
+
+
+def make_email_in(email_type: EmailType = EmailType.EVALUATION_EMAIL, **kwargs) -> EmailIn:
+    fields = {
+        'to': ['member@example.com'],
+        'subject': 'Subject',
+        'salutation': 'Hi',
+        'body': ['Body'],
+        'regards': ['Regards'],
+        'emailType': email_type,
+    }
+    fields.update(kwargs)
+    return EmailIn(**fields)
+
+
+class FakeEmailTrackersRepository:
+    """
+    Keeps the daily count of a sender shard in memory, with the atomic increment of the DynamoDB tracker.
+    """
+
+    def __init__(self, window_start: datetime, daily_email_count: int) -> None:
+        self.email_tracker = SimpleNamespace(lastEmailSent=window_start.isoformat(), dailyEmailCount=daily_email_count)
+
+    def query_email_tracker(self):
+        return HTTPStatus.OK, self.email_tracker, None
+
+    def append_email_sent_count(self, email_tracker_entry, append_count: int = 1):
+        self.email_tracker.dailyEmailCount += append_count
+        return HTTPStatus.OK, self.email_tracker, ''
+
+
+@pytest.fixture
+def scheduled_emails_repository(mocker):
+    repository = mocker.patch('usecase.send_window_usecase.ScheduledEmailsRepository').return_value
+    repository.store_scheduled_emails.return_value = (HTTPStatus.OK, '')
+    repository.delete_scheduled_emails.return_value = (HTTPStatus.OK, '')
+    return repository
+
+
+@pytest.fixture
+def send_window_usecase(mocker, monkeypatch, scheduled_emails_repository):
+    # 10 of the 100 daily primary emails are left to bulk mail
+    monkeypatch.setenv('TRANSACTIONAL_QUOTA_RESERVE', '90')
+    monkeypatch.delenv('DEFER_BULK_OVERFLOW', raising=False)
+    monkeypatch.delenv('SENDER_SHARDS', raising=False)
+    mocker.patch('usecase.sender_pool.Utils.get_secret')
+    mocker.patch('usecase.sender_pool.EmailTrackersRepository')
+    return SendWindowUsecase()
+
+
+def set_send_window(send_window_usecase: SendWindowUsecase, window_start: datetime, daily_email_count: int) -> None:
+    for sender_shard in send_window_usecase.sender_pool.sender_shards.values():
+        sender_shard.email_tracker_repository = FakeEmailTrackersRepository(window_start, daily_email_count)
+
+
+def get_daily_count(send_window_usecase: SendWindowUsecase) -> int:
+    (sender_shard,) = send_window_usecase.sender_pool.sender_shards.values()
+    return sender_shard.email_tracker_repository.email_tracker.dailyEmailCount
+
+
+def test_transactional_emails_are_never_deferred(send_window_usecase, scheduled_emails_repository):
+    set_send_window(send_window_usecase, datetime.now(timezone.utc), daily_email_count=100)
+
+    deferred, reserved_shards = send_window_usecase.defer_emails([make_email_in(EmailType.CONFIRMATION_EMAIL)] * 3)
+
+    assert deferred == [False] * 3
+    assert reserved_shards == [None] * 3
+    assert get_daily_count(send_window_usecase) == 100
+    scheduled_emails_repository.store_scheduled_emails.assert_not_called()
+
+
+def test_bulk_emails_over_the_quota_left_are_deferred_to_the_next_window(
+    send_window_usecase, scheduled_emails_repository
+):
+    window_start = datetime.now(timezone.utc) - timedelta(hours=1)
+    set_send_window(send_window_usecase, window_start, daily_email_count=7)
+    email_bodies = [make_email_in(subject=f'Evaluation {index}') for index in range(5)]
+    email_bodies.insert(1, make_email_in(EmailType.CONFIRMATION_EMAIL))
+
+    deferred, reserved_shards = send_window_usecase.defer_emails(email_bodies)
+
+    assert deferred == [False, False, False, False, True, True]
+    assert [sender_shard is not None for sender_shard in reserved_shards] == [True, False, True, True, False, False]
+    assert get_daily_count(send_window_usecase) == 10
+    (scheduled_email_ins,) = scheduled_emails_repository.store_scheduled_emails.call_args.args
+    assert [json.loads(scheduled_email_in.payload)['subject'] for scheduled_email_in in scheduled_email_ins] == [
+        'Evaluation 3',
+        'Evaluation 4',
+    ]
+    assert all(
+        scheduled_email_in.sendAfter == window_start + timedelta(days=1) for scheduled_email_in in scheduled_email_ins
+    )
+
+
+def test_emails_due_before_the_next_window_are_sent_now(send_window_usecase, scheduled_emails_repository):
+    now = datetime.now(timezone.utc)
+    set_send_window(send_window_usecase, now, daily_email_count=10)
+
+    deferred, _ = send_window_usecase.defer_emails(
+        [make_email_in(sendBefore=now + timedelta(hours=2)), make_email_in()]
+    )
+
+    assert deferred == [False, True]
+
+
+def test_batches_checked_at_the_same_time_do_not_share_the_quota_left(send_window_usecase, scheduled_emails_repository):
+    set_send_window(send_window_usecase, datetime.now(timezone.utc), daily_email_count=7)
+
+    first_deferred, _ = send_window_usecase.defer_emails(
+        [make_email_in(subject=f'First {index}') for index in range(2)]
+    )
+    second_deferred, _ = send_window_usecase.defer_emails(
+        [make_email_in(subject=f'Second {index}') for index in range(2)]
+    )
+
+    assert first_deferred == [False, False]
+    assert second_deferred == [False, True]
+    assert get_daily_count(send_window_usecase) == 10
+
+
+def test_emails_are_sent_now_when_scheduling_fails(send_window_usecase, scheduled_emails_repository):
+    set_send_window(send_window_usecase, datetime.now(timezone.utc), daily_email_count=10)
+    scheduled_emails_repository.store_scheduled_emails.return_value = (HTTPStatus.INTERNAL_SERVER_ERROR, 'error')
+
+    assert send_window_usecase.defer_emails([make_email_in()]) == ([False], [None])
+
+
+def test_deferral_can_be_turned_off(monkeypatch, send_window_usecase, scheduled_emails_repository):
+    monkeypatch.setenv('DEFER_BULK_OVERFLOW', 'false')
+    send_window_usecase = SendWindowUsecase()
+    set_send_window(send_window_usecase, datetime.now(timezone.utc), daily_email_count=10)
+
+    assert send_window_usecase.defer_emails([make_email_in()]) == ([False], [None])
+    scheduled_emails_repository.store_scheduled_emails.assert_not_called()
+
+
+def test_a_release_takes_its_share_of_the_quota_left_and_every_urgent_email(
+    send_window_usecase, scheduled_emails_repository
+):
+    now = datetime.now(timezone.utc)
+    # 4 emails left in a window that ends in 1.5 hours, so this release and the next one send 2 each
+    set_send_window(send_window_usecase, now - timedelta(hours=22, minutes=30), daily_email_count=6)
+    urgent = SimpleNamespace(
+        rangeKey='urgent',
+        sendBefore=(now + timedelta(minutes=30)).isoformat(),
+        payload=make_email_in(subject='Urgent').model_dump_json(exclude={'content'}),
+    )
+    waiting = [
+        SimpleNamespace(
+            rangeKey=f'waiting{index}',
+            sendBefore=None,
+            payload=make_email_in(subject=f'Waiting {index}').model_dump_json(exclude={'content'}),
+        )
+        for index in range(3)
+    ]
+    scheduled_emails_repository.query_due_scheduled_emails.return_value = (HTTPStatus.OK, waiting + [urgent], '')
+
+    scheduled_emails, email_ins = send_window_usecase.get_release_batch()
+
+    assert scheduled_emails == [urgent, waiting[0]]
+    assert [email_in.subject for email_in in email_ins] == ['Urgent', 'Waiting 0']
+
+
+def test_completed_releases_delete_only_the_emails_that_are_done(send_window_usecase, scheduled_emails_repository):
+    scheduled_emails = [SimpleNamespace(rangeKey=str(index)) for index in range(3)]
+
+    send_window_usecase.complete_release(
+        scheduled_emails, [HTTPStatus.OK, HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.BAD_REQUEST]
+    )
+
+    scheduled_emails_repository.delete_scheduled_emails.assert_called_once_with(
+        [scheduled_emails[0], scheduled_emails[2]]
+    )
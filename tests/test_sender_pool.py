@@ -0,0 +1,143 @@
+import json
+from datetime import datetime, timezone
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+from constants.common_constants import EmailType
+from model.email.email import EmailIn, EmailRecord
+from usecase.email_usecase import EmailUsecase
+from utils.consistent_hash import ConsistentHashRing
+
+KEYS = [f'member{index}@example.com' for index in range(2000)]
+
+
+def test_ring_orders_every_node_from_the_owner():
+    ring = ConsistentHashRing({'a': 1, 'b': 1, 'c': 1})
+    for key in KEYS[:50]:
+        nodes = ring.get_nodes(key)
+        assert sorted(nodes) == ['a', 'b', 'c']
+        assert ring.get_nodes(key) == nodes
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    ring = ConsistentHashRing({'a': 1, 'b': 1, 'c': 1})
+    grown_ring = ConsistentHashRing({'a': 1, 'b': 1, 'c': 1, 'd': 1})
+
+    moved = [key for key in KEYS if ring.get_nodes(key)[0] != grown_ring.get_nodes(key)[0]]
+
+    assert all(grown_ring.get_nodes(key)[0] == 'd' for key in moved)
+    assert 0.15 < len(moved) / len(KEYS) < 0.35
+
+
+def test_keys_spread_in_proportion_to_weights():
+    ring = ConsistentHashRing({'a': 1, 'b': 3})
+    share = sum(ring.get_nodes(key)[0] == 'b' for key in KEYS) / len(KEYS)
+    assert 0.65 < share < 0.85
+
+
+def make_email_record(to: str = 'member@example.com') -> EmailRecord:
+    return EmailRecord.from_email_in(
+        EmailIn(
+            to=[to],
+            subject='Subject',
+            salutation='Hi',
+            body=['Body'],
+            regards=['Regards'],
+            emailType=EmailType.CONFIRMATION_EMAIL,
+        )
+    )
+
+
+class FakeEmailTrackersRepository:
+    """
+    Keeps the daily count of a sender shard in memory, with the atomic increment of the DynamoDB tracker.
+    """
+
+    def __init__(self) -> None:
+        self.email_tracker = SimpleNamespace(lastEmailSent=datetime.now(timezone.utc).isoformat(), dailyEmailCount=0)
+
+    def query_email_tracker(self):
+        return HTTPStatus.OK, self.email_tracker, None
+
+    def append_email_sent_count(self, email_tracker_entry, append_count: int = 1):
+        self.email_tracker.dailyEmailCount += append_count
+        return HTTPStatus.OK, self.email_tracker, ''
+
+
+@pytest.fixture
+def email_usecase(mocker, monkeypatch):
+    monkeypatch.setenv(
+        'SENDER_SHARDS',
+        json.dumps(
+            [
+                {
+                    'shardId': shard_id,
+                    'senderEmail': f'{shard_id}@example.com',
+                    'dailyFreeTierLimit': 2,
+                    'sendsPerSecond': 1,
+                }
+                for shard_id in ('a', 'b')
+            ]
+        ),
+    )
+    mocker.patch('utils.utils.Utils.get_secret', return_value='secret')
+    email_usecase = EmailUsecase()
+    for sender_shard in email_usecase.sender_pool.sender_shards.values():
+        sender_shard.email_tracker_repository = FakeEmailTrackersRepository()
+    return email_usecase
+
+
+def set_daily_count(sender_shard, daily_email_count: int) -> None:
+    sender_shard.email_tracker_repository.email_tracker.dailyEmailCount = daily_email_count
+
+
+def get_daily_count(sender_shard) -> int:
+    return sender_shard.email_tracker_repository.email_tracker.dailyEmailCount
+
+
+def test_reserve_moves_an_email_past_a_shard_over_quota(email_usecase):
+    email_body = make_email_record()
+    owner, fallback = email_usecase.sender_pool.get_shards(email_body)
+    set_daily_count(owner, 2)
+    set_daily_count(fallback, 0)
+
+    sender_shard, total_email_count = email_usecase.reserve_sender_shard(email_body, quota_reserve=0, timeout=0)
+
+    assert (sender_shard, total_email_count) == (fallback, 1)
+    assert get_daily_count(owner) == 2
+    assert get_daily_count(fallback) == 1
+    # The owner's rate token was given back, the fallback's is held for the send
+    assert owner.rate_limiter.try_acquire() == 0
+    assert fallback.rate_limiter.try_acquire() > 0
+    # The owner is known to be over quota until its window resets
+    assert email_usecase.sender_pool.get_shards(email_body) == [fallback, owner]
+
+
+def test_reserve_counts_an_email_once_when_every_shard_is_over_quota(email_usecase):
+    email_body = make_email_record()
+    owner, other = email_usecase.sender_pool.get_shards(email_body)
+    set_daily_count(owner, 2)
+    set_daily_count(other, 2)
+
+    sender_shard, total_email_count = email_usecase.reserve_sender_shard(email_body, quota_reserve=0, timeout=0)
+
+    assert (sender_shard, total_email_count) == (owner, 3)
+    assert get_daily_count(owner) == 3
+    assert get_daily_count(other) == 2
+    assert owner.rate_limiter.try_acquire() > 0
+    assert other.rate_limiter.try_acquire() == 0
+
+
+def test_reserve_waits_for_a_rate_token_when_every_shard_is_known_over_quota(email_usecase):
+    email_body = make_email_record()
+    owner, other = email_usecase.sender_pool.get_shards(email_body)
+    set_daily_count(owner, 2)
+    set_daily_count(other, 2)
+    email_usecase.reserve_sender_shard(email_body, quota_reserve=0, timeout=0)
+    assert not owner.has_quota() and not other.has_quota()
+
+    sender_shard, _ = email_usecase.reserve_sender_shard(email_body, quota_reserve=0, timeout=0)
+
+    assert sender_shard is None
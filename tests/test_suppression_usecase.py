@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+
+from constants.common_constants import EmailType
+from model.email.email import EmailIn
+from usecase.suppression_usecase import SuppressionUsecase
+from utils.bloom_filter import BloomFilter
+
+SUPPRESSED_EMAIL = 'bounced@example.com'
+
+
+def make_email_in(**kwargs) -> EmailIn:
+    fields = {
+        'to': ['member@example.com'],
+        'subject': 'Subject',
+        'salutation': 'Hi',
+        'body': ['Body'],
+        'regards': ['Regards'],
+        'emailType': EmailType.CONFIRMATION_EMAIL,
+    }
+    fields.update(kwargs)
+    return EmailIn(**fields)
+
+
+@pytest.fixture
+def suppression_usecase(mocker):
+    repository = mocker.patch('usecase.suppression_usecase.SuppressionRepository').return_value
+    repository.query_suppressed_emails.return_value = (HTTPStatus.OK, [SUPPRESSED_EMAIL], '')
+    repository.query_suppressed_with_emails.side_effect = lambda emails: (
+        HTTPStatus.OK,
+        {email for email in emails if email == SUPPRESSED_EMAIL},
+        '',
+    )
+    return SuppressionUsecase()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f'user{index}@example.com' for index in range(1000)]
+    bloom_filter.update(items)
+    assert all(item in bloom_filter for item in items)
+
+
+def test_bloom_filter_false_positive_rate_is_near_error_rate():
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+    bloom_filter.update(f'user{index}@example.com' for index in range(1000))
+    false_positives = sum(f'other{index}@example.com' in bloom_filter for index in range(10000))
+    assert false_positives / 10000 < 0.03
+
+
+def test_remove_suppressed_recipients_returns_filtered_copies(suppression_usecase):
+    email_in = make_email_in(to=['member@example.com', 'Bounced@Example.com'], cc=[SUPPRESSED_EMAIL])
+
+    (filtered_email_in,) = suppression_usecase.remove_suppressed_recipients([email_in])
+
+    assert filtered_email_in is not email_in
+    assert filtered_email_in.to == ['member@example.com']
+    assert filtered_email_in.cc == []
+    assert email_in.to == ['member@example.com', 'Bounced@example.com']
+    assert email_in.cc == [SUPPRESSED_EMAIL]
+
+
+def test_remove_suppressed_recipients_keeps_unaffected_emails(suppression_usecase):
+    email_in = make_email_in()
+    suppressed_email_in = make_email_in(to=[SUPPRESSED_EMAIL])
+
+    filtered_email_ins = suppression_usecase.remove_suppressed_recipients([email_in, suppressed_email_in])
+
+    assert filtered_email_ins == [email_in, None]
+    assert filtered_email_ins[0] is email_in
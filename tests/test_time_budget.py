@@ -0,0 +1,45 @@
+import pytest
+
+from constants.common_constants import CommonConstants
+from utils.time_budget import TimeBudget
+
+
+class FakeContext:
+    def __init__(self, remaining_ms: int) -> None:
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self) -> int:
+        return self.remaining_ms
+
+
+@pytest.fixture(autouse=True)
+def safety_margin(monkeypatch):
+    monkeypatch.setenv('TIME_BUDGET_SAFETY_MARGIN_MS', '10000')
+
+
+def test_budget_without_a_context_never_runs_out():
+    time_budget = TimeBudget()
+    assert not time_budget.exhausted()
+    assert time_budget.message_timeout() == CommonConstants.SMTP_TIMEOUT_SECONDS
+
+
+def test_budget_is_exhausted_under_the_safety_margin():
+    context = FakeContext(remaining_ms=10000)
+    time_budget = TimeBudget(context)
+    assert not time_budget.exhausted()
+
+    context.remaining_ms = 9999
+    assert time_budget.exhausted()
+
+
+def test_message_timeout_is_the_time_left_after_the_safety_margin():
+    assert TimeBudget(FakeContext(remaining_ms=15000)).message_timeout() == 5.0
+
+
+def test_message_timeout_is_capped_at_the_smtp_timeout():
+    assert TimeBudget(FakeContext(remaining_ms=900000)).message_timeout() == CommonConstants.SMTP_TIMEOUT_SECONDS
+
+
+def test_message_timeout_never_drops_under_the_minimum():
+    time_budget = TimeBudget(FakeContext(remaining_ms=5000))
+    assert time_budget.message_timeout() == CommonConstants.MIN_MESSAGE_TIMEOUT_SECONDS
@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from constants.common_constants import EmailType
+from model.email.email import EmailAttachmentIn, EmailIn
+from usecase.validation_usecase import ValidationUsecase
+
+
+def make_message(**kwargs) -> dict:
+    message = {
+        'to': ['member@example.com'],
+        'subject': 'Subject',
+        'salutation': 'Hi',
+        'body': ['Body'],
+        'regards': ['Regards'],
+        'emailType': 'confirmationEmail',
+    }
+    message.update(kwargs)
+    return message
+
+
+@pytest.fixture(params=[False, True], ids=['validated', 'trusted'])
+def validation_usecase(request, monkeypatch):
+    monkeypatch.setenv('TRUSTED_PRODUCER', str(request.param).lower())
+    return ValidationUsecase()
+
+
+def test_validate_emails_coerces_the_fields_used_downstream(validation_usecase):
+    message = make_message(
+        sendBefore='2026-10-20T08:00:00Z',
+        attachments=[{'objectKey': 'brochure.pdf', 'isShared': 'true'}],
+    )
+
+    (email_in,), errors = validation_usecase.validate_emails([message])
+
+    assert errors == []
+    assert email_in.emailType is EmailType.CONFIRMATION_EMAIL
+    assert email_in.sendBefore == datetime(2026, 10, 20, 8, tzinfo=timezone.utc)
+    assert email_in.attachments == [EmailAttachmentIn(objectKey='brochure.pdf', isShared=True)]
+    assert email_in.isDurianPy is True
+    assert email_in.cc is None
+
+
+def test_validate_emails_reports_invalid_emails_by_field(validation_usecase):
+    messages = [
+        make_message(),
+        make_message(emailType='newsletter'),
+        make_message(sendBefore='tomorrow'),
+        {key: value for key, value in make_message().items() if key != 'subject'},
+    ]
+
+    email_ins, errors = validation_usecase.validate_emails(messages)
+
+    assert email_ins[0] is not None
+    assert email_ins[1:] == [None, None, None]
+    assert [index for index, _ in errors] == [1, 2, 3]
+    assert errors[0][1].startswith('emailType: ')
+    assert errors[1][1].startswith('sendBefore: ')
+    assert errors[2][1] == 'subject: Field required'
+
+
+def test_valid_emails_are_validated_once_when_others_are_invalid(mocker, monkeypatch):
+    monkeypatch.setenv('TRUSTED_PRODUCER', 'false')
+    model_validate = mocker.spy(EmailIn, 'model_validate')
+
+    email_ins, errors = ValidationUsecase().validate_emails(['not an email', make_message(), make_message()])
+
+    assert email_ins[0] is None
+    assert [email_in.subject for email_in in email_ins[1:]] == ['Subject', 'Subject']
+    assert errors == [(0, ': Input should be a valid dictionary or instance of EmailIn')]
+    model_validate.assert_not_called()
+
+
+def test_a_body_that_is_not_a_list_is_one_error(monkeypatch):
+    monkeypatch.setenv('TRUSTED_PRODUCER', 'false')
+
+    email_ins, ((index, _),) = ValidationUsecase().validate_emails({'to': ['member@example.com']})
+
+    assert (email_ins, index) == ([], -1)
@@ -0,0 +1,97 @@
+import threading
+
+import boto3
+import pytest
+from moto import mock_sqs
+
+import worker
+from worker import QueueWorker
+
+
+@pytest.fixture
+def sqs():
+    with mock_sqs():
+        yield boto3.client('sqs', region_name='us-east-1')
+
+
+@pytest.fixture
+def queue_url(sqs):
+    queue_url = sqs.create_queue(QueueName='email-queue')['QueueUrl']
+    for body in ('deliver-1', 'deliver-2', 'release'):
+        sqs.send_message(QueueUrl=queue_url, MessageBody=body)
+    return queue_url
+
+
+def make_worker(sqs, queue_url: str) -> QueueWorker:
+    return QueueWorker(
+        queue_url=queue_url, processes=0, batch_size=10, wait_time_seconds=0, visibility_timeout=3, sqs=sqs
+    )
+
+
+def receive_bodies(sqs, queue_url: str) -> list:
+    messages = sqs.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10).get('Messages', [])
+    return sorted(message['Body'] for message in messages)
+
+
+def test_worker_deletes_releases_and_extends_in_flight_messages(sqs, queue_url, monkeypatch):
+    queue_worker = make_worker(sqs, queue_url)
+    heartbeat_records = []
+    heartbeat = threading.Event()
+    change_visibility = queue_worker.change_visibility
+
+    def record_heartbeat(records, visibility_timeout):
+        if visibility_timeout == queue_worker.visibility_timeout and records:
+            heartbeat_records.extend(records)
+            heartbeat.set()
+        change_visibility(records, visibility_timeout)
+
+    def process_batch(event, timeout_ms):
+        assert heartbeat.wait(5)
+        # The heartbeat kept the messages of the batch from becoming visible again
+        assert receive_bodies(sqs, queue_url) == []
+
+        batch_item_failures = []
+        for record in event['Records']:
+            if record['body'].startswith('deliver'):
+                sqs.delete_message(QueueUrl=queue_url, ReceiptHandle=record['receiptHandle'])
+            else:
+                batch_item_failures.append({'itemIdentifier': record['messageId']})
+        return {'batchItemFailures': batch_item_failures}
+
+    monkeypatch.setattr(queue_worker, 'change_visibility', record_heartbeat)
+    monkeypatch.setattr(worker, 'process_batch', process_batch)
+
+    batches = queue_worker.run(until=lambda: heartbeat.is_set() and not queue_worker.in_flight)
+
+    assert batches == 1
+    assert sorted(record['body'] for record in heartbeat_records) == ['deliver-1', 'deliver-2', 'release']
+    # The released message is visible right away instead of after its visibility timeout
+    assert receive_bodies(sqs, queue_url) == ['release']
+
+
+def test_worker_releases_every_message_of_a_failed_batch(sqs, queue_url, monkeypatch):
+    queue_worker = make_worker(sqs, queue_url)
+    processed = threading.Event()
+
+    def process_batch(event, timeout_ms):
+        processed.set()
+        raise RuntimeError('handler crashed')
+
+    monkeypatch.setattr(worker, 'process_batch', process_batch)
+
+    assert queue_worker.run(until=processed.is_set) == 1
+    assert receive_bodies(sqs, queue_url) == ['deliver-1', 'deliver-2', 'release']
+
+
+def test_to_record_matches_the_lambda_sqs_event(sqs, queue_url):
+    (message,) = sqs.receive_message(
+        QueueUrl=queue_url, MaxNumberOfMessages=1, AttributeNames=['All'], MessageAttributeNames=['All']
+    )['Messages']
+
+    record = QueueWorker.to_record(message)
+
+    assert record['messageId'] == message['MessageId']
+    assert record['receiptHandle'] == message['ReceiptHandle']
+    assert record['body'] == message['Body']
+    assert record['eventSource'] == 'aws:sqs'
+    assert 'ApproximateReceiveCount' in record['attributes']
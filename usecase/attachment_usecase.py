@@ -0,0 +1,120 @@
+import base64
+import mimetypes
+import os
+import posixpath
+from http import HTTPStatus
+from typing import Iterator, List, NamedTuple, Tuple
+
+from constants.common_constants import CommonConstants, MetricName
+from model.email.email import EmailAttachmentIn
+from repository.attachment_repository import AttachmentRepository
+from utils.logger import logger
+from utils.lru_cache import LRUCache
+from utils.metrics import metrics
+
+
+class EncodedAttachment(NamedTuple):
+    file_name: str
+    content_type: str
+    # Base64 MIME lines ending in CRLF, ready to be joined into the SMTP message as is
+    data: bytes
+
+
+class AttachmentUsecase:
+    """
+    Loads email attachments as base64 MIME lines, ready to be joined into an SMTP message.
+
+    Files are read in chunks and encoded incrementally, so the raw file is never held whole. Shared attachments
+    (isShared, e.g. an event brochure) are cached per container, so every email and every concurrent send uses
+    the same encoded bytes instead of reading and encoding its own copy.
+    """
+
+    def __init__(self):
+        self.attachment_repository = AttachmentRepository()
+        self.attachments_bucket = os.getenv('ATTACHMENTS_BUCKET')
+        self.chunk_size = int(os.getenv('ATTACHMENT_READ_CHUNK_BYTES', CommonConstants.ATTACHMENT_READ_CHUNK_BYTES))
+        self.shared_cache = LRUCache(
+            max_size=int(os.getenv('ATTACHMENT_CACHE_SIZE', CommonConstants.ATTACHMENT_CACHE_SIZE))
+        )
+
+    def get_attachments(
+        self, attachment_ins: List[EmailAttachmentIn]
+    ) -> Tuple[HTTPStatus, List[EncodedAttachment], str]:
+        """
+        Load and encode the attachments of an email.
+
+        Args:
+            attachment_ins (List[EmailAttachmentIn]): The attachments to load.
+
+        Returns:
+            Tuple[HTTPStatus, List[EncodedAttachment], str]: A tuple containing HTTP status, the encoded
+            attachments, and an optional error message.
+        """
+        attachments = []
+        for attachment_in in attachment_ins or []:
+            status, attachment, message = self.get_attachment(attachment_in)
+            if status != HTTPStatus.OK:
+                return status, [], message
+            attachments.append(attachment)
+
+        return HTTPStatus.OK, attachments, None
+
+    def get_attachment(self, attachment_in: EmailAttachmentIn) -> Tuple[HTTPStatus, EncodedAttachment, str]:
+        bucket = attachment_in.bucket or self.attachments_bucket
+        cache_key = (bucket, attachment_in.objectKey)
+        if attachment_in.isShared:
+            cached_data = self.shared_cache.get(cache_key)
+            if cached_data is not None:
+                return HTTPStatus.OK, self.describe(attachment_in, cached_data), None
+
+        if bucket:
+            status, chunks, message = self.attachment_repository.read_object_chunks(
+                bucket=bucket, key=attachment_in.objectKey, chunk_size=self.chunk_size
+            )
+        else:
+            status, chunks, message = self.attachment_repository.read_local_chunks(
+                path=attachment_in.objectKey, chunk_size=self.chunk_size
+            )
+        if status != HTTPStatus.OK:
+            return status, None, message
+
+        try:
+            with metrics.timer(MetricName.ATTACHMENT_ENCODE.value):
+                data = b''.join(self.encode_base64_lines(chunks))
+
+        except Exception as e:
+            message = f'Failed to read attachment {attachment_in.objectKey}: {str(e)}'
+            logger.error(message, category='attachment')
+            return HTTPStatus.SERVICE_UNAVAILABLE, None, message
+
+        if attachment_in.isShared:
+            self.shared_cache.put(cache_key, data)
+
+        return HTTPStatus.OK, self.describe(attachment_in, data), None
+
+    @staticmethod
+    def describe(attachment_in: EmailAttachmentIn, data: bytes) -> EncodedAttachment:
+        file_name = attachment_in.fileName or posixpath.basename(attachment_in.objectKey)
+        content_type = (
+            attachment_in.contentType
+            or mimetypes.guess_type(file_name)[0]
+            or CommonConstants.DEFAULT_ATTACHMENT_CONTENT_TYPE
+        )
+        return EncodedAttachment(file_name=file_name, content_type=content_type, data=data)
+
+    @staticmethod
+    def encode_base64_lines(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """
+        Base64 encode chunks of bytes into 76 character MIME lines ending in CRLF, carrying over the bytes of a
+        chunk that do not fill a whole 57 byte line.
+        """
+        remainder = b''
+        for chunk in chunks:
+            data = remainder + chunk if remainder else chunk
+            whole_lines = len(data) - len(data) % 57
+            remainder = data[whole_lines:]
+            if whole_lines:
+                yield base64.encodebytes(memoryview(data)[:whole_lines]).replace(b'\n', b'\r\n')
+
+        if remainder:
+            yield base64.encodebytes(remainder).replace(b'\n', b'\r\n')
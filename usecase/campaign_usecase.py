@@ -0,0 +1,178 @@
+import json
+import os
+from http import HTTPStatus
+from typing import List
+
+from constants.common_constants import CommonConstants, EmailType
+from model.campaign.campaign import CampaignCheckpointIn, CampaignIn
+from model.email.email import EmailIn
+from model.registrations.registration import Registration
+from repository.campaign_checkpoint_repository import CampaignCheckpointRepository
+from repository.registrations_repository import RegistrationsRepository
+from usecase.email_usecase import EmailUsecase
+from usecase.idempotency_usecase import IdempotencyUsecase
+from usecase.suppression_usecase import SuppressionUsecase
+from usecase.validation_usecase import ValidationUsecase
+from utils.logger import logger
+from utils.time_budget import TimeBudget
+
+EMAIL_SENT_FLAGS = {
+    EmailType.REGISTRATION_EMAIL: 'registrationEmailSent',
+    EmailType.CONFIRMATION_EMAIL: 'confirmationEmailSent',
+    EmailType.EVALUATION_EMAIL: 'evaluationEmailSent',
+}
+
+
+class CampaignUsecase:
+    """
+    Fans a campaign command out to every active registrant of an event.
+
+    Registrations are read page by page, and anyone whose *EmailSent flag for the email type is already set is
+    skipped. The rest are sent in chunks. After each page the key it ended at is checkpointed, so when a run
+    runs out of time the redelivered command resumes from the last finished page instead of starting over.
+    Every sent or deferred email records an idempotency key of the campaign and registration, so a page that
+    is redone does not email anyone twice, including for email types without a sent flag.
+    """
+
+    def __init__(
+        self,
+        email_usecase: EmailUsecase,
+        idempotency_usecase: IdempotencyUsecase,
+        suppression_usecase: SuppressionUsecase,
+        validation_usecase: ValidationUsecase,
+    ):
+        self.email_usecase = email_usecase
+        self.idempotency_usecase = idempotency_usecase
+        self.suppression_usecase = suppression_usecase
+        self.validation_usecase = validation_usecase
+        self.registrations_repository = RegistrationsRepository()
+        self.campaign_checkpoint_repository = CampaignCheckpointRepository()
+        self.page_size = int(os.getenv('CAMPAIGN_PAGE_SIZE', CommonConstants.CAMPAIGN_PAGE_SIZE))
+        self.chunk_size = int(os.getenv('CAMPAIGN_SEND_CHUNK_SIZE', CommonConstants.CAMPAIGN_SEND_CHUNK_SIZE))
+
+    def run_campaign(self, campaign_in: CampaignIn, campaign_id: str, time_budget: TimeBudget) -> HTTPStatus:
+        """
+        Send a campaign, resuming from its checkpoint.
+
+        Args:
+            campaign_in (CampaignIn): The campaign command.
+            campaign_id (str): The ID of the campaign, used as the checkpoint key.
+            time_budget (TimeBudget): The invocation time budget.
+
+        Returns:
+            HTTPStatus: OK when every page was processed, REQUEST_TIMEOUT when the run has to be resumed, or the
+            error status of a failed read.
+        """
+        last_evaluated_key = None
+        sent_count = 0
+        status, campaign_checkpoint, _ = self.campaign_checkpoint_repository.query_campaign_checkpoint(campaign_id)
+        if status == HTTPStatus.OK:
+            if campaign_checkpoint.isCompleted:
+                logger.info('[%s] Campaign already completed', campaign_id, category='campaign')
+                return HTTPStatus.OK
+
+            if campaign_checkpoint.lastEvaluatedKey:
+                last_evaluated_key = json.loads(campaign_checkpoint.lastEvaluatedKey)
+            sent_count = campaign_checkpoint.sentCount or 0
+            logger.info('[%s] Resuming campaign after %s sent email(s)', campaign_id, sent_count, category='campaign')
+
+        sent_flag = EMAIL_SENT_FLAGS.get(campaign_in.emailType)
+        while True:
+            if time_budget.exhausted():
+                return HTTPStatus.REQUEST_TIMEOUT
+
+            status, (registrations, next_key), message = self.registrations_repository.query_registrations_page(
+                event_id=campaign_in.eventId,
+                page_size=self.page_size,
+                last_evaluated_key=last_evaluated_key,
+            )
+            if status != HTTPStatus.OK:
+                logger.error('[%s] %s', campaign_id, message, category='campaign')
+                return status
+
+            recipients = [
+                registration
+                for registration in registrations
+                if registration.email and not (sent_flag and getattr(registration, sent_flag))
+            ]
+            delivered_keys = self.idempotency_usecase.get_delivered_keys(
+                [self.get_idempotency_key(campaign_id, registration.registrationId) for registration in recipients]
+            )
+            recipients = [
+                registration
+                for registration in recipients
+                if self.get_idempotency_key(campaign_id, registration.registrationId) not in delivered_keys
+            ]
+            email_ins = self.build_emails(campaign_in, recipients)
+            for start in range(0, len(email_ins), self.chunk_size):
+                chunk = email_ins[start : start + self.chunk_size]
+                statuses = self.email_usecase.send_emails(chunk, time_budget=time_budget)
+                self.idempotency_usecase.mark_delivered(
+                    [
+                        self.get_idempotency_key(campaign_id, email_in.registrationId)
+                        for email_in, status in zip(chunk, statuses)
+                        if status in (HTTPStatus.OK, HTTPStatus.ACCEPTED)
+                    ]
+                )
+                sent_count += statuses.count(HTTPStatus.OK)
+                if HTTPStatus.REQUEST_TIMEOUT in statuses:
+                    # Sent and deferred recipients of this page are marked delivered, so the page is redone
+                    # without them
+                    self.save_checkpoint(campaign_id, campaign_in, last_evaluated_key, sent_count, is_completed=False)
+                    return HTTPStatus.REQUEST_TIMEOUT
+
+            last_evaluated_key = next_key
+            is_completed = last_evaluated_key is None
+            self.save_checkpoint(campaign_id, campaign_in, last_evaluated_key, sent_count, is_completed=is_completed)
+            if is_completed:
+                logger.info('[%s] Campaign completed, %s email(s) sent', campaign_id, sent_count, category='campaign')
+                return HTTPStatus.OK
+
+    @staticmethod
+    def get_idempotency_key(campaign_id: str, registration_id: str) -> str:
+        return IdempotencyUsecase.get_idempotency_key(campaign_id, {'registrationId': registration_id})
+
+    def build_emails(self, campaign_in: CampaignIn, registrations: List[Registration]) -> List[EmailIn]:
+        attachments = [attachment.model_dump() for attachment in campaign_in.attachments or []] or None
+        messages = []
+        for registration in registrations:
+            salutation = campaign_in.salutation.replace('{firstName}', registration.firstName or '')
+            salutation = salutation.replace('{lastName}', registration.lastName or '')
+            messages.append(
+                {
+                    'to': [registration.email],
+                    'cc': campaign_in.cc,
+                    'subject': campaign_in.subject,
+                    'salutation': salutation,
+                    'body': campaign_in.body,
+                    'regards': campaign_in.regards,
+                    'emailType': campaign_in.emailType,
+                    'eventId': campaign_in.eventId,
+                    'registrationId': registration.registrationId,
+                    'isDurianPy': campaign_in.isDurianPy,
+                    'attachments': attachments,
+                }
+            )
+
+        email_ins, errors = self.validation_usecase.validate_emails(messages)
+        for index, error in errors:
+            logger.error(
+                'Skipping registration %s: %s', registrations[index].registrationId, error, category='campaign'
+            )
+
+        email_ins = [email_in for email_in in email_ins if email_in is not None]
+        email_ins = self.suppression_usecase.remove_suppressed_recipients(email_ins)
+        return [email_in for email_in in email_ins if email_in is not None]
+
+    def save_checkpoint(
+        self, campaign_id: str, campaign_in: CampaignIn, last_evaluated_key: dict, sent_count: int, is_completed: bool
+    ) -> None:
+        self.campaign_checkpoint_repository.save_campaign_checkpoint(
+            campaign_id=campaign_id,
+            campaign_checkpoint_in=CampaignCheckpointIn(
+                eventId=campaign_in.eventId,
+                lastEvaluatedKey=json.dumps(last_evaluated_key) if last_evaluated_key else None,
+                sentCount=sent_count,
+                isCompleted=is_completed,
+            ),
+        )
@@ -0,0 +1,89 @@
+import threading
+import time
+from http import HTTPStatus
+from typing import Optional
+
+from utils.logger import logger
+
+
+class AIMDConcurrencyLimiter:
+    """
+    An additive-increase/multiplicative-decrease limit on the number of in-flight sends.
+
+    Every healthy send (accepted or permanently rejected, under the latency threshold) grows the window by
+    additive_increase / window, which adds about one slot per window's worth of sends. A throttling reply
+    (421/454) or a timeout multiplies the window by decrease_factor. Only one cut is applied per congestion
+    event: failures of sends started before the last cut are ignored.
+
+    Attributes:
+        window (float): The current concurrency window.
+        in_flight (int): The number of sends currently holding a slot.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        additive_increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_threshold: float = 5.0,
+        clock=time.monotonic,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.clock = clock
+
+        self.window = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self.last_decrease = float('-inf')
+        self.condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(int(self.window), self.min_limit)
+
+    def acquire(self, timeout: float = None) -> Optional[float]:
+        """
+        Block until a send slot is available and take it.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            Optional[float]: The time the slot was acquired, to be passed back to release, or None if no slot
+            was free before the timeout.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.in_flight < self.limit, timeout=timeout):
+                return None
+
+            self.in_flight += 1
+            return self.clock()
+
+    def release(self, acquired_at: float, latency: float, status: HTTPStatus) -> None:
+        """
+        Give a send slot back and adjust the window from the outcome of the send.
+
+        Args:
+            acquired_at (float): The value returned by acquire.
+            latency (float): The send latency in seconds.
+            status (HTTPStatus): The send status.
+        """
+        with self.condition:
+            self.in_flight -= 1
+            if status in (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.GATEWAY_TIMEOUT):
+                if acquired_at > self.last_decrease:
+                    self.window = max(self.window * self.decrease_factor, float(self.min_limit))
+                    self.last_decrease = self.clock()
+                    logger.warning(
+                        'Send concurrency decreased to %s after %s', self.limit, status.phrase, category='concurrency'
+                    )
+
+            elif status in (HTTPStatus.OK, HTTPStatus.BAD_REQUEST) and latency <= self.latency_threshold:
+                self.window = min(self.window + self.additive_increase / self.window, float(self.max_limit))
+
+            self.condition.notify_all()
@@ -0,0 +1,112 @@
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import List
+
+from constants.common_constants import CommonConstants, EmailProvider, MetricName
+from model.email.email import EmailDeliveryLogIn, EmailRecord
+from repository.email_delivery_log_repository import EmailDeliveryLogRepository
+from utils.logger import logger
+from utils.metrics import metrics
+
+
+class DeliveryLedgerUsecase:
+    """
+    Records the outcome of every email (provider, latency, status and failure reason) in the delivery ledger.
+
+    Outcomes are buffered in memory and written in bulk at the end of every batch, so the ledger costs a
+    fraction of a DynamoDB round trip per email and never holds up a delivery thread. A buffer that reaches
+    flush_size is set aside whole for the flush, which writes each one in its own batch write. When a write
+    fails the outcomes go back to the buffer for the next flush, up to max_buffer_size; beyond that the oldest
+    are dropped.
+
+    Attributes:
+        is_enabled (bool): Whether outcomes are recorded.
+        flush_size (int): The number of outcomes per batch write.
+        max_buffer_size (int): The maximum number of outcomes kept while writes fail.
+    """
+
+    def __init__(self) -> None:
+        self.email_delivery_log_repository = EmailDeliveryLogRepository()
+        self.is_enabled = os.getenv('DELIVERY_LOG_ENABLED', 'true').lower() == 'true'
+        self.flush_size = int(os.getenv('DELIVERY_LOG_FLUSH_SIZE', CommonConstants.DELIVERY_LOG_FLUSH_SIZE))
+        self.max_buffer_size = int(
+            os.getenv('DELIVERY_LOG_MAX_BUFFER_SIZE', CommonConstants.DELIVERY_LOG_MAX_BUFFER_SIZE)
+        )
+        self.buffer: List[EmailDeliveryLogIn] = []
+        self.full_buffers: List[List[EmailDeliveryLogIn]] = []
+        self.buffer_lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+
+    def record(
+        self,
+        email_body: EmailRecord,
+        status: HTTPStatus,
+        provider: EmailProvider = None,
+        latency: float = None,
+        attempts: int = 0,
+        sender_shard_id: str = None,
+    ) -> None:
+        """
+        Buffer the outcome of an email, and set the buffer aside for the next flush once it is full.
+
+        Args:
+            email_body (EmailRecord): The email.
+            status (HTTPStatus): The send status of the email.
+            provider (EmailProvider, optional): The provider of the last send attempt.
+            latency (float, optional): The total time spent in the send attempts, in seconds.
+            attempts (int): The number of providers tried.
+            sender_shard_id (str, optional): The sender shard of the email.
+        """
+        if not self.is_enabled:
+            return
+
+        email_delivery_log_in = EmailDeliveryLogIn(
+            deliveryLogId=uuid.uuid4().hex,
+            recipients=list(email_body.to),
+            emailType=email_body.emailType,
+            eventId=email_body.eventId,
+            provider=provider,
+            senderShardId=sender_shard_id,
+            statusCode=status.value,
+            failureReason=None if status == HTTPStatus.OK else status.phrase,
+            latencyMs=round(latency * 1000, 3) if latency is not None else None,
+            attempts=attempts,
+            sentAt=datetime.now(timezone.utc),
+        )
+        with self.buffer_lock:
+            self.buffer.append(email_delivery_log_in)
+            if len(self.buffer) >= self.flush_size:
+                self.full_buffers.append(self.buffer)
+                self.buffer = []
+
+    def flush(self) -> None:
+        """
+        Write the buffered outcomes to the ledger, one batch write per full buffer and one for the rest.
+        """
+        # One flush at a time, later outcomes keep buffering meanwhile
+        with self.flush_lock:
+            with self.buffer_lock:
+                buffers = (self.full_buffers + [self.buffer]) if self.buffer else self.full_buffers
+                self.full_buffers, self.buffer = [], []
+
+            failed_email_delivery_log_ins = []
+            for email_delivery_log_ins in buffers:
+                with metrics.timer(MetricName.DELIVERY_LOG_FLUSH.value):
+                    status, _ = self.email_delivery_log_repository.store_email_delivery_logs(email_delivery_log_ins)
+                if status != HTTPStatus.OK:
+                    failed_email_delivery_log_ins.extend(email_delivery_log_ins)
+
+            if not failed_email_delivery_log_ins:
+                return
+
+            with self.buffer_lock:
+                self.buffer = failed_email_delivery_log_ins + self.buffer
+                dropped_count = len(self.buffer) - self.max_buffer_size
+                if dropped_count > 0:
+                    self.buffer = self.buffer[dropped_count:]
+
+            if dropped_count > 0:
+                logger.error('Dropped %s delivery log(s) after failed writes', dropped_count, category='ledger')
@@ -1,227 +1,655 @@
 import os
 import smtplib
-from datetime import datetime, timezone
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from email.policy import compat32
 from http import HTTPStatus
-from typing import List
+from typing import List, NamedTuple, Optional, Sequence, Tuple
 
 import jinja2
-from dateutil.parser import parse
 
-from constants.common_constants import CommonConstants, EmailType
-from model.email.email import EmailIn, EmailTrackerIn
+from constants.common_constants import (
+    CommonConstants,
+    EmailLane,
+    EmailProvider,
+    EmailType,
+    MetricName,
+)
+from model.email.email import EmailIn, EmailRecord
 from model.registrations.registration import RegistrationIn
-from repository.email_tracker_repository import EmailTrackersRepository
 from repository.registrations_repository import RegistrationsRepository
+from usecase.attachment_usecase import AttachmentUsecase, EncodedAttachment
+from usecase.concurrency_limiter import AIMDConcurrencyLimiter
+from usecase.delivery_ledger_usecase import DeliveryLedgerUsecase
+from usecase.lane_scheduler import LaneScheduler
+from usecase.provider_router import ProviderRouter
+from usecase.send_window_usecase import SendWindowUsecase
+from usecase.sender_pool import SenderPool, SenderShard
 from utils.logger import logger
+from utils.metrics import metrics
+from utils.pipeline import PipelineStage
+from utils.smtp_pool import SmtpConnectionPool
+from utils.time_budget import TimeBudget
+from utils.token_bucket import TokenBucket
 from utils.utils import Utils
 
+# The message headers and layout of as_string, with the CRLF line endings SMTP sends
+SMTP_POLICY = compat32.clone(linesep='\r\n', max_line_length=0)
+
+
+class QueuedEmail(NamedTuple):
+    email_body: EmailRecord
+    time_budget: TimeBudget
+    content: str = ''
+    attachments: Tuple[EncodedAttachment, ...] = ()
+    sender_shard: Optional[SenderShard] = None
+
 
 class EmailUsecase:
     def __init__(self):
         self.sendgrid_api_key = Utils.get_secret(os.getenv('SENDGRID_API_KEY_NAME'))
-        self.sendgrid_smtp_host = 'smtp.sendgrid.net'
-        self.ses_smtp_username = Utils.get_secret(os.getenv('SES_SMTP_USERNAME_KEY'))
-        self.ses_smtp_password = Utils.get_secret(os.getenv('SES_SMTP_PASSWORD_KEY'))
-        self.ses_smtp_host = os.getenv('SES_SMTP_HOST')
-        self.sender_email = os.getenv('SENDER_EMAIL')
-        self.display_name = os.getenv('DISPLAY_EMAIL_NAME')
+        self.sendgrid_smtp_host = os.getenv('SENDGRID_SMTP_HOST', CommonConstants.SENDGRID_SMTP_HOST)
+        self.smtp_port = int(os.getenv('SMTP_PORT', CommonConstants.SMTP_PORT))
         self.registrations_repository = RegistrationsRepository()
-        self.email_tracker_repository = EmailTrackersRepository()
-        self.datetime_now = datetime.now(timezone.utc)
+        self.attachment_usecase = AttachmentUsecase()
+        self.sender_pool = SenderPool()
+        self.provider_router = ProviderRouter()
+        self.send_window_usecase = SendWindowUsecase(sender_pool=self.sender_pool)
+        self.delivery_ledger_usecase = DeliveryLedgerUsecase()
+        self.email_senders = {
+            EmailProvider.SES: self.send_ses_email,
+            EmailProvider.SENDGRID: self.send_sendgrid_email,
+        }
+        self.concurrency_limiter = AIMDConcurrencyLimiter(
+            initial_limit=int(os.getenv('INITIAL_SEND_CONCURRENCY', CommonConstants.INITIAL_SEND_CONCURRENCY)),
+            max_limit=int(os.getenv('MAX_SEND_CONCURRENCY', CommonConstants.MAX_SEND_CONCURRENCY)),
+        )
+        queue_size = int(os.getenv('PIPELINE_QUEUE_SIZE', CommonConstants.PIPELINE_QUEUE_SIZE))
+        self.render_stage = PipelineStage(
+            name='render',
+            handler=self.render_queued_email,
+            workers=int(os.getenv('RENDER_WORKERS', CommonConstants.RENDER_WORKERS)),
+            queue_size=queue_size,
+            depth_metric_name=MetricName.RENDER_QUEUE_DEPTH.value,
+        )
+        self.delivery_stage = PipelineStage(
+            name='delivery',
+            handler=self.deliver_queued_email,
+            workers=self.concurrency_limiter.max_limit,
+            queue_size=queue_size,
+            depth_metric_name=MetricName.DELIVERY_QUEUE_DEPTH.value,
+        )
+        self.registration_stage = PipelineStage(
+            name='registration',
+            handler=self.update_queued_registration,
+            workers=int(os.getenv('REGISTRATION_WRITERS', CommonConstants.REGISTRATION_WRITERS)),
+            queue_size=queue_size,
+            depth_metric_name=MetricName.REGISTRATION_QUEUE_DEPTH.value,
+        )
+        self.bulk_rate_limiter = TokenBucket(
+            rate=float(os.getenv('BULK_SENDS_PER_SECOND', CommonConstants.BULK_SENDS_PER_SECOND))
+        )
+        self.transactional_quota_reserve = int(
+            os.getenv('TRANSACTIONAL_QUOTA_RESERVE', CommonConstants.TRANSACTIONAL_QUOTA_RESERVE)
+        )
+        self.smtp_pools = {}
+        self.smtp_pools_lock = threading.Lock()
 
     def create_email(
         self,
         sender_email: str,
         subject: str,
         content: str,
-        to_email: List[str] = None,
-        cc: List[str] = None,
-        bcc: List[str] = None,
+        to_email: Sequence[str] = None,
+        cc: Sequence[str] = None,
+        bcc: Sequence[str] = None,
     ) -> MIMEMultipart:
-        msg = MIMEMultipart()
+        # The boundary is set up front, as serialize_email joins the attachments in after it
+        msg = MIMEMultipart(boundary=f'{"=" * 15}{uuid.uuid4().hex}==')
         msg['From'] = sender_email
         msg['Subject'] = subject
 
-        if to_email is not None:
-            msg['To'] = ', '.join(to_email) if len(to_email) > 1 else to_email[0]
-        if cc is not None:
-            msg['Cc'] = ', '.join(cc) if len(cc) > 1 else cc[0]
-        if bcc is not None:
-            msg['Bcc'] = ', '.join(bcc) if len(bcc) > 1 else bcc[0]
+        if to_email:
+            msg['To'] = ', '.join(to_email)
+        if cc:
+            msg['Cc'] = ', '.join(cc)
+        if bcc:
+            msg['Bcc'] = ', '.join(bcc)
 
         msg.attach(MIMEText(content, 'html'))
         return msg
 
-    def send_email(self, email_body: EmailIn):
-        j2 = jinja2.Environment()
-        email_from = f'{self.display_name} <{self.sender_email}>'
-        to_email = email_body.to
-        cc_email = email_body.cc or []
-        bcc_email = email_body.bcc
-        subject = email_body.subject
-        frontend_url = os.getenv('FRONTEND_URL')
+    @staticmethod
+    def serialize_email(msg: MIMEMultipart, attachments: Sequence[EncodedAttachment] = ()) -> bytes:
+        """
+        Serialize a message for SMTP, joining in the encoded attachments.
+
+        The attachment parts are not attached to the message: the email generator would copy their data into
+        each message and write it out again line by line. Only the part headers are generated per email, and
+        the encoded data, which a shared attachment holds once for every email, is joined in as is.
+
+        Args:
+            msg (MIMEMultipart): The message built by create_email.
+            attachments (Sequence[EncodedAttachment]): The encoded attachments.
+
+        Returns:
+            bytes: The message, with CRLF line endings.
+        """
+        msg_bytes = msg.as_bytes(policy=SMTP_POLICY)
+        if not attachments:
+            return msg_bytes
+
+        boundary = msg.get_boundary().encode('ascii')
+        close_delimiter = b'\r\n--' + boundary + b'--\r\n'
+        parts = [msg_bytes[: -len(close_delimiter)]]
+        for attachment in attachments:
+            maintype, _, subtype = attachment.content_type.partition('/')
+            part = MIMEBase(maintype, subtype or 'octet-stream')
+            part['Content-Transfer-Encoding'] = 'base64'
+            part.add_header('Content-Disposition', 'attachment', filename=attachment.file_name)
+            part.set_payload('')
+            parts += [b'\r\n--', boundary, b'\r\n', part.as_bytes(policy=SMTP_POLICY), attachment.data]
+        parts.append(close_delimiter)
+        return b''.join(parts)
+
+    def send_emails(
+        self, email_bodies: List[EmailIn], time_budget: TimeBudget = None, defer_overflow: bool = True
+    ) -> List[HTTPStatus]:
+        """
+        Send a batch of emails through the send pipeline.
+
+        Each email is converted once to an immutable EmailRecord, which the rest of the send path uses. The
+        pipeline has three stages connected by bounded queues: render (template and attachments), delivery
+        (quota, MIME and SMTP, bounded by the adaptive concurrency limiter) and registration (the database
+        update of sent emails). Later emails are rendered while earlier ones are on the wire, and delivery
+        workers move on to the next email instead of waiting for the database. The batch returns once every
+        email has left the pipeline, including its registration update.
+
+        Args:
+            email_bodies (List[EmailIn]): The emails to send.
+            time_budget (TimeBudget, optional): The invocation time budget. Emails that have not started
+                when the budget runs out are skipped, and each send times out within the remaining budget.
+            defer_overflow (bool): Hold bulk emails that overflow the primary quota for the next send window.
+
+        Returns:
+            List[HTTPStatus]: The send status of each email, in the same order. Skipped emails are
+            REQUEST_TIMEOUT and deferred emails are ACCEPTED. Each email is waited for within the per-message
+            timeout of the budget: one still in the pipeline after it is REQUEST_TIMEOUT, and one whose stage
+            raised is INTERNAL_SERVER_ERROR, so one email cannot fail or hold up the whole batch.
+        """
+        time_budget = time_budget or TimeBudget()
+        deferred = [False] * len(email_bodies)
+        reserved_shards = [None] * len(email_bodies)
+        if defer_overflow:
+            deferred, reserved_shards = self.send_window_usecase.defer_emails(email_bodies)
+
+        futures = []
+        for email_body, is_deferred, sender_shard in zip(email_bodies, deferred, reserved_shards):
+            if is_deferred:
+                futures.append(None)
+                continue
+
+            future = Future()
+            queued_email = QueuedEmail(EmailRecord.from_email_in(email_body), time_budget, sender_shard=sender_shard)
+            self.render_stage.put(future, queued_email)
+            futures.append(future)
+
+        statuses = [
+            HTTPStatus.ACCEPTED if future is None else self.get_send_status(future, time_budget) for future in futures
+        ]
+        metrics.put_metric(MetricName.CONCURRENCY_WINDOW.value, round(self.concurrency_limiter.window, 2))
+        metrics.put_metric(MetricName.EMAILS_SENT.value, statuses.count(HTTPStatus.OK))
+        return statuses
+
+    @staticmethod
+    def get_send_status(future: Future, time_budget: TimeBudget) -> HTTPStatus:
+        try:
+            return future.result(timeout=time_budget.message_timeout())
+        except FutureTimeoutError:
+            logger.error('Timed out waiting for an email to leave the send pipeline', category='pipeline')
+            return HTTPStatus.REQUEST_TIMEOUT
+        except Exception:
+            # The pipeline stage has logged the error
+            return HTTPStatus.INTERNAL_SERVER_ERROR
+
+    def render_queued_email(self, future: Future, queued_email: QueuedEmail) -> None:
+        if queued_email.time_budget.exhausted():
+            future.set_result(HTTPStatus.REQUEST_TIMEOUT)
+            return
 
-        # Ensure durianpy.davao@gmail.com is always CCed
-        if CommonConstants.DURIANPY_CC_EMAIL not in cc_email:
-            cc_email.append(CommonConstants.DURIANPY_CC_EMAIL)
+        status, content, attachments = self.render_email(queued_email.email_body)
+        if status != HTTPStatus.OK:
+            future.set_result(status)
+            return
 
-        # Update email_body with the modified CC list
-        email_body.cc = cc_email
+        self.delivery_stage.put(future, queued_email._replace(content=content, attachments=tuple(attachments)))
 
-        htmlTemplate = j2.from_string(email_body.content)
-        content = htmlTemplate.render(
-            frontend_url=frontend_url,
-            salutation=email_body.salutation,
-            body=email_body.body,
-            regards=email_body.regards,
-        )
-        msg = self.create_email(
-            sender_email=email_from,
-            to_email=to_email,
-            subject=subject,
-            content=content,
-            cc=cc_email,
-            bcc=bcc_email,
+    def deliver_queued_email(self, future: Future, queued_email: QueuedEmail) -> None:
+        if queued_email.time_budget.exhausted():
+            future.set_result(HTTPStatus.REQUEST_TIMEOUT)
+            return
+
+        status = self.deliver_email(
+            queued_email.email_body,
+            content=queued_email.content,
+            attachments=queued_email.attachments,
+            timeout=queued_email.time_budget.message_timeout(),
+            sender_shard=queued_email.sender_shard,
         )
+        if status == HTTPStatus.OK and queued_email.email_body.eventId:
+            self.registration_stage.put(future, queued_email)
+            return
+
+        future.set_result(status)
 
-        smtp_service_daily_free_tier_limit = 100
-        email_len = 1
+    def update_queued_registration(self, future: Future, queued_email: QueuedEmail) -> None:
+        with metrics.timer(MetricName.REGISTRATION_UPDATE.value):
+            self.update_db_success_sent(queued_email.email_body)
+        future.set_result(HTTPStatus.OK)
 
-        # Calculate the number of emails to send
-        status, email_tracker, _ = self.email_tracker_repository.query_email_tracker()
+    def send_email(self, email_body: EmailRecord, timeout: float = CommonConstants.SMTP_TIMEOUT_SECONDS) -> HTTPStatus:
+        """
+        Send one email, running the pipeline stages in sequence on the calling thread.
+        """
+        status, content, attachments = self.render_email(email_body)
         if status != HTTPStatus.OK:
-            event_update = EmailTrackerIn(
-                lastEmailSent=self.datetime_now,
-                dailyEmailCount=0,
-            )
-            (
-                _,
-                email_tracker,
-                _,
-            ) = self.email_tracker_repository.create_update_email_tracker(
-                email_tracker_in=event_update,
-            )
+            return status
+
+        status = self.deliver_email(email_body, content=content, attachments=attachments, timeout=timeout)
+        if status == HTTPStatus.OK and email_body.eventId:
+            with metrics.timer(MetricName.REGISTRATION_UPDATE.value):
+                self.update_db_success_sent(email_body)
+        return status
+
+    def render_email(self, email_body: EmailRecord) -> Tuple[HTTPStatus, str, List[EncodedAttachment]]:
+        """
+        Render the template of an email and load its attachments.
+
+        Args:
+            email_body (EmailRecord): The email.
+
+        Returns:
+            Tuple[HTTPStatus, str, List[EncodedAttachment]]: A tuple containing HTTP status, the rendered
+            content, and the encoded attachments. An email with unavailable attachments is recorded in the
+            delivery ledger and is not sent.
+        """
+        j2 = jinja2.Environment()
+        frontend_url = os.getenv('FRONTEND_URL')
 
-        # Check free tier limit refresh time
-        last_email_sent = parse(email_tracker.lastEmailSent)
-        if last_email_sent.tzinfo is None:
-            last_email_sent = last_email_sent.replace(tzinfo=timezone.utc)
+        with metrics.timer(MetricName.TEMPLATE_RENDER.value):
+            htmlTemplate = j2.from_string(email_body.content)
+            content = htmlTemplate.render(
+                frontend_url=frontend_url,
+                salutation=email_body.salutation,
+                body=email_body.body,
+                regards=email_body.regards,
+            )
 
-        one_day_passed = (self.datetime_now - last_email_sent).days >= 1
+        status, attachments, message = self.attachment_usecase.get_attachments(email_body.attachments)
+        if status != HTTPStatus.OK:
+            logger.error('Skipping email with unavailable attachments: %s', message, category='attachment')
+            status = HTTPStatus.BAD_REQUEST if status in (HTTPStatus.BAD_REQUEST, HTTPStatus.NOT_FOUND) else status
+            self.delivery_ledger_usecase.record(email_body, status)
+            return status, '', []
 
-        # Check emails sent
-        curent_daily_email_count = 0 if one_day_passed else email_tracker.dailyEmailCount
-        total_email_count = curent_daily_email_count + email_len
-        use_backup_smtp = total_email_count > smtp_service_daily_free_tier_limit
+        return HTTPStatus.OK, content, attachments
 
-        # Update daily email count
-        if one_day_passed:
-            event_update = EmailTrackerIn(
-                lastEmailSent=self.datetime_now,
-                dailyEmailCount=email_len,
-            )
-            self.email_tracker_repository.create_update_email_tracker(
-                email_tracker_entry=email_tracker,
-                email_tracker_in=event_update,
-            )
+    def deliver_email(
+        self,
+        email_body: EmailRecord,
+        content: str,
+        attachments: Sequence[EncodedAttachment],
+        timeout: float = CommonConstants.SMTP_TIMEOUT_SECONDS,
+        sender_shard: Optional[SenderShard] = None,
+    ) -> HTTPStatus:
+        """
+        Pick the sender shard and providers of a rendered email, build its message and send it, failing over
+        to the next provider while circuits allow it.
+
+        Args:
+            email_body (EmailRecord): The email.
+            content (str): The rendered content.
+            attachments (Sequence[EncodedAttachment]): The encoded attachments.
+            timeout (float): The maximum number of seconds to wait for rate limits, for a send slot and for
+                each send.
+            sender_shard (SenderShard, optional): The shard the email was already counted against, within its
+                primary quota, by the send window.
+
+        Returns:
+            HTTPStatus: The send status of the email. TOO_MANY_REQUESTS when no send slot was free in time.
+        """
+        to_email = email_body.to
 
+        # Bulk mail is rate limited and leaves part of the SES quota to transactional mail
+        quota_reserve = 0
+        if LaneScheduler.get_email_lane(email_body.emailType) == EmailLane.BULK:
+            if not self.bulk_rate_limiter.acquire(timeout=timeout):
+                return HTTPStatus.REQUEST_TIMEOUT
+            quota_reserve = self.transactional_quota_reserve
+
+        with metrics.timer(MetricName.QUOTA_CHECK.value):
+            if sender_shard is None:
+                sender_shard, total_email_count = self.reserve_sender_shard(email_body, quota_reserve, timeout)
+            elif sender_shard.rate_limiter.acquire(timeout=timeout):
+                # The send window counted the email within the primary quota of the shard
+                total_email_count = sender_shard.daily_free_tier_limit - quota_reserve
+            else:
+                sender_shard = None
+        if sender_shard is None:
+            return HTTPStatus.REQUEST_TIMEOUT
+
+        # Providers allowed within quota limits, most preferred first
+        if total_email_count > sender_shard.daily_free_tier_limit - quota_reserve:
+            providers = [EmailProvider.SENDGRID]
+            if total_email_count <= sender_shard.daily_send_quota - quota_reserve:
+                providers.append(EmailProvider.SES)
         else:
-            self.email_tracker_repository.append_email_sent_count(email_tracker_entry=email_tracker)
+            providers = [EmailProvider.SES, EmailProvider.SENDGRID]
 
-        # Send emails
-        if use_backup_smtp:
-            logger.info('Using SendGrid as secondary SMTP')
-            self.send_sendgrid_email(
-                msg=msg,
-                email_from=email_from,
+        email_from = sender_shard.email_from
+        with metrics.timer(MetricName.MIME_BUILD.value):
+            msg = self.create_email(
+                sender_email=email_from,
                 to_email=to_email,
-                email_body=email_body,
+                subject=email_body.subject,
+                content=content,
+                cc=email_body.cc,
+                bcc=email_body.bcc,
             )
-
-        else:
-            logger.info('Using AWS SES as primary SMTP')
-            self.send_ses_email(
-                msg=msg,
+        with metrics.timer(MetricName.MIME_SERIALIZE.value):
+            msg_bytes = self.serialize_email(msg, attachments)
+
+        # Send emails, failing over to the next provider while circuits allow it
+        status = HTTPStatus.SERVICE_UNAVAILABLE
+        provider = None
+        total_latency = 0.0
+        attempts = 0
+        while providers:
+            # Wait for a send slot first, so a send that never starts holds no breaker permit
+            acquired_at = self.concurrency_limiter.acquire(timeout=timeout)
+            if acquired_at is None:
+                logger.warning('Timed out waiting for a send slot', category='concurrency')
+                status = HTTPStatus.TOO_MANY_REQUESTS
+                break
+
+            provider, is_permitted = self.provider_router.select_provider(providers)
+            start_time = time.perf_counter()
+            status = self.email_senders[provider](
+                msg_bytes=msg_bytes,
                 email_from=email_from,
                 to_email=to_email,
                 email_body=email_body,
+                sender_shard=sender_shard,
+                timeout=timeout,
             )
-            
+            latency = time.perf_counter() - start_time
+            total_latency += latency
+            attempts += 1
+            self.concurrency_limiter.release(acquired_at, latency, status)
+            self.provider_router.record_result(provider, latency, status, is_permitted=is_permitted)
+            if status in (HTTPStatus.OK, HTTPStatus.BAD_REQUEST):
+                break
+
+            providers.remove(provider)
+
+        self.delivery_ledger_usecase.record(
+            email_body,
+            status,
+            provider=provider,
+            latency=total_latency if attempts else None,
+            attempts=attempts,
+            sender_shard_id=sender_shard.shard_id,
+        )
+        return status
+
+    def reserve_sender_shard(
+        self, email_body: EmailRecord, quota_reserve: int, timeout: float
+    ) -> Tuple[Optional[SenderShard], int]:
+        """
+        Pick the sender shard of an email and count the email against its daily quota.
+
+        Shards are tried in the order of the sender pool. A shard is passed over when it is out of primary quota,
+        or when its send rate limit has no token left and a later shard may have one. A shard passed over for
+        quota gets its count and rate token back, so the email is counted and rate limited on one shard only.
+        When every shard is over its primary quota, the email stays on the first over-quota shard that was
+        tried, which may still send it through SendGrid or within its SES send quota.
+
+        Args:
+            email_body (EmailRecord): The email.
+            quota_reserve (int): The part of the primary quota left to transactional mail.
+            timeout (float): The maximum number of seconds to wait for a send rate token.
+
+        Returns:
+            Tuple[Optional[SenderShard], int]: The shard, or None if no shard could send within the timeout, and
+            the daily email count of the shard including this email.
+        """
+        sender_shards = self.sender_pool.get_shards(email_body, quota_reserve)
+        candidates = [sender_shard for sender_shard in sender_shards if sender_shard.has_quota(quota_reserve)]
+        over_quota = None
+        for index, sender_shard in enumerate(candidates):
+            if sender_shard.rate_limiter.try_acquire() > 0:
+                # Wait for a token only on the last shard, the others hand the email on
+                if index < len(candidates) - 1 or not sender_shard.rate_limiter.acquire(timeout=timeout):
+                    continue
+
+            _, total_email_count = self.reserve_email_quota(email_len=1, sender_shard=sender_shard)
+            if total_email_count <= sender_shard.daily_free_tier_limit - quota_reserve:
+                if over_quota:
+                    self.release_email_quota(over_quota[0])
+                return sender_shard, total_email_count
+
+            logger.info('Sender shard %s is out of quota', sender_shard.shard_id, category='sender_pool')
+            if over_quota:
+                self.release_email_quota(sender_shard)
+            else:
+                over_quota = (sender_shard, total_email_count)
+
+        if over_quota:
+            return over_quota
+
+        if candidates or not sender_shards[0].rate_limiter.acquire(timeout=timeout):
+            return None, 0
+
+        _, total_email_count = self.reserve_email_quota(email_len=1, sender_shard=sender_shards[0])
+        return sender_shards[0], total_email_count
+
+    def release_email_quota(self, sender_shard: SenderShard) -> None:
+        """
+        Give back the email counted against a sender shard by reserve_email_quota, and its send rate token, when
+        the email is sent through another shard.
+
+        The count the shard keeps is left as is: it was over its primary quota, and still is after the email is
+        taken off.
+
+        Args:
+            sender_shard (SenderShard): The sender shard passed over.
+        """
+        sender_shard.rate_limiter.release()
+        sender_shard.uncount_emails(1)
+
+    def reserve_email_quota(self, email_len: int, sender_shard: SenderShard) -> Tuple[bool, int]:
+        """
+        Count emails against the daily free tier of the primary SMTP service of a sender shard.
+
+        Args:
+            email_len (int): The number of emails about to be sent.
+            sender_shard (SenderShard): The sender shard sending the emails.
+
+        Returns:
+            Tuple[bool, int]: Whether the backup SMTP service should be used, and the daily email count
+            including these emails.
+        """
+        total_email_count = sender_shard.count_emails(email_len)
+        return total_email_count > sender_shard.daily_free_tier_limit, total_email_count
 
     def send_sendgrid_email(
         self,
-        msg: MIMEMultipart,
+        msg_bytes: bytes,
         email_from: str,
-        to_email: List[str],
-        email_body: EmailIn,
-    ):
-        try:
-            with smtplib.SMTP(self.sendgrid_smtp_host, 587) as server:
-                server.starttls()
-                server.login('apikey', self.sendgrid_api_key)
-
-                # Create list of all recipients (to, cc, bcc) for actual delivery
-                all_recipients = to_email.copy()
-                if email_body.cc:
-                    all_recipients.extend(email_body.cc)
-                if email_body.bcc:
-                    all_recipients.extend(email_body.bcc)
-
-                # Remove duplicates while preserving order
-                all_recipients = list(dict.fromkeys(all_recipients))
-
-                server.sendmail(email_from, all_recipients, msg.as_string())
-                if email_body.eventId:
-                    self.update_db_success_sent(email_body)
-
-                message = f'Email sent successfully to {to_email} (and CC/BCC recipients) via SendGrid!'
-                logger.info(message)
-
-                server.close()
-
-        except Exception as e:
-            message = f'An error occurred while sending the email: {e}'
-            logger.error(message)
+        to_email: Sequence[str],
+        email_body: EmailRecord,
+        sender_shard: SenderShard,
+        timeout: float = CommonConstants.SMTP_TIMEOUT_SECONDS,
+    ) -> HTTPStatus:
+        logger.info('Using SendGrid as secondary SMTP', category='smtp')
+        return self.send_smtp_email(
+            smtp_host=self.sendgrid_smtp_host,
+            smtp_port=self.smtp_port,
+            smtp_username='apikey',
+            smtp_password=self.sendgrid_api_key,
+            provider_name='SendGrid',
+            msg_bytes=msg_bytes,
+            email_from=email_from,
+            to_email=to_email,
+            email_body=email_body,
+            timeout=timeout,
+        )
 
     def send_ses_email(
         self,
-        msg: MIMEMultipart,
+        msg_bytes: bytes,
         email_from: str,
-        to_email: List[str],
-        email_body: EmailIn,
-    ):
-        try:
-            with smtplib.SMTP(self.ses_smtp_host, 587) as server:
-                server.starttls()
-                server.login(self.ses_smtp_username, self.ses_smtp_password)
-
-                # Create list of all recipients (to, cc, bcc) for actual delivery
-                all_recipients = to_email.copy()
-                if email_body.cc:
-                    all_recipients.extend(email_body.cc)
-                if email_body.bcc:
-                    all_recipients.extend(email_body.bcc)
+        to_email: Sequence[str],
+        email_body: EmailRecord,
+        sender_shard: SenderShard,
+        timeout: float = CommonConstants.SMTP_TIMEOUT_SECONDS,
+    ) -> HTTPStatus:
+        logger.info('Using AWS SES as primary SMTP through sender shard %s', sender_shard.shard_id, category='smtp')
+        return self.send_smtp_email(
+            smtp_host=sender_shard.smtp_host,
+            smtp_port=sender_shard.smtp_port,
+            smtp_username=sender_shard.smtp_username,
+            smtp_password=sender_shard.smtp_password,
+            provider_name='AWS SES',
+            msg_bytes=msg_bytes,
+            email_from=email_from,
+            to_email=to_email,
+            email_body=email_body,
+            timeout=timeout,
+        )
 
-                # Remove duplicates while preserving order
-                all_recipients = list(dict.fromkeys(all_recipients))
+    def get_smtp_pool(
+        self, smtp_host: str, smtp_port: int, smtp_username: str, smtp_password: str
+    ) -> SmtpConnectionPool:
+        with self.smtp_pools_lock:
+            smtp_pool = self.smtp_pools.get((smtp_host, smtp_port, smtp_username))
+            if smtp_pool is None:
+                smtp_pool = SmtpConnectionPool(
+                    host=smtp_host,
+                    port=smtp_port,
+                    username=smtp_username,
+                    password=smtp_password,
+                    max_idle=self.concurrency_limiter.max_limit,
+                    max_idle_seconds=float(
+                        os.getenv('SMTP_POOL_MAX_IDLE_SECONDS', CommonConstants.SMTP_POOL_MAX_IDLE_SECONDS)
+                    ),
+                    max_messages=int(os.getenv('SMTP_POOL_MAX_MESSAGES', CommonConstants.SMTP_POOL_MAX_MESSAGES)),
+                )
+                self.smtp_pools[(smtp_host, smtp_port, smtp_username)] = smtp_pool
+
+            return smtp_pool
+
+    def close_smtp_pools(self) -> None:
+        with self.smtp_pools_lock:
+            smtp_pools, self.smtp_pools = list(self.smtp_pools.values()), {}
+
+        for smtp_pool in smtp_pools:
+            smtp_pool.close()
+
+    def send_smtp_email(
+        self,
+        smtp_host: str,
+        smtp_port: int,
+        smtp_username: str,
+        smtp_password: str,
+        provider_name: str,
+        msg_bytes: bytes,
+        email_from: str,
+        to_email: Sequence[str],
+        email_body: EmailRecord,
+        timeout: float = CommonConstants.SMTP_TIMEOUT_SECONDS,
+    ) -> HTTPStatus:
+        """
+        Deliver a message through an SMTP provider, over a pooled connection.
+
+        Returns:
+            HTTPStatus: OK if the email was sent, BAD_REQUEST if the recipients were permanently rejected,
+            TOO_MANY_REQUESTS if the provider throttled the send, GATEWAY_TIMEOUT on timeouts and
+            SERVICE_UNAVAILABLE on any other provider error.
+        """
+        smtp_pool = self.get_smtp_pool(smtp_host, smtp_port, smtp_username, smtp_password)
+        try:
+            with smtp_pool.connection(timeout=timeout) as server:
+                with metrics.timer(MetricName.SMTP_DATA.value):
+                    server.sendmail(email_from, email_body.recipients, msg_bytes)
+
+            logger.info(
+                'Email sent successfully to %s (and CC/BCC recipients) via %s!',
+                to_email,
+                provider_name,
+                category='smtp',
+            )
 
-                server.sendmail(email_from, all_recipients, msg.as_string())
-                if email_body.eventId:
-                    self.update_db_success_sent(email_body)
+        except smtplib.SMTPRecipientsRefused as e:
+            smtp_codes = [code for code, _ in e.recipients.values()]
+            logger.error('Recipients refused by %s: %s', provider_name, e, category='smtp')
+            if any(code in CommonConstants.SMTP_THROTTLING_CODES for code in smtp_codes):
+                return HTTPStatus.TOO_MANY_REQUESTS
+            return HTTPStatus.BAD_REQUEST
 
-                message = f'Email sent successfully to {to_email} (and CC/BCC recipients) via AWS SES!'
-                logger.info(message)
+        except smtplib.SMTPResponseException as e:
+            logger.error('An error occurred while sending the email via %s: %s', provider_name, e, category='smtp')
+            if e.smtp_code in CommonConstants.SMTP_THROTTLING_CODES:
+                return HTTPStatus.TOO_MANY_REQUESTS
+            return HTTPStatus.SERVICE_UNAVAILABLE
 
-                server.close()
+        except (socket.timeout, TimeoutError) as e:
+            logger.error('Timed out while sending the email via %s: %s', provider_name, e, category='smtp')
+            return HTTPStatus.GATEWAY_TIMEOUT
 
         except Exception as e:
-            message = f'An error occurred while sending the email: {e}'
-            logger.error(message)
+            logger.error('An error occurred while sending the email: %s', e, category='smtp')
+            return HTTPStatus.SERVICE_UNAVAILABLE
+
+        return HTTPStatus.OK
+
+    def update_db_success_sent(self, email_body: EmailRecord):
+        """
+        Set the sent flag of the email type on the registration of the recipient.
+
+        Emails that carry their registrationId are updated by key with one conditional write. Legacy payloads
+        without it fall back to looking the registrations up by the first recipient through the email LSI.
+
+        Args:
+            email_body (EmailRecord): The sent email.
+        """
+        registration_update_map = {
+            EmailType.REGISTRATION_EMAIL.value: RegistrationIn(registrationEmailSent=True),
+            EmailType.CONFIRMATION_EMAIL.value: RegistrationIn(confirmationEmailSent=True),
+            EmailType.EVALUATION_EMAIL.value: RegistrationIn(evaluationEmailSent=True),
+        }
+        update_obj = registration_update_map.get(email_body.emailType)
+        if not update_obj:
+            return
 
-    def update_db_success_sent(self, email_body: EmailIn):
         try:
+            if email_body.registrationId:
+                status, message = self.registrations_repository.update_registration_with_key(
+                    event_id=email_body.eventId,
+                    registration_id=email_body.registrationId,
+                    registration_in=update_obj,
+                )
+                if status != HTTPStatus.OK:
+                    logger.error(message, category='repository')
+                return
+
             (
                 status,
                 registrations,
@@ -231,34 +659,27 @@ class EmailUsecase:
                 email=email_body.to[0],
             )
             if status != HTTPStatus.OK:
-                logger.error(message)
+                logger.error(message, category='repository')
                 return
 
-            registration_update_map = {
-                EmailType.REGISTRATION_EMAIL.value: RegistrationIn(registrationEmailSent=True),
-                EmailType.CONFIRMATION_EMAIL.value: RegistrationIn(confirmationEmailSent=True),
-                EmailType.EVALUATION_EMAIL.value: RegistrationIn(evaluationEmailSent=True),
-            }
-            if update_obj := registration_update_map.get(email_body.emailType):
-                for registration in registrations:
-                    if not registration:
-                        continue
-
-                    (
-                        status,
-                        _,
-                        message,
-                    ) = self.registrations_repository.update_registration(
-                        registration_entry=registration,
-                        registration_in=update_obj,
-                    )
-                    if status != HTTPStatus.OK:
-                        logger.error(message)
-                        return
-
-                    logger.info(f'[{registration.registrationId}]: Update Registration successful')
+            for registration in registrations:
+                if not registration:
+                    continue
+
+                (
+                    status,
+                    _,
+                    message,
+                ) = self.registrations_repository.update_registration(
+                    registration_entry=registration,
+                    registration_in=update_obj,
+                )
+                if status != HTTPStatus.OK:
+                    logger.error(message, category='repository')
+                    return
+
+                logger.info('[%s]: Update Registration successful', registration.registrationId, category='repository')
 
         except Exception as e:
-            message = f'An error occurred while updating the database: {e}'
-            logger.error(message)
+            logger.error('An error occurred while updating the database: %s', e, category='repository')
             return
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+from http import HTTPStatus
+from typing import List, Set
+
+from constants.common_constants import CommonConstants
+from repository.email_idempotency_repository import EmailIdempotencyRepository
+from utils.lru_cache import LRUCache
+
+
+class IdempotencyUsecase:
+    """
+    Keeps track of delivered emails so redelivered SQS messages do not send them again.
+
+    Keys are checked against an in-memory LRU first, which serves warm invocations, and the misses are looked
+    up in DynamoDB with a single bulk read.
+    """
+
+    def __init__(self):
+        self.email_idempotency_repository = EmailIdempotencyRepository()
+        self.delivered_cache = LRUCache(
+            max_size=int(os.getenv('IDEMPOTENCY_CACHE_SIZE', CommonConstants.IDEMPOTENCY_CACHE_SIZE))
+        )
+
+    @staticmethod
+    def get_idempotency_key(message_id: str, message: dict) -> str:
+        """
+        Build the idempotency key of an email from its SQS message ID and a hash of its content.
+
+        Args:
+            message_id (str): The SQS message ID of the record holding the email.
+            message (dict): The email payload as sent by the producer.
+
+        Returns:
+            str: The idempotency key.
+        """
+        content = json.dumps(message, sort_keys=True, separators=(',', ':'), default=str)
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return f'{message_id}#{content_hash}'
+
+    def get_delivered_keys(self, idempotency_keys: List[str]) -> Set[str]:
+        """
+        Get the idempotency keys that were already delivered.
+
+        If the lookup fails the emails are treated as not delivered, so they are sent rather than dropped.
+
+        Args:
+            idempotency_keys (List[str]): The idempotency keys to check.
+
+        Returns:
+            Set[str]: The delivered keys.
+        """
+        delivered_keys = {key for key in idempotency_keys if key in self.delivered_cache}
+        missing_keys = [key for key in idempotency_keys if key not in delivered_keys]
+        if not missing_keys:
+            return delivered_keys
+
+        status, stored_keys, _ = self.email_idempotency_repository.query_delivered_keys(missing_keys)
+        if status != HTTPStatus.OK:
+            return delivered_keys
+
+        for key in stored_keys:
+            self.delivered_cache.put(key)
+
+        return delivered_keys | stored_keys
+
+    def mark_delivered(self, idempotency_keys: List[str]) -> None:
+        if not idempotency_keys:
+            return
+
+        for key in idempotency_keys:
+            self.delivered_cache.put(key)
+
+        self.email_idempotency_repository.store_delivered_keys(idempotency_keys)
@@ -0,0 +1,88 @@
+import os
+from typing import Dict, List
+
+from constants.common_constants import CommonConstants, EmailLane, EmailType
+
+EMAIL_TYPE_LANES = {
+    EmailType.REGISTRATION_EMAIL: EmailLane.TRANSACTIONAL,
+    EmailType.PREREGISTRATION_EMAIL: EmailLane.TRANSACTIONAL,
+    EmailType.CONFIRMATION_EMAIL: EmailLane.TRANSACTIONAL,
+    EmailType.EVENT_CREATION_EMAIL: EmailLane.TRANSACTIONAL,
+    EmailType.ADMIN_INVITATION_EMAIL: EmailLane.TRANSACTIONAL,
+    EmailType.EVALUATION_EMAIL: EmailLane.BULK,
+}
+
+
+class LaneScheduler:
+    """
+    Orders the records of a batch so transactional mail is not stuck behind bulk blasts.
+
+    Producers put the lane of an email type in front of the FIFO MessageGroupId (see get_message_group_id), or
+    in an emailLane message attribute. Records without a lane are treated as transactional. The batch is then
+    interleaved by weighted round robin, taking up to weight records from each lane in priority order. Records
+    of one message group always share a lane, so their FIFO order is kept.
+
+    Attributes:
+        weights (Dict[EmailLane, int]): The number of records taken from each lane per round.
+    """
+
+    def __init__(self, weights: Dict[EmailLane, int] = None) -> None:
+        self.weights = weights or {
+            EmailLane.TRANSACTIONAL: int(
+                os.getenv('TRANSACTIONAL_LANE_WEIGHT', CommonConstants.TRANSACTIONAL_LANE_WEIGHT)
+            ),
+            EmailLane.BULK: int(os.getenv('BULK_LANE_WEIGHT', CommonConstants.BULK_LANE_WEIGHT)),
+        }
+
+    @staticmethod
+    def get_email_lane(email_type: EmailType) -> EmailLane:
+        return EMAIL_TYPE_LANES.get(EmailType(email_type), EmailLane.TRANSACTIONAL)
+
+    @staticmethod
+    def get_message_group_id(email_type: EmailType, group_key: str) -> str:
+        """
+        Build the FIFO MessageGroupId of an email, for producers.
+
+        Args:
+            email_type (EmailType): The type of the email.
+            group_key (str): What the order is kept within, e.g. the event ID.
+
+        Returns:
+            str: The message group ID.
+        """
+        return f'{LaneScheduler.get_email_lane(email_type).value}#{group_key}'
+
+    @staticmethod
+    def get_record_lane(record: dict) -> EmailLane:
+        lane_attribute = record.get('messageAttributes', {}).get('emailLane', {}).get('stringValue')
+        message_group_id = record.get('attributes', {}).get('MessageGroupId', '')
+        lane_value = lane_attribute or message_group_id.split('#', 1)[0]
+        try:
+            return EmailLane(lane_value)
+        except ValueError:
+            return EmailLane.TRANSACTIONAL
+
+    def order_records(self, records: List[dict]) -> List[dict]:
+        """
+        Order the records of a batch by weighted round robin over their lanes.
+
+        Args:
+            records (List[dict]): The SQS records, in delivery order.
+
+        Returns:
+            List[dict]: The records in processing order.
+        """
+        lanes = {lane: [] for lane in EmailLane}
+        for record in records:
+            lanes[self.get_record_lane(record)].append(record)
+
+        ordered_records = []
+        positions = dict.fromkeys(lanes, 0)
+        while len(ordered_records) < len(records):
+            for lane in EmailLane:
+                weight = max(self.weights.get(lane, 1), 1)
+                taken = lanes[lane][positions[lane] : positions[lane] + weight]
+                positions[lane] += len(taken)
+                ordered_records.extend(taken)
+
+        return ordered_records
@@ -0,0 +1,110 @@
+import binascii
+import gzip
+import itertools
+import os
+import zlib
+from http import HTTPStatus
+from typing import Iterator, List, Tuple, Union
+
+from botocore.exceptions import BotoCoreError
+
+from constants.common_constants import CommonConstants
+from repository.object_repository import ObjectRepository
+from utils.envelope import RecordEnvelope
+
+# What a malformed envelope raises while it is decoded: bad JSON or base64 (ValueError), missing fields
+# (KeyError), fields of the wrong type (TypeError, AttributeError) and bad or truncated gzip data
+ENVELOPE_ERRORS = (ValueError, KeyError, TypeError, AttributeError, binascii.Error, OSError, EOFError, zlib.error)
+
+
+class PayloadUsecase:
+    """
+    Turns SQS record bodies into email payloads, following claim-checks to S3.
+
+    A claim-check record only holds the bucket and key of an NDJSON envelope object, so a campaign of any size
+    is one queue message plus one object fetch. The object is streamed with a bounded read buffer. Emails of
+    inline and claim-check envelopes alike are handed out in chunks of message_chunk_size as they are decoded,
+    so the decoded emails held in memory stay bounded by a chunk rather than the whole envelope.
+
+    Attributes:
+        payload_bucket (str): The default bucket of claim-check objects.
+        read_chunk_size (int): The number of bytes read from an object at a time.
+        message_chunk_size (int): The number of email payloads handed out at a time.
+    """
+
+    def __init__(self):
+        self.object_repository = ObjectRepository()
+        self.payload_bucket = os.getenv('EMAIL_PAYLOAD_BUCKET')
+        self.read_chunk_size = int(os.getenv('ENVELOPE_READ_CHUNK_BYTES', CommonConstants.ENVELOPE_READ_CHUNK_BYTES))
+        self.message_chunk_size = int(
+            os.getenv('ENVELOPE_MESSAGE_CHUNK_SIZE', CommonConstants.ENVELOPE_MESSAGE_CHUNK_SIZE)
+        )
+
+    def get_message_chunks(self, payload: Union[list, dict]) -> Iterator[Tuple[HTTPStatus, List[dict], str]]:
+        """
+        Get the email payloads of a parsed record body, in chunks.
+
+        Args:
+            payload (Union[list, dict]): The parsed record body.
+
+        Returns:
+            Iterator[Tuple[HTTPStatus, List[dict], str]]: A tuple containing HTTP status, the next chunk of email
+            payloads, and an optional error message. An error ends the iteration, possibly after some chunks:
+            BAD_REQUEST when the envelope is malformed, and NOT_FOUND or FORBIDDEN when the claim-check object
+            cannot be read, which retrying will not fix. Close the iterator when stopping early.
+        """
+        claim_check = payload.get('claimCheck') if isinstance(payload, dict) else None
+        if not claim_check:
+            yield from self.iter_chunks(RecordEnvelope.decode_payload(payload))
+            return
+
+        if not isinstance(claim_check, dict) or not claim_check.get('key'):
+            yield HTTPStatus.BAD_REQUEST, [], f'Invalid claim check: {claim_check!r}'
+            return
+
+        bucket = claim_check.get('bucket') or self.payload_bucket
+        key = claim_check['key']
+        status, response, message = self.object_repository.get_object(bucket=bucket, key=key)
+        if status != HTTPStatus.OK:
+            yield status, [], message
+            return
+
+        object_body = response['Body']
+        stream = object_body
+        content_encodings = [encoding.strip() for encoding in (response.get('ContentEncoding') or '').split(',')]
+        if 'gzip' in content_encodings or key.endswith('.gz'):
+            stream = gzip.GzipFile(fileobj=object_body)
+
+        try:
+            messages = RecordEnvelope.decode_stream(stream, self.read_chunk_size)
+            yield from self.iter_chunks(messages, source=f's3://{bucket}/{key}')
+        finally:
+            object_body.close()
+
+    def iter_chunks(self, messages: Iterator[dict], source: str = None) -> Iterator[Tuple[HTTPStatus, List[dict], str]]:
+        """
+        Hand out decoded email payloads in chunks of message_chunk_size, decoding each chunk only when it is needed.
+
+        Args:
+            messages (Iterator[dict]): The lazily decoded email payloads.
+            source (str, optional): Where the payloads are read from, for error messages.
+
+        Returns:
+            Iterator[Tuple[HTTPStatus, List[dict], str]]: The chunks, as returned by get_message_chunks.
+        """
+        location = f' in {source}' if source else ''
+        while True:
+            try:
+                chunk = list(itertools.islice(messages, self.message_chunk_size))
+            except BotoCoreError as e:
+                # Checked first, as some read timeouts are also OSErrors
+                yield HTTPStatus.INTERNAL_SERVER_ERROR, [], f'Failed to read {source}: {e!r}'
+                return
+            except ENVELOPE_ERRORS as e:
+                yield HTTPStatus.BAD_REQUEST, [], f'Invalid envelope{location}: {e!r}'
+                return
+
+            if not chunk:
+                return
+
+            yield HTTPStatus.OK, chunk, None
@@ -0,0 +1,246 @@
+import threading
+import time
+from collections import deque
+from http import HTTPStatus
+from typing import Deque, Dict, List, NamedTuple, Tuple
+
+from constants.common_constants import CircuitState, EmailProvider
+from utils.logger import logger
+
+
+class CallOutcome(NamedTuple):
+    timestamp: float
+    latency: float
+    healthy: bool
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker that tracks the rolling latency and error rate of a single email provider.
+
+    The breaker opens when the share of unhealthy calls (failures and slow calls) in the rolling window
+    reaches the failure rate threshold, or immediately when the provider throttles us. Once the cooldown
+    has elapsed it half-opens and lets a limited number of probe sends through: the breaker closes when
+    every probe succeeds and opens again as soon as one fails.
+
+    Attributes:
+        provider (EmailProvider): The provider guarded by this breaker.
+        state (CircuitState): The current state of the breaker.
+    """
+
+    def __init__(
+        self,
+        provider: EmailProvider,
+        window_seconds: float = 60.0,
+        minimum_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        clock=time.monotonic,
+    ) -> None:
+        self.provider = provider
+        self.window_seconds = window_seconds
+        self.minimum_calls = minimum_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+
+        self.state = CircuitState.CLOSED
+        self.outcomes: Deque[CallOutcome] = deque()
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        self.lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check if a send may go through this provider, reserving a probe slot when half-open.
+
+        Returns:
+            bool: True if the provider can be used for the next send.
+        """
+        with self.lock:
+            if self.state == CircuitState.OPEN:
+                if self.clock() - self.opened_at < self.open_seconds:
+                    return False
+
+                self._transition(CircuitState.HALF_OPEN)
+
+            if self.state == CircuitState.HALF_OPEN:
+                if self.probes_in_flight >= self.half_open_probes:
+                    return False
+
+                self.probes_in_flight += 1
+
+            return True
+
+    def record_success(self, latency: float) -> None:
+        """
+        Record a completed send.
+
+        Args:
+            latency (float): The send latency in seconds. Sends slower than slow_call_seconds count as unhealthy.
+        """
+        healthy = latency <= self.slow_call_seconds
+        with self.lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self.probes_in_flight = max(self.probes_in_flight - 1, 0)
+                if not healthy:
+                    self._transition(CircuitState.OPEN)
+                    return
+
+                self.probe_successes += 1
+                if self.probe_successes >= self.half_open_probes:
+                    self._transition(CircuitState.CLOSED)
+                return
+
+            self._append(CallOutcome(self.clock(), latency, healthy))
+            self._evaluate()
+
+    def record_failure(self, latency: float, throttled: bool = False) -> None:
+        """
+        Record a failed send.
+
+        Args:
+            latency (float): The time spent on the failed send in seconds.
+            throttled (bool): True if the provider rejected the send with a throttling reply.
+        """
+        with self.lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self.probes_in_flight = max(self.probes_in_flight - 1, 0)
+                self._transition(CircuitState.OPEN)
+                return
+
+            self._append(CallOutcome(self.clock(), latency, False))
+            if throttled:
+                self._transition(CircuitState.OPEN)
+                return
+
+            self._evaluate()
+
+    def stats(self) -> dict:
+        """
+        Summarize the rolling window of the breaker.
+
+        Returns:
+            dict: The state, call count, failure rate and p99 latency of the provider.
+        """
+        with self.lock:
+            self._prune()
+            latencies = sorted(outcome.latency for outcome in self.outcomes)
+            calls = len(latencies)
+            failures = sum(1 for outcome in self.outcomes if not outcome.healthy)
+
+        p99_latency = latencies[min(int(calls * 0.99), calls - 1)] if calls else 0.0
+        return {
+            'provider': self.provider.value,
+            'state': self.state.value,
+            'calls': calls,
+            'failureRate': failures / calls if calls else 0.0,
+            'p99Latency': p99_latency,
+        }
+
+    def _append(self, outcome: CallOutcome) -> None:
+        self.outcomes.append(outcome)
+        self._prune()
+
+    def _prune(self) -> None:
+        window_start = self.clock() - self.window_seconds
+        while self.outcomes and self.outcomes[0].timestamp < window_start:
+            self.outcomes.popleft()
+
+    def _evaluate(self) -> None:
+        calls = len(self.outcomes)
+        if calls < self.minimum_calls:
+            return
+
+        failures = sum(1 for outcome in self.outcomes if not outcome.healthy)
+        if failures / calls >= self.failure_rate_threshold:
+            self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        if state == self.state:
+            return
+
+        logger.warning(
+            '[%s] Circuit breaker %s -> %s', self.provider.value, self.state.value, state.value, category='router'
+        )
+        self.state = state
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        if state == CircuitState.OPEN:
+            self.opened_at = self.clock()
+        elif state == CircuitState.CLOSED:
+            self.outcomes.clear()
+
+
+class ProviderRouter:
+    """
+    Routes sends across email providers based on their circuit breakers.
+
+    The caller decides which providers are allowed (e.g. within quota limits) in order of preference, and the
+    router picks the first one whose breaker lets the send through. Outcomes are fed back with record_result.
+    When every circuit is open the email is still sent through the most preferred provider, but that send holds
+    no permit from its breaker, so its outcome is not recorded and cannot close or reopen the breaker.
+    Only SES is capped by a daily quota, by the caller. SendGrid has no tracked quota here and is assumed to
+    have room for every email that fails over to it.
+
+    Attributes:
+        breakers (Dict[EmailProvider, CircuitBreaker]): The circuit breaker of each provider.
+    """
+
+    def __init__(self, breakers: Dict[EmailProvider, CircuitBreaker] = None) -> None:
+        self.breakers = breakers or {provider: CircuitBreaker(provider) for provider in EmailProvider}
+
+    def select_provider(self, providers: List[EmailProvider]) -> Tuple[EmailProvider, bool]:
+        """
+        Select the provider to use for the next send.
+
+        Args:
+            providers (List[EmailProvider]): The allowed providers, most preferred first.
+
+        Returns:
+            Tuple[EmailProvider, bool]: The first provider with a closed or probing circuit, and True since its
+            breaker let the send through. If every circuit is open, the most preferred provider and False, so
+            the email is still attempted without a permit.
+        """
+        for provider in providers:
+            if self.breakers[provider].allow_request():
+                if provider != providers[0]:
+                    logger.warning(
+                        '[%s] Circuit open, failing over to %s', providers[0].value, provider.value, category='router'
+                    )
+                return provider, True
+
+        logger.warning(
+            '[%s] All provider circuits are open, sending through preferred provider',
+            providers[0].value,
+            category='router',
+        )
+        return providers[0], False
+
+    def record_result(
+        self, provider: EmailProvider, latency: float, status: HTTPStatus, is_permitted: bool = True
+    ) -> None:
+        """
+        Feed the outcome of a send back to the breaker of the provider.
+
+        Args:
+            provider (EmailProvider): The provider used for the send.
+            latency (float): The send latency in seconds.
+            status (HTTPStatus): The send status. BAD_REQUEST marks a permanent recipient error, which says
+                nothing about the health of the provider.
+            is_permitted (bool): Whether the breaker let the send through. The outcome of a send forced through
+                while every circuit was open is not recorded.
+        """
+        if not is_permitted:
+            return
+
+        breaker = self.breakers[provider]
+        if status in (HTTPStatus.OK, HTTPStatus.BAD_REQUEST):
+            breaker.record_success(latency)
+        else:
+            breaker.record_failure(latency, throttled=status == HTTPStatus.TOO_MANY_REQUESTS)
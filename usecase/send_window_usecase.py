@@ -0,0 +1,288 @@
+import hashlib
+import json
+import math
+import os
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import List, Optional, Tuple, Union
+
+from dateutil.parser import parse
+
+from constants.common_constants import CommonConstants, EmailLane, MetricName
+from model.email.email import EmailIn, ScheduledEmail, ScheduledEmailIn
+from repository.scheduled_email_repository import ScheduledEmailsRepository
+from usecase.lane_scheduler import LaneScheduler
+from usecase.sender_pool import SenderPool, SenderShard
+from usecase.validation_usecase import ValidationUsecase
+from utils.logger import logger
+from utils.metrics import metrics
+
+
+class SendWindowUsecase:
+    """
+    Holds bulk emails that overflow the primary SMTP quota until the next quota window, instead of spilling them
+    to the backup provider.
+
+    The daily count of the primary provider of each sender shard resets one window after the first email of the
+    window. Bulk emails sent now are counted against it up front with an atomic increment of the shard tracker,
+    so concurrent batches cannot all take the same quota left. The ones beyond what is left of it over all shards,
+    minus the transactional reserve, are stored as scheduled emails that become due when the next window opens. The scheduled release then sends due emails at a
+    rate fitted to the quota left, spread over the releases left in the window. Only emails whose sendBefore
+    deadline would pass while they wait are sent right away, spilling to the backup provider when needed.
+
+    Attributes:
+        is_enabled (bool): Whether overflowing bulk emails are deferred at all.
+        transactional_quota_reserve (int): The part of the primary quota of each shard left to transactional mail.
+        window (timedelta): The length of a quota window.
+        release_interval (timedelta): The time between scheduled releases, must match the release schedule.
+        max_release (int): The maximum number of due emails read per release.
+    """
+
+    def __init__(self, sender_pool: SenderPool = None):
+        self.sender_pool = sender_pool or SenderPool()
+        self.scheduled_emails_repository = ScheduledEmailsRepository()
+        self.validation_usecase = ValidationUsecase()
+        self.is_enabled = os.getenv('DEFER_BULK_OVERFLOW', 'true').lower() == 'true'
+        self.transactional_quota_reserve = int(
+            os.getenv('TRANSACTIONAL_QUOTA_RESERVE', CommonConstants.TRANSACTIONAL_QUOTA_RESERVE)
+        )
+        self.window = timedelta(seconds=CommonConstants.SEND_WINDOW_SECONDS)
+        self.release_interval = timedelta(
+            seconds=int(
+                os.getenv('SEND_WINDOW_RELEASE_INTERVAL_SECONDS', CommonConstants.SEND_WINDOW_RELEASE_INTERVAL_SECONDS)
+            )
+        )
+        self.max_release = int(os.getenv('SEND_WINDOW_MAX_RELEASE', CommonConstants.SEND_WINDOW_MAX_RELEASE))
+
+    @staticmethod
+    def get_time(value: Union[datetime, str, None]) -> Optional[datetime]:
+        if not value:
+            return None
+
+        time = value if isinstance(value, datetime) else parse(value)
+        return time if time.tzinfo else time.replace(tzinfo=timezone.utc)
+
+    def get_send_window(self, now: datetime) -> Tuple[datetime, int]:
+        """
+        Get the primary quota bulk mail has left over all sender shards, without counting any email against it.
+
+        Args:
+            now (datetime): The current time.
+
+        Returns:
+            Tuple[datetime, int]: The end of the earliest shard window, when more quota frees up, and the number
+            of emails bulk mail may still send in the current windows.
+        """
+        window_ends = []
+        remaining_quota = 0
+        for sender_shard in self.sender_pool.sender_shards.values():
+            window_start, daily_email_count = now, 0
+            status, email_tracker, _ = sender_shard.email_tracker_repository.query_email_tracker()
+            if status == HTTPStatus.OK and now - self.get_time(email_tracker.lastEmailSent) < self.window:
+                window_start = self.get_time(email_tracker.lastEmailSent)
+                daily_email_count = int(email_tracker.dailyEmailCount or 0)
+
+            window_ends.append(window_start + self.window)
+            primary_quota = sender_shard.daily_free_tier_limit - self.transactional_quota_reserve
+            remaining_quota += max(primary_quota - daily_email_count, 0)
+
+        return min(window_ends, default=now + self.window), remaining_quota
+
+    def reserve_quota(self, sender_shard: SenderShard, email_len: int) -> int:
+        """
+        Count bulk emails against the primary quota of a sender shard, and give back the ones that do not fit.
+
+        Args:
+            sender_shard (SenderShard): The sender shard.
+            email_len (int): The number of bulk emails to count.
+
+        Returns:
+            int: The number of emails that fit, and stay counted against the shard.
+        """
+        total_email_count = sender_shard.count_emails(email_len)
+        primary_quota = sender_shard.daily_free_tier_limit - self.transactional_quota_reserve
+        reserved_len = min(max(primary_quota - (total_email_count - email_len), 0), email_len)
+        if reserved_len < email_len:
+            sender_shard.uncount_emails(email_len - reserved_len)
+
+        return reserved_len
+
+    def reserve_bulk_quota(self, email_bodies: List[EmailIn], bulk_indexes: List[int]) -> List[Optional[SenderShard]]:
+        """
+        Count bulk emails against the primary quota left, on the shard of each email first, then on the other
+        shards with quota left.
+
+        Args:
+            email_bodies (List[EmailIn]): The emails about to be sent.
+            bulk_indexes (List[int]): The indexes of the bulk emails.
+
+        Returns:
+            List[Optional[SenderShard]]: The shard each email is counted against, in the same order, or None if
+            it is not a bulk email or does not fit.
+        """
+        reserved_shards = [None] * len(email_bodies)
+        indexes_by_shard = {}
+        for index in bulk_indexes:
+            sender_shard = self.sender_pool.get_shards(email_bodies[index], self.transactional_quota_reserve)[0]
+            indexes_by_shard.setdefault(sender_shard, []).append(index)
+
+        overflow_indexes = []
+        for sender_shard, indexes in indexes_by_shard.items():
+            reserved_len = self.reserve_quota(sender_shard, len(indexes))
+            for index in indexes[:reserved_len]:
+                reserved_shards[index] = sender_shard
+            overflow_indexes.extend(indexes[reserved_len:])
+
+        overflow_indexes.sort()
+        for sender_shard in self.sender_pool.sender_shards.values():
+            if not overflow_indexes:
+                break
+            if not sender_shard.has_quota(self.transactional_quota_reserve):
+                continue
+
+            reserved_len = self.reserve_quota(sender_shard, len(overflow_indexes))
+            for index in overflow_indexes[:reserved_len]:
+                reserved_shards[index] = sender_shard
+            overflow_indexes = overflow_indexes[reserved_len:]
+
+        return reserved_shards
+
+    def defer_emails(self, email_bodies: List[EmailIn]) -> Tuple[List[bool], List[Optional[SenderShard]]]:
+        """
+        Count the bulk emails that fit in the primary quota left against it, and schedule the others for the
+        next window.
+
+        If scheduling fails, the emails are not deferred and are sent as before.
+
+        Args:
+            email_bodies (List[EmailIn]): The emails about to be sent.
+
+        Returns:
+            Tuple[List[bool], List[Optional[SenderShard]]]: Whether each email was deferred, and the shard each
+            email sent now is already counted against, or None if it is counted when it is sent, in the same
+            order.
+        """
+        deferred = [False] * len(email_bodies)
+        bulk_indexes = [
+            index
+            for index, email_body in enumerate(email_bodies)
+            if LaneScheduler.get_email_lane(email_body.emailType) == EmailLane.BULK
+        ]
+        if not self.is_enabled or not bulk_indexes:
+            return deferred, [None] * len(email_bodies)
+
+        reserved_shards = self.reserve_bulk_quota(email_bodies, bulk_indexes)
+        next_window, _ = self.get_send_window(datetime.now(timezone.utc))
+
+        scheduled_email_ins = []
+        deferred_indexes = []
+        for index in bulk_indexes:
+            if reserved_shards[index]:
+                continue
+
+            email_body = email_bodies[index]
+            send_before = self.get_time(email_body.sendBefore)
+            if send_before and send_before < next_window + self.release_interval:
+                continue
+
+            payload = email_body.model_dump_json(exclude={'content'}, exclude_none=True)
+            scheduled_email_ins.append(
+                ScheduledEmailIn(
+                    scheduledEmailId=hashlib.sha256(payload.encode('utf-8')).hexdigest(),
+                    sendAfter=next_window,
+                    sendBefore=send_before,
+                    emailType=email_body.emailType,
+                    payload=payload,
+                )
+            )
+            deferred_indexes.append(index)
+
+        if not scheduled_email_ins:
+            return deferred, reserved_shards
+
+        status, message = self.scheduled_emails_repository.store_scheduled_emails(scheduled_email_ins)
+        if status != HTTPStatus.OK:
+            logger.error('Sending overflowing bulk emails now: %s', message, category='send_window')
+            return deferred, reserved_shards
+
+        for index in deferred_indexes:
+            deferred[index] = True
+
+        logger.info(
+            'Deferred %s bulk email(s) to %s', len(deferred_indexes), next_window.isoformat(), category='send_window'
+        )
+        metrics.put_metric(MetricName.EMAILS_DEFERRED.value, len(deferred_indexes))
+        return deferred, reserved_shards
+
+    def get_release_batch(self) -> Tuple[List[ScheduledEmail], List[EmailIn]]:
+        """
+        Get the due scheduled emails to send in this release.
+
+        The release takes its share of the primary quota left in the window, plus every email whose deadline
+        would pass before the next release.
+
+        Returns:
+            Tuple[List[ScheduledEmail], List[EmailIn]]: The released scheduled emails and their emails, in the
+            same order.
+        """
+        now = datetime.now(timezone.utc)
+        status, scheduled_emails, _ = self.scheduled_emails_repository.query_due_scheduled_emails(
+            now=now, limit=self.max_release
+        )
+        if status != HTTPStatus.OK or not scheduled_emails:
+            return [], []
+
+        window_end, remaining_quota = self.get_send_window(now)
+        releases_left = max(math.ceil((window_end - now) / self.release_interval), 1)
+        release_quota = math.ceil(remaining_quota / releases_left)
+
+        next_release = now + self.release_interval
+        urgent = []
+        waiting = []
+        for scheduled_email in scheduled_emails:
+            send_before = self.get_time(scheduled_email.sendBefore)
+            if send_before and send_before < next_release:
+                urgent.append(scheduled_email)
+            else:
+                waiting.append(scheduled_email)
+
+        released = urgent + waiting[: max(release_quota - len(urgent), 0)]
+        email_ins, errors = self.validation_usecase.validate_emails(
+            [json.loads(scheduled_email.payload) for scheduled_email in released]
+        )
+        if errors:
+            for index, error in errors:
+                logger.error(
+                    '[%s] Dropping invalid scheduled email: %s', released[index].rangeKey, error, category='send_window'
+                )
+            self.scheduled_emails_repository.delete_scheduled_emails([released[index] for index, _ in errors])
+
+        logger.info(
+            'Releasing %s of %s due email(s), %s urgent, with %s of the primary quota left',
+            len(released) - len(errors),
+            len(scheduled_emails),
+            len(urgent),
+            remaining_quota,
+            category='send_window',
+        )
+        valid = [(scheduled_email, email_in) for scheduled_email, email_in in zip(released, email_ins) if email_in]
+        return [scheduled_email for scheduled_email, _ in valid], [email_in for _, email_in in valid]
+
+    def complete_release(self, scheduled_emails: List[ScheduledEmail], statuses: List[HTTPStatus]) -> None:
+        """
+        Remove the released emails that are done. Emails that failed for a transient reason stay scheduled and
+        are retried by the next release.
+
+        Args:
+            scheduled_emails (List[ScheduledEmail]): The released scheduled emails.
+            statuses (List[HTTPStatus]): The send status of each email, in the same order.
+        """
+        done = [
+            scheduled_email
+            for scheduled_email, status in zip(scheduled_emails, statuses)
+            if status in (HTTPStatus.OK, HTTPStatus.BAD_REQUEST)
+        ]
+        if done:
+            self.scheduled_emails_repository.delete_scheduled_emails(done)
+
+        metrics.put_metric(MetricName.EMAILS_RELEASED.value, statuses.count(HTTPStatus.OK))
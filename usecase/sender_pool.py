@@ -0,0 +1,218 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import Dict, List
+
+from dateutil.parser import parse
+
+from constants.common_constants import CommonConstants, SenderShardKey
+from model.email.email import EmailRecord, EmailTrackerIn, SenderShardIn
+from repository.email_tracker_repository import EmailTrackersRepository
+from utils.consistent_hash import ConsistentHashRing
+from utils.token_bucket import TokenBucket
+from utils.utils import Utils
+
+
+class SenderShard:
+    """
+    One sender identity and SES SMTP credential pair, with its own daily quota tracker and send rate limit.
+
+    The shard keeps the daily count it last saw in its tracker, so a shard known to be over its primary quota
+    is passed over without reading its tracker again until its window resets.
+
+    Attributes:
+        shard_id (str): The ID of the shard.
+        email_from (str): The From header of the emails sent through the shard.
+        smtp_host (str): The SES SMTP host.
+        smtp_port (int): The SMTP port.
+        daily_free_tier_limit (int): The daily number of emails before SendGrid is preferred.
+        daily_send_quota (int): The daily SES send quota.
+        rate_limiter (TokenBucket): The SES send rate limit of the shard.
+    """
+
+    def __init__(self, sender_shard_in: SenderShardIn, tracker_key: str) -> None:
+        display_name = sender_shard_in.displayName or os.getenv('DISPLAY_EMAIL_NAME')
+        self.shard_id = sender_shard_in.shardId
+        self.email_from = f'{display_name} <{sender_shard_in.senderEmail}>'
+        self.smtp_host = sender_shard_in.smtpHost or os.getenv('SES_SMTP_HOST')
+        self.smtp_port = sender_shard_in.smtpPort or int(os.getenv('SMTP_PORT', CommonConstants.SMTP_PORT))
+        self.smtp_username = Utils.get_secret(sender_shard_in.smtpUsernameKey or os.getenv('SES_SMTP_USERNAME_KEY'))
+        self.smtp_password = Utils.get_secret(sender_shard_in.smtpPasswordKey or os.getenv('SES_SMTP_PASSWORD_KEY'))
+        self.daily_free_tier_limit = sender_shard_in.dailyFreeTierLimit
+        self.daily_send_quota = sender_shard_in.dailySendQuota
+        self.weight = sender_shard_in.weight
+        self.rate_limiter = TokenBucket(rate=sender_shard_in.sendsPerSecond)
+        self.email_tracker_repository = EmailTrackersRepository(range_key=tracker_key)
+        self.window = timedelta(seconds=CommonConstants.SEND_WINDOW_SECONDS)
+        self.daily_email_count = 0
+        self.window_end = None
+        self.lock = threading.Lock()
+
+    def update_quota(self, daily_email_count: int, window_start: datetime) -> None:
+        with self.lock:
+            self.daily_email_count = daily_email_count
+            self.window_end = window_start + self.window
+
+    def has_quota(self, quota_reserve: int = 0, now: datetime = None) -> bool:
+        """
+        Whether one more email fits in the primary quota of the shard, as far as the shard last saw.
+
+        Args:
+            quota_reserve (int): The part of the primary quota left to transactional mail.
+            now (datetime, optional): The current time.
+
+        Returns:
+            bool: False if the shard was over its primary quota in the current window.
+        """
+        now = now or datetime.now(timezone.utc)
+        with self.lock:
+            if self.window_end is None or now >= self.window_end:
+                return True
+
+            return self.daily_email_count < self.daily_free_tier_limit - quota_reserve
+
+    def count_emails(self, email_len: int) -> int:
+        """
+        Count emails against the daily quota of the shard, starting a new window when the last one is over.
+
+        Args:
+            email_len (int): The number of emails about to be sent.
+
+        Returns:
+            int: The daily email count including these emails.
+        """
+        email_tracker_repository = self.email_tracker_repository
+        # The shard outlives a day in the long-running worker, so the clock is read on every call
+        now = datetime.now(timezone.utc)
+
+        # Calculate the number of emails to send
+        status, email_tracker, _ = email_tracker_repository.query_email_tracker()
+        if status != HTTPStatus.OK:
+            event_update = EmailTrackerIn(
+                lastEmailSent=now,
+                dailyEmailCount=0,
+            )
+            (
+                _,
+                email_tracker,
+                _,
+            ) = email_tracker_repository.create_update_email_tracker(
+                email_tracker_in=event_update,
+            )
+
+        # Check free tier limit refresh time
+        last_email_sent = parse(email_tracker.lastEmailSent)
+        if last_email_sent.tzinfo is None:
+            last_email_sent = last_email_sent.replace(tzinfo=timezone.utc)
+
+        one_day_passed = (now - last_email_sent).days >= 1
+
+        # Update daily email count
+        if one_day_passed:
+            event_update = EmailTrackerIn(
+                lastEmailSent=now,
+                dailyEmailCount=email_len,
+            )
+            email_tracker_repository.create_update_email_tracker(
+                email_tracker_entry=email_tracker,
+                email_tracker_in=event_update,
+            )
+            total_email_count = email_len
+
+        else:
+            # The atomic increment returns the count including the concurrent sends of other threads and processes
+            status, updated_email_tracker, _ = email_tracker_repository.append_email_sent_count(
+                email_tracker_entry=email_tracker, append_count=email_len
+            )
+            if status == HTTPStatus.OK:
+                total_email_count = updated_email_tracker.dailyEmailCount
+            else:
+                total_email_count = email_tracker.dailyEmailCount + email_len
+
+        self.update_quota(total_email_count, now if one_day_passed else last_email_sent)
+        return total_email_count
+
+    def uncount_emails(self, email_len: int) -> None:
+        """
+        Give back emails counted by count_emails that are not sent through the shard.
+
+        The count the shard keeps is left as is, so the shard stays passed over until its tracker is read again.
+
+        Args:
+            email_len (int): The number of emails to give back.
+        """
+        status, email_tracker, _ = self.email_tracker_repository.query_email_tracker()
+        if status == HTTPStatus.OK:
+            self.email_tracker_repository.append_email_sent_count(
+                email_tracker_entry=email_tracker, append_count=-email_len
+            )
+
+
+class SenderPool:
+    """
+    Spreads emails over several sender shards, so throughput is not capped by the send rate and daily quota
+    of one account.
+
+    Shards are read from the SENDER_SHARDS JSON list of SenderShardIn. Without it, the pool has one shard built
+    from SENDER_EMAIL and the SES_SMTP_* settings, tracked by the original email tracker. Emails are assigned
+    to shards by a consistent hash of the recipient, or of the event with SENDER_SHARD_KEY=event, so adding a
+    shard only moves the emails of its own share of the ring. Shards over their quota are moved to the back of
+    the order until their window resets.
+
+    Attributes:
+        shard_key (SenderShardKey): What emails are hashed on.
+        sender_shards (Dict[str, SenderShard]): The shards by ID.
+    """
+
+    def __init__(self) -> None:
+        self.shard_key = SenderShardKey(os.getenv('SENDER_SHARD_KEY', SenderShardKey.RECIPIENT.value))
+        sender_shards_json = os.getenv('SENDER_SHARDS')
+        if sender_shards_json:
+            sender_shards = [
+                SenderShard(sender_shard_in, tracker_key=f'v0#{sender_shard_in.shardId}')
+                for sender_shard_in in (SenderShardIn(**shard) for shard in json.loads(sender_shards_json))
+            ]
+        else:
+            default_sender_shard_in = SenderShardIn(
+                shardId=CommonConstants.DEFAULT_SENDER_SHARD_ID,
+                senderEmail=os.getenv('SENDER_EMAIL', ''),
+                smtpUsernameKey=os.getenv('SES_SMTP_USERNAME_KEY'),
+                smtpPasswordKey=os.getenv('SES_SMTP_PASSWORD_KEY'),
+                dailySendQuota=int(os.getenv('SES_DAILY_SEND_QUOTA', CommonConstants.SES_DAILY_SEND_QUOTA)),
+            )
+            sender_shards = [SenderShard(default_sender_shard_in, tracker_key='v0')]
+
+        self.sender_shards: Dict[str, SenderShard] = {
+            sender_shard.shard_id: sender_shard for sender_shard in sender_shards
+        }
+        self.ring = ConsistentHashRing(
+            {sender_shard.shard_id: sender_shard.weight for sender_shard in sender_shards},
+            virtual_nodes=CommonConstants.SENDER_SHARD_VIRTUAL_NODES,
+        )
+
+    def get_shard_key(self, email_body: EmailRecord) -> str:
+        if self.shard_key == SenderShardKey.EVENT and email_body.eventId:
+            return email_body.eventId
+
+        return email_body.to[0].lower() if email_body.to else ''
+
+    def get_shards(self, email_body: EmailRecord, quota_reserve: int = 0) -> List[SenderShard]:
+        """
+        Get the shards to try for an email, in order.
+
+        Args:
+            email_body (EmailRecord): The email.
+            quota_reserve (int): The part of the primary quota left to transactional mail.
+
+        Returns:
+            List[SenderShard]: The shards with primary quota left in ring order from the email's key, then the
+            shards without it in the same order.
+        """
+        now = datetime.now(timezone.utc)
+        sender_shards = [
+            self.sender_shards[shard_id] for shard_id in self.ring.get_nodes(self.get_shard_key(email_body))
+        ]
+        with_quota = [sender_shard for sender_shard in sender_shards if sender_shard.has_quota(quota_reserve, now)]
+        return with_quota + [sender_shard for sender_shard in sender_shards if sender_shard not in with_quota]
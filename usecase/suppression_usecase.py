@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from http import HTTPStatus
+from typing import List, Optional, Set, Tuple
+
+from constants.common_constants import CommonConstants
+from model.email.email import EmailIn
+from model.suppression.suppression import SuppressedEmailIn
+from repository.suppression_repository import SuppressionRepository
+from utils.bloom_filter import BloomFilter
+from utils.logger import logger
+
+
+class SuppressionUsecase:
+    """
+    Keeps hard-bounced and complaining addresses out of outgoing emails.
+
+    Suppressed addresses are loaded into a Bloom filter when the container starts (and again every
+    SUPPRESSION_REFRESH_SECONDS), so most recipients are cleared without touching the database. Filter
+    positives of a whole batch are confirmed with one exact bulk lookup.
+    """
+
+    def __init__(self):
+        self.suppression_repository = SuppressionRepository()
+        self.refresh_seconds = int(
+            os.getenv('SUPPRESSION_REFRESH_SECONDS', CommonConstants.SUPPRESSION_REFRESH_SECONDS)
+        )
+        self.bloom_filter = None
+        self.loaded_at = 0.0
+        self.lock = threading.Lock()
+        self.load_bloom_filter()
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        return email.strip().lower()
+
+    def load_bloom_filter(self) -> None:
+        status, suppressed_emails, _ = self.suppression_repository.query_suppressed_emails()
+        if status != HTTPStatus.OK and self.bloom_filter is not None:
+            # Keep the filter we have rather than dropping every suppression
+            return
+
+        bloom_filter = BloomFilter(
+            capacity=max(len(suppressed_emails) * 2, CommonConstants.SUPPRESSION_MIN_CAPACITY),
+            error_rate=CommonConstants.SUPPRESSION_BLOOM_ERROR_RATE,
+        )
+        bloom_filter.update(suppressed_emails)
+        with self.lock:
+            self.bloom_filter = bloom_filter
+            self.loaded_at = time.monotonic()
+
+    def get_suppressed_emails(self, emails: List[str]) -> Set[str]:
+        """
+        Get which of the email addresses are suppressed.
+
+        Args:
+            emails (List[str]): The email addresses to check.
+
+        Returns:
+            Set[str]: The suppressed addresses, normalized.
+        """
+        if time.monotonic() - self.loaded_at > self.refresh_seconds:
+            self.load_bloom_filter()
+
+        candidates = {self.normalize_email(email) for email in emails}
+        positives = [email for email in candidates if email in self.bloom_filter]
+        if not positives:
+            return set()
+
+        status, suppressed_emails, _ = self.suppression_repository.query_suppressed_with_emails(positives)
+        if status != HTTPStatus.OK:
+            # Fail open: a missed suppression costs less than dropping a legitimate email
+            return set()
+
+        return suppressed_emails
+
+    def remove_suppressed_recipients(self, email_ins: List[EmailIn]) -> List[Optional[EmailIn]]:
+        """
+        Remove suppressed addresses from the recipients of a batch of emails.
+
+        Args:
+            email_ins (List[EmailIn]): The emails to filter. They are not modified.
+
+        Returns:
+            List[Optional[EmailIn]]: For each email, the email itself if none of its recipients are suppressed, a
+            copy with the suppressed recipients removed otherwise, or None if no recipient is left in to.
+        """
+        emails = [
+            email
+            for email_in in email_ins
+            for recipients in (email_in.to, email_in.cc, email_in.bcc)
+            if recipients
+            for email in recipients
+        ]
+        suppressed_emails = self.get_suppressed_emails(emails)
+        if not suppressed_emails:
+            return [email_in if email_in.to else None for email_in in email_ins]
+
+        logger.info('Removing %s suppressed address(es) from the batch', len(suppressed_emails), category='suppression')
+        filtered_email_ins = []
+        for email_in in email_ins:
+            update = {}
+            for field in ('to', 'cc', 'bcc'):
+                recipients = getattr(email_in, field)
+                if recipients:
+                    kept = [email for email in recipients if self.normalize_email(email) not in suppressed_emails]
+                    if len(kept) != len(recipients):
+                        update[field] = kept
+
+            filtered_email_in = email_in.model_copy(update=update) if update else email_in
+            filtered_email_ins.append(filtered_email_in if filtered_email_in.to else None)
+
+        return filtered_email_ins
+
+    def import_suppressed_emails(self, suppressed_email_ins: List[SuppressedEmailIn]) -> Tuple[HTTPStatus, str]:
+        """
+        Suppress email addresses in bulk and add them to the loaded Bloom filter.
+
+        Args:
+            suppressed_email_ins (List[SuppressedEmailIn]): The addresses to suppress.
+
+        Returns:
+            Tuple[HTTPStatus, str]: A tuple containing HTTP status and an optional error message.
+        """
+        status, message = self.suppression_repository.import_suppressed_emails(suppressed_email_ins)
+        if status == HTTPStatus.OK:
+            self.bloom_filter.update(self.normalize_email(item.email) for item in suppressed_email_ins)
+
+        return status, message
@@ -0,0 +1,126 @@
+import os
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError, WrapValidator
+from typing_extensions import Annotated
+
+from constants.common_constants import EmailType
+from model.email.email import EmailAttachmentIn, EmailIn
+
+
+def capture_item_errors(value, handler):
+    # Hand back the error of an invalid email instead of failing the whole list, so each email is validated once
+    try:
+        return handler(value)
+    except ValidationError as e:
+        return e
+
+
+EMAIL_LIST_ADAPTER = TypeAdapter(List[Annotated[EmailIn, WrapValidator(capture_item_errors)]])
+# Fields of trusted payloads that are still coerced, since later code relies on their types
+TRUSTED_FIELD_ADAPTERS = {
+    'emailType': TypeAdapter(EmailType),
+    'sendBefore': TypeAdapter(Optional[datetime]),
+    'attachments': TypeAdapter(Optional[List[EmailAttachmentIn]]),
+}
+REQUIRED_EMAIL_FIELDS = [name for name, field in EmailIn.model_fields.items() if field.is_required()]
+
+
+class ValidationUsecase:
+    """
+    Validates the emails of an SQS record in bulk.
+
+    The whole record goes through one cached TypeAdapter, and addresses are validated through a memoized
+    validator (see CachedEmailStr). Each email is validated once: when a record has invalid emails, only those
+    are reported and the rest are still returned. With TRUSTED_PRODUCER=true the payloads are built without
+    validating the addresses and text, for producers that already send validated data. Required fields are still
+    checked, and the type, deadline and attachments are still coerced.
+
+    Attributes:
+        trusted_producer (bool): Skip full validation of the payloads.
+    """
+
+    def __init__(self):
+        self.trusted_producer = os.getenv('TRUSTED_PRODUCER', 'false').lower() == 'true'
+
+    def validate_emails(self, messages: List[dict]) -> Tuple[List[Optional[EmailIn]], List[Tuple[int, str]]]:
+        """
+        Validate the email payloads of a record.
+
+        Args:
+            messages (List[dict]): The email payloads.
+
+        Returns:
+            Tuple[List[Optional[EmailIn]], List[Tuple[int, str]]]: The emails in payload order, None where the
+                payload is invalid, and the (index, error) of each invalid payload.
+        """
+        if self.trusted_producer:
+            return self.construct_emails(messages)
+
+        try:
+            results = EMAIL_LIST_ADAPTER.validate_python(messages)
+        except ValidationError as e:
+            # The body itself is not a list of emails
+            return [], [(-1, str(e))]
+
+        email_ins = []
+        errors = []
+        for index, result in enumerate(results):
+            if not isinstance(result, ValidationError):
+                email_ins.append(result)
+                continue
+
+            email_ins.append(None)
+            item_errors = [
+                f'{".".join(str(part) for part in error["loc"])}: {error["msg"]}'
+                for error in result.errors(include_url=False)
+            ]
+            errors.append((index, '; '.join(item_errors)))
+
+        return email_ins, errors
+
+    @staticmethod
+    def construct_emails(messages: List[dict]) -> Tuple[List[Optional[EmailIn]], List[Tuple[int, str]]]:
+        """
+        Build the emails of a trusted record, coercing only the fields in TRUSTED_FIELD_ADAPTERS.
+
+        Args:
+            messages (List[dict]): The email payloads.
+
+        Returns:
+            Tuple[List[Optional[EmailIn]], List[Tuple[int, str]]]: The emails in payload order, None where the
+                payload is invalid, and the (index, error) of each invalid payload.
+        """
+        if not isinstance(messages, list):
+            return [], [(-1, 'Input should be a valid list')]
+
+        email_ins = []
+        errors = []
+        for index, message in enumerate(messages):
+            if not isinstance(message, dict):
+                email_ins.append(None)
+                errors.append((index, 'Input should be a valid dictionary'))
+                continue
+
+            fields = dict(message)
+            item_errors = [f'{name}: Field required' for name in REQUIRED_EMAIL_FIELDS if name not in message]
+            for name, adapter in TRUSTED_FIELD_ADAPTERS.items():
+                if name not in message:
+                    continue
+
+                try:
+                    fields[name] = adapter.validate_python(message[name])
+                except ValidationError as e:
+                    for error in e.errors(include_url=False):
+                        location = '.'.join(str(part) for part in (name, *error['loc']))
+                        item_errors.append(f'{location}: {error["msg"]}')
+
+            if item_errors:
+                email_ins.append(None)
+                errors.append((index, '; '.join(item_errors)))
+                continue
+
+            email_ins.append(EmailIn.model_construct(**fields))
+
+        return email_ins, errors
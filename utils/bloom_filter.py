@@ -0,0 +1,42 @@
+import hashlib
+import math
+from typing import Iterable, Iterator
+
+from bitarray import bitarray
+
+
+class BloomFilter:
+    """
+    A Bloom filter of strings backed by a bitarray.
+
+    Membership checks never give false negatives, and give false positives at about error_rate when the
+    filter holds capacity items. Positions come from double hashing a single 128-bit BLAKE2b digest.
+
+    Attributes:
+        size (int): The number of bits in the filter.
+        hash_count (int): The number of bit positions per item.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bitarray(self.size)
+        self.bits.setall(0)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first_hash = int.from_bytes(digest[:8], 'little')
+        second_hash = int.from_bytes(digest[8:], 'little') | 1
+        return ((first_hash + index * second_hash) % self.size for index in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position] = 1
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position] for position in self._positions(item))
@@ -0,0 +1,58 @@
+import bisect
+import hashlib
+from typing import Dict, List
+
+
+class ConsistentHashRing:
+    """
+    A consistent hash ring that maps keys to nodes.
+
+    Every node is placed on the ring as weight * virtual_nodes points, so keys spread over the nodes in
+    proportion to their weights, and adding or removing a node only moves the keys of that node.
+
+    Attributes:
+        nodes (Dict[str, int]): The nodes and their weights.
+        virtual_nodes (int): The number of ring points per unit of weight.
+    """
+
+    def __init__(self, nodes: Dict[str, int], virtual_nodes: int = 100) -> None:
+        self.nodes = dict(nodes)
+        self.virtual_nodes = virtual_nodes
+        points = sorted(
+            (self.get_hash(f'{node}#{index}'), node)
+            for node, weight in self.nodes.items()
+            for index in range(max(weight, 1) * virtual_nodes)
+        )
+        self.hashes = [point_hash for point_hash, _ in points]
+        self.points = [node for _, node in points]
+
+    @staticmethod
+    def get_hash(key: str) -> int:
+        return int.from_bytes(hashlib.sha256(key.encode('utf-8')).digest()[:8], 'big')
+
+    def get_nodes(self, key: str) -> List[str]:
+        """
+        Get every node in the order they are met walking the ring clockwise from the key.
+
+        The first node owns the key, and the following ones are where the key moves when the nodes before
+        them are unavailable.
+
+        Args:
+            key (str): The key to place on the ring.
+
+        Returns:
+            List[str]: The distinct nodes, owner first.
+        """
+        if not self.points:
+            return []
+
+        start = bisect.bisect(self.hashes, self.get_hash(key))
+        nodes = []
+        for offset in range(len(self.points)):
+            node = self.points[(start + offset) % len(self.points)]
+            if node not in nodes:
+                nodes.append(node)
+                if len(nodes) == len(self.nodes):
+                    break
+
+        return nodes
@@ -0,0 +1,164 @@
+import base64
+import gzip
+import io
+import json
+from typing import BinaryIO, Iterator, List, Tuple, Union
+
+from constants.common_constants import CommonConstants
+
+
+class RecordEnvelope:
+    """
+    Encodes and decodes SQS record bodies.
+
+    A body is either the original JSON list of email dicts, or a versioned envelope that stores the fields
+    shared by every email once and the per-recipient fields as rows of a column list:
+
+        {"version": 1, "shared": {"subject": ..., "body": [...]}, "columns": ["to", "salutation"],
+         "rows": [[["juan@example.com"], "Good day Juan,"], ...]}
+
+    The same content can be written as NDJSON, where the first line holds shared and columns and every
+    following line is a row. A compressed envelope carries it gzip+base64 encoded, and a claim-check envelope
+    points to an S3 object holding it (gzipped when the key ends with .gz):
+
+        {"version": 1, "encoding": "gzip+base64", "data": "H4sI..."}
+        {"version": 1, "claimCheck": {"bucket": "...", "key": "campaigns/....ndjson.gz"}}
+    """
+
+    @staticmethod
+    def split_fields(messages: List[dict]) -> Tuple[dict, List[str], List[list]]:
+        keys = list(dict.fromkeys(key for message in messages for key in message))
+        shared = {}
+        columns = []
+        for key in keys:
+            values = [message.get(key) for message in messages]
+            if all(key in message and value == values[0] for message, value in zip(messages, values)):
+                shared[key] = values[0]
+            else:
+                columns.append(key)
+        rows = [[message.get(column) for column in columns] for message in messages]
+        return shared, columns, rows
+
+    @staticmethod
+    def encode(messages: List[dict], compress: bool = False) -> str:
+        """
+        Encode email dicts as an envelope.
+
+        Args:
+            messages (List[dict]): The email payloads.
+            compress (bool): Whether to gzip+base64 the envelope content.
+
+        Returns:
+            str: The record body.
+        """
+        if compress:
+            data = gzip.compress(RecordEnvelope.encode_ndjson(messages))
+            return json.dumps(
+                {
+                    'version': CommonConstants.ENVELOPE_VERSION,
+                    'encoding': CommonConstants.ENVELOPE_GZIP_ENCODING,
+                    'data': base64.b64encode(data).decode('ascii'),
+                },
+                separators=(',', ':'),
+            )
+
+        shared, columns, rows = RecordEnvelope.split_fields(messages)
+        return json.dumps(
+            {'version': CommonConstants.ENVELOPE_VERSION, 'shared': shared, 'columns': columns, 'rows': rows},
+            separators=(',', ':'),
+        )
+
+    @staticmethod
+    def encode_ndjson(messages: List[dict]) -> bytes:
+        """
+        Encode email dicts as envelope NDJSON, e.g. for a claim-check object.
+
+        Args:
+            messages (List[dict]): The email payloads.
+
+        Returns:
+            bytes: The NDJSON content.
+        """
+        shared, columns, rows = RecordEnvelope.split_fields(messages)
+        lines = [json.dumps({'shared': shared, 'columns': columns}, separators=(',', ':'))]
+        lines.extend(json.dumps(row, separators=(',', ':')) for row in rows)
+        return '\n'.join(lines).encode('utf-8')
+
+    @staticmethod
+    def encode_claim_check(bucket: str, key: str) -> str:
+        return json.dumps(
+            {'version': CommonConstants.ENVELOPE_VERSION, 'claimCheck': {'bucket': bucket, 'key': key}},
+            separators=(',', ':'),
+        )
+
+    @staticmethod
+    def decode(body: str) -> Iterator[dict]:
+        """
+        Decode a record body into email dicts, one at a time.
+
+        Args:
+            body (str): The record body, in the list or an inline envelope format.
+
+        Returns:
+            Iterator[dict]: The email payloads.
+        """
+        return RecordEnvelope.decode_payload(json.loads(body))
+
+    @staticmethod
+    def decode_payload(payload: Union[list, dict]) -> Iterator[dict]:
+        if isinstance(payload, list):
+            yield from payload
+            return
+
+        version = payload.get('version')
+        if version != CommonConstants.ENVELOPE_VERSION:
+            raise ValueError(f'Unsupported envelope version: {version}')
+
+        encoding = payload.get('encoding')
+        if encoding is None:
+            yield from RecordEnvelope.expand(payload['shared'], payload['columns'], payload['rows'])
+            return
+
+        if encoding != CommonConstants.ENVELOPE_GZIP_ENCODING:
+            raise ValueError(f'Unsupported envelope encoding: {encoding}')
+
+        compressed = io.BytesIO(base64.b64decode(payload['data']))
+        with gzip.GzipFile(fileobj=compressed) as gzip_file:
+            yield from RecordEnvelope.decode_stream(gzip_file)
+
+    @staticmethod
+    def decode_stream(stream: BinaryIO, chunk_size: int = CommonConstants.ENVELOPE_READ_CHUNK_BYTES) -> Iterator[dict]:
+        """
+        Decode envelope NDJSON from a stream, holding at most one chunk and one partial line in memory.
+
+        Args:
+            stream (BinaryIO): Any object with read(size), e.g. an S3 StreamingBody or a GzipFile.
+            chunk_size (int): The number of bytes read at a time.
+
+        Returns:
+            Iterator[dict]: The email payloads.
+        """
+        lines = (line for line in RecordEnvelope.iter_lines(stream, chunk_size) if line.strip())
+        header = json.loads(next(lines))
+        yield from RecordEnvelope.expand(header['shared'], header['columns'], (json.loads(line) for line in lines))
+
+    @staticmethod
+    def iter_lines(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+        pending = b''
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            yield from lines
+
+        if pending:
+            yield pending
+
+    @staticmethod
+    def expand(shared: dict, columns: List[str], rows) -> Iterator[dict]:
+        for row in rows:
+            message = dict(shared)
+            message.update(zip(columns, row))
+            yield message
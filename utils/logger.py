@@ -1,14 +1,137 @@
+import json
 import logging
 import os
+import random
+import re
+from datetime import datetime, timezone
 from sys import stdout
 
-logger = logging.getLogger('sparcs-certificates-service')
+EMAIL_PATTERN = re.compile(r'([A-Za-z0-9._%+-])[A-Za-z0-9._%+-]*@([A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+)')
+REDACTED_FIELDS = frozenset({'to', 'cc', 'bcc', 'email', 'emails', 'recipient', 'recipients'})
+
+
+def redact(value):
+    """
+    Mask the local part of every email address in a value, e.g. juan@example.com -> j***@example.com
+    """
+    if isinstance(value, str):
+        return EMAIL_PATTERN.sub(r'\1***@\2', value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [redact(item) for item in value]
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line, with the category and structured fields as top-level keys.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'message': redact(record.getMessage()),
+        }
+        category = getattr(record, 'category', None)
+        if category:
+            entry['category'] = category
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, separators=(',', ':'))
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Formats records for humans, with the structured fields appended as key=value pairs.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        category = getattr(record, 'category', None)
+        prefix = f'{self.formatTime(record)} {record.levelname:<8} '
+        line = prefix + (f'[{category}] ' if category else '') + redact(record.getMessage())
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
+
+
+class StructuredLogger:
+    """
+    A logger with lazy %-style formatting, structured fields, per-category sampling and PII redaction.
+
+    Calls for disabled levels return before anything is formatted or copied. Records below WARNING that
+    carry a category are kept at the rate configured in LOG_SAMPLE_RATES (e.g. 'repository=0.1,smtp=0.5').
+    Address fields (to, cc, bcc, email, recipients, ...) and addresses inside messages are redacted.
+
+    Example:
+        logger.info('Sent %d email(s)', count, category='smtp', provider='ses')
+    """
+
+    def __init__(self, name: str, sample_rates: dict = None) -> None:
+        self.logger = logging.getLogger(name)
+        self.sample_rates = sample_rates or {}
+
+    @staticmethod
+    def parse_sample_rates(sample_rates: str) -> dict:
+        rates = {}
+        for item in filter(None, (part.strip() for part in sample_rates.split(','))):
+            category, _, rate = item.partition('=')
+            rates[category.strip()] = float(rate)
+        return rates
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def setLevel(self, level) -> None:
+        self.logger.setLevel(level)
+
+    def log(self, level: int, msg: str, *args, category: str = None, exc_info=None, **fields) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+
+        if category and level < logging.WARNING:
+            sample_rate = self.sample_rates.get(category, 1.0)
+            if sample_rate < 1.0 and random.random() >= sample_rate:  # nosec B311
+                return
+
+        if fields:
+            fields = {key: redact(value) if key in REDACTED_FIELDS else value for key, value in fields.items()}
+        self.logger.log(
+            level, msg, *args, exc_info=exc_info, extra={'category': category, 'fields': fields}, stacklevel=3
+        )
+
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        self.log(logging.DEBUG, msg, *args, **kwargs)
+
+    def info(self, msg: str, *args, **kwargs) -> None:
+        self.log(logging.INFO, msg, *args, **kwargs)
+
+    def warning(self, msg: str, *args, **kwargs) -> None:
+        self.log(logging.WARNING, msg, *args, **kwargs)
+
+    def error(self, msg: str, *args, **kwargs) -> None:
+        self.log(logging.ERROR, msg, *args, **kwargs)
+
+    def exception(self, msg: str, *args, **kwargs) -> None:
+        kwargs.setdefault('exc_info', True)
+        self.log(logging.ERROR, msg, *args, **kwargs)
+
+
 handler = logging.StreamHandler(stdout)
-if os.getenv('AWS_EXECUTION_ENV'):  # pragma: no cover
-    logger.propagate = False
-    log_formatter = logging.Formatter('[%(levelname)s] %(message)s')
+if os.getenv('LOG_FORMAT', 'json' if os.getenv('AWS_EXECUTION_ENV') else 'text') == 'json':
+    handler.setFormatter(JsonFormatter())
 else:
-    log_formatter = logging.Formatter('%(asctime)s %(levelname)-8s %(message)s')
-handler.setFormatter(log_formatter)
-logger.addHandler(handler)
+    handler.setFormatter(TextFormatter())
+
+logger = StructuredLogger(
+    'sparcs-email-service',
+    sample_rates=StructuredLogger.parse_sample_rates(os.getenv('LOG_SAMPLE_RATES', '')),
+)
+logger.logger.propagate = False
+logger.logger.addHandler(handler)
 logger.setLevel(os.getenv('LOG_LEVEL', logging.getLevelName(logging.DEBUG)))
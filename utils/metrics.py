@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List
+
+from constants.common_constants import CommonConstants
+from utils.logger import logger
+
+
+class EmfExporter:
+    """
+    Writes metrics as CloudWatch Embedded Metric Format documents to stdout.
+
+    CloudWatch Logs extracts the metrics from these lines, so they must not go through the log formatter.
+    A metric holds at most EMF_MAX_VALUES values per document, larger samples are split across documents.
+    """
+
+    def export(self, namespace: str, dimensions: Dict[str, str], samples: Dict[str, List[float]], units: dict) -> None:
+        names = list(samples)
+        chunk_count = max((len(values) - 1) // CommonConstants.EMF_MAX_VALUES + 1 for values in samples.values())
+        for chunk in range(chunk_count):
+            start = chunk * CommonConstants.EMF_MAX_VALUES
+            chunk_samples = {
+                name: samples[name][start : start + CommonConstants.EMF_MAX_VALUES]
+                for name in names
+                if samples[name][start : start + CommonConstants.EMF_MAX_VALUES]
+            }
+            document = {
+                '_aws': {
+                    'Timestamp': int(time.time() * 1000),
+                    'CloudWatchMetrics': [
+                        {
+                            'Namespace': namespace,
+                            'Dimensions': [list(dimensions)],
+                            'Metrics': [{'Name': name, 'Unit': units[name]} for name in chunk_samples],
+                        }
+                    ],
+                },
+                **dimensions,
+                **chunk_samples,
+            }
+            print(json.dumps(document, separators=(',', ':')), flush=True)
+
+
+class LocalExporter:
+    """
+    Logs a per-metric summary (count, p50, p95, max), for local runs without CloudWatch.
+    """
+
+    def export(self, namespace: str, dimensions: Dict[str, str], samples: Dict[str, List[float]], units: dict) -> None:
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
+        lines = [f'{namespace} {dimensions}']
+        for name, values in sorted(samples.items()):
+            ordered = sorted(values)
+            p50 = ordered[int(len(ordered) * 0.5)]
+            p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+            lines.append(
+                f'  {name:<20} n={len(ordered):<5} p50={p50:.2f} p95={p95:.2f} max={ordered[-1]:.2f} {units[name]}'
+            )
+        logger.info('\n'.join(lines), category='metrics')
+
+
+class Metrics:
+    """
+    Collects the metrics of one invocation and exports them on flush.
+
+    Stage timings are recorded in milliseconds with the timer context manager, from any thread, and are
+    exported as the full list of values so CloudWatch can build per-stage distributions.
+
+    Attributes:
+        namespace (str): The CloudWatch metrics namespace.
+        dimensions (Dict[str, str]): The dimensions attached to every metric.
+    """
+
+    def __init__(self, namespace: str = CommonConstants.METRICS_NAMESPACE, exporter=None) -> None:
+        self.namespace = namespace
+        self.dimensions = {'Service': CommonConstants.METRICS_SERVICE, 'Stage': os.getenv('STAGE', 'local')}
+        self.exporter = exporter or self.get_default_exporter()
+        self.samples = defaultdict(list)
+        self.units = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_default_exporter():
+        exporter_name = os.getenv('METRICS_EXPORTER', 'emf' if os.getenv('AWS_EXECUTION_ENV') else 'local')
+        if exporter_name == 'emf':
+            return EmfExporter()
+        if exporter_name == 'local':
+            return LocalExporter()
+        return None
+
+    def put_metric(self, name: str, value: float, unit: str = 'Count') -> None:
+        with self.lock:
+            self.samples[name].append(value)
+            self.units[name] = unit
+
+    @contextmanager
+    def timer(self, name: str):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.put_metric(name, round((time.perf_counter() - start_time) * 1000, 3), 'Milliseconds')
+
+    def flush(self) -> None:
+        with self.lock:
+            samples, units = self.samples, self.units
+            self.samples, self.units = defaultdict(list), {}
+
+        if samples and self.exporter is not None:
+            self.exporter.export(self.namespace, self.dimensions, dict(samples), units)
+
+
+metrics = Metrics()
@@ -0,0 +1,80 @@
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+from utils.logger import logger
+from utils.metrics import metrics
+from utils.profiler import profile_invocation
+
+
+class PipelineStage:
+    """
+    One stage of a send pipeline: a bounded queue of work items drained by a fixed number of worker threads.
+
+    Every item travels with the future of its result. The handler either resolves the future or puts the item
+    on the next stage, and an exception it raises is set on the future. Putting an item blocks while the queue
+    is full, so a slow stage holds back the stages before it instead of letting work pile up in memory. The
+    queue depth is recorded on every put. Worker threads are started on the first put, so a stage built before
+    a worker process forks runs its threads in the child.
+
+    Attributes:
+        name (str): The name of the stage, used in logs.
+        workers (int): The number of worker threads.
+        depth_metric_name (str): The metric the queue depth is recorded under.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Future, Any], None],
+        workers: int,
+        queue_size: int,
+        depth_metric_name: str,
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.depth_metric_name = depth_metric_name
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.threads: List[threading.Thread] = []
+        self.lock = threading.Lock()
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def put(self, future: Future, item: Any) -> None:
+        """
+        Queue an item, blocking while the queue is full.
+
+        Args:
+            future (Future): The future of the item's result.
+            item (Any): The work item.
+        """
+        self.start()
+        self.queue.put((future, item))
+        metrics.put_metric(self.depth_metric_name, self.depth)
+
+    def start(self) -> None:
+        with self.lock:
+            if self.threads:
+                return
+
+            for index in range(self.workers):
+                thread = threading.Thread(target=self.work, name=f'{self.name}-{index}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def work(self) -> None:
+        while True:
+            future, item = self.queue.get()
+            try:
+                with profile_invocation.profile_thread():
+                    self.handler(future, item)
+            except Exception as e:
+                logger.error('Pipeline stage %s failed: %s', self.name, e, category='pipeline')
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.queue.task_done()
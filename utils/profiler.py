@@ -0,0 +1,163 @@
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from constants.common_constants import CommonConstants
+from utils.logger import logger
+
+
+class InvocationProfiler:
+    """
+    Profiles a sample of handler invocations with cProfile and tracemalloc.
+
+    Profiling is off unless PROFILE_SAMPLE_RATE is set to N, in which case about 1 in N invocations is
+    profiled. Each profile is written as a compact JSON artifact holding the top functions by cumulative time
+    and the top allocation sites, either to PROFILE_DIR (PROFILE_OUTPUT=tmp) or to the log as a line
+    prefixed with PROFILE_LOG_PREFIX (PROFILE_OUTPUT=log). Use scripts/aggregate_profiles.py to combine them.
+
+    cProfile only sees the thread that enables it, so work handed to pipeline worker threads is profiled with
+    profile_thread: while an invocation is being profiled, every work item gets its own profiler in its worker
+    thread, and those profiles are merged into the invocation's stats. Items still running when the invocation
+    returns are left out.
+
+    Attributes:
+        sample_rate (int): Profile 1 in sample_rate invocations, 0 disables profiling.
+        output (str): Where artifacts go, 'tmp' or 'log'.
+        profile_dir (str): The directory of artifacts written to local storage.
+        top_n (int): The number of functions and allocation sites kept in an artifact.
+    """
+
+    def __init__(self) -> None:
+        self.sample_rate = int(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+        self.output = os.getenv('PROFILE_OUTPUT', 'tmp')
+        self.profile_dir = os.getenv('PROFILE_DIR', CommonConstants.PROFILE_DIR)
+        self.top_n = int(os.getenv('PROFILE_TOP_N', CommonConstants.PROFILE_TOP_N))
+        self.thread_profilers: Optional[List[cProfile.Profile]] = None
+        self.lock = threading.Lock()
+
+    def is_sampled(self) -> bool:
+        return self.sample_rate > 0 and random.randrange(self.sample_rate) == 0  # nosec B311
+
+    @contextlib.contextmanager
+    def profile_thread(self):
+        """
+        Profile a work item run by a worker thread into the invocation being profiled, if there is one.
+        """
+        thread_profilers = self.thread_profilers
+        if thread_profilers is None:
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+
+        finally:
+            profiler.disable()
+            with self.lock:
+                # The invocation may have finished while the item ran
+                if self.thread_profilers is thread_profilers:
+                    thread_profilers.append(profiler)
+
+    def __call__(self, handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            if not self.is_sampled():
+                return handler(event, context)
+
+            tracemalloc.start(CommonConstants.PROFILE_TRACEBACK_DEPTH)
+            profiler = cProfile.Profile()
+            with self.lock:
+                self.thread_profilers = []
+            start_time = time.perf_counter()
+            profiler.enable()
+            try:
+                return handler(event, context)
+
+            finally:
+                profiler.disable()
+                with self.lock:
+                    thread_profilers, self.thread_profilers = self.thread_profilers, None
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                snapshot = tracemalloc.take_snapshot()
+                _, peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                try:
+                    self.write_artifact(
+                        invocation_id=getattr(context, 'aws_request_id', None) or str(int(time.time() * 1000)),
+                        duration_ms=duration_ms,
+                        profilers=[profiler, *thread_profilers],
+                        snapshot=snapshot,
+                        peak_memory=peak_memory,
+                    )
+                except Exception as e:
+                    logger.error('Failed to write profile: %s', e, category='profiler')
+
+        return wrapper
+
+    def write_artifact(
+        self,
+        invocation_id: str,
+        duration_ms: float,
+        profilers: List[cProfile.Profile],
+        snapshot: tracemalloc.Snapshot,
+        peak_memory: int,
+    ) -> None:
+        stats = pstats.Stats(*profilers).stats
+        functions = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[: self.top_n]
+        allocations = snapshot.statistics('lineno')[: self.top_n]
+        artifact = {
+            'invocationId': invocation_id,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'durationMs': round(duration_ms, 3),
+            'peakMemoryKiB': round(peak_memory / 1024, 1),
+            'functions': [
+                {
+                    'function': f'{self.shorten_path(file_name)}:{line}({function_name})',
+                    'calls': call_count,
+                    'totalTime': round(total_time, 6),
+                    'cumulativeTime': round(cumulative_time, 6),
+                }
+                for (file_name, line, function_name), (_, call_count, total_time, cumulative_time, _) in functions
+            ],
+            'allocations': [
+                {
+                    'location': f'{self.shorten_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}',
+                    'sizeKiB': round(stat.size / 1024, 1),
+                    'count': stat.count,
+                }
+                for stat in allocations
+            ],
+        }
+        artifact_json = json.dumps(artifact, separators=(',', ':'))
+
+        if self.output == 'log':
+            print(f'{CommonConstants.PROFILE_LOG_PREFIX} {artifact_json}', flush=True)
+            return
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        artifact_path = os.path.join(self.profile_dir, f'profile-{invocation_id}.json')
+        with open(artifact_path, 'w', encoding='utf-8') as file_handle:
+            file_handle.write(artifact_json)
+        logger.info('Profile written to %s', artifact_path, category='profiler')
+
+    @staticmethod
+    def shorten_path(file_name: str) -> str:
+        if 'site-packages/' in file_name:
+            return file_name.split('site-packages/', 1)[1]
+        if '/lib/python' in file_name:
+            return file_name.split('/lib/python', 1)[1].split('/', 1)[-1]
+        return os.path.relpath(file_name) if os.path.isabs(file_name) else file_name
+
+
+profile_invocation = InvocationProfiler()
@@ -0,0 +1,157 @@
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+from constants.common_constants import MetricName
+from utils.metrics import metrics
+
+
+class SmtpConnectionPool:
+    """
+    A thread-safe pool of logged in SMTP connections to one provider.
+
+    Reusing a connection saves the TCP connect, STARTTLS and AUTH round trips of every email after the first.
+    A reused connection is checked with a NOOP first, and connections idle for longer than max_idle_seconds or
+    used for max_messages emails are closed instead of reused. A connection that raised an error is never put
+    back. The pool lives in the process that created it, so every worker process has a pool of its own.
+
+    Attributes:
+        host (str): The SMTP host.
+        port (int): The SMTP port.
+        max_idle (int): The maximum number of idle connections kept.
+        max_idle_seconds (float): How long a connection may stay idle before it is closed.
+        max_messages (int): The number of emails sent over a connection before it is closed.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        max_idle: int,
+        max_idle_seconds: float,
+        max_messages: int,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_idle = max_idle
+        self.max_idle_seconds = max_idle_seconds
+        self.max_messages = max_messages
+        # (connection, released_at, messages sent), most recently released last
+        self.idle: List[Tuple[smtplib.SMTP, float, int]] = []
+        self.sent_counts = {}
+        self.lock = threading.Lock()
+
+    def open_connection(self, timeout: float) -> smtplib.SMTP:
+        with metrics.timer(MetricName.SMTP_CONNECT.value):
+            server = smtplib.SMTP(self.host, self.port, timeout=timeout)
+
+        try:
+            with metrics.timer(MetricName.SMTP_STARTTLS.value):
+                server.starttls()
+            with metrics.timer(MetricName.SMTP_LOGIN.value):
+                server.login(self.username, self.password)
+        except Exception:
+            self.close_connection(server)
+            raise
+
+        return server
+
+    @staticmethod
+    def close_connection(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def acquire(self, timeout: float) -> smtplib.SMTP:
+        """
+        Take an idle connection that is still alive, or open a new one.
+
+        Args:
+            timeout (float): The socket timeout of the connection in seconds.
+
+        Returns:
+            smtplib.SMTP: A logged in connection.
+        """
+        while True:
+            with self.lock:
+                if not self.idle:
+                    break
+                server, released_at, sent_count = self.idle.pop()
+
+            if time.monotonic() - released_at > self.max_idle_seconds:
+                self.close_connection(server)
+                continue
+
+            server.timeout = timeout
+            server.sock.settimeout(timeout)
+            try:
+                code, _ = server.noop()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+                continue
+
+            if code != 250:
+                self.close_connection(server)
+                continue
+
+            with self.lock:
+                self.sent_counts[id(server)] = sent_count
+            return server
+
+        server = self.open_connection(timeout)
+        with self.lock:
+            self.sent_counts[id(server)] = 0
+        return server
+
+    def release(self, server: smtplib.SMTP, is_reusable: bool = True) -> None:
+        """
+        Put a connection back in the pool, or close it.
+
+        Args:
+            server (smtplib.SMTP): The connection taken with acquire.
+            is_reusable (bool): Whether the connection is in a known good state.
+        """
+        with self.lock:
+            sent_count = self.sent_counts.pop(id(server), 0) + 1
+            if is_reusable and sent_count < self.max_messages and len(self.idle) < self.max_idle:
+                self.idle.append((server, time.monotonic(), sent_count))
+                return
+
+        if is_reusable:
+            self.close_connection(server)
+        else:
+            server.close()
+
+    @contextmanager
+    def connection(self, timeout: float) -> Iterator[smtplib.SMTP]:
+        """
+        Borrow a connection for one email. The connection is discarded if the email raised an error.
+
+        Args:
+            timeout (float): The socket timeout of the connection in seconds.
+
+        Yields:
+            smtplib.SMTP: A logged in connection.
+        """
+        server = self.acquire(timeout)
+        try:
+            yield server
+        except BaseException:
+            self.release(server, is_reusable=False)
+            raise
+        else:
+            self.release(server)
+
+    def close(self) -> None:
+        with self.lock:
+            idle, self.idle = self.idle, []
+
+        for server, _, _ in idle:
+            self.close_connection(server)
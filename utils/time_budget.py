@@ -0,0 +1,43 @@
+import os
+
+from constants.common_constants import CommonConstants
+
+
+class TimeBudget:
+    """
+    Tracks the time left in a Lambda invocation.
+
+    The budget is exhausted once the remaining time drops under the safety margin, which leaves enough time
+    for in-flight sends to finish and for the handler to report unprocessed records back to SQS. Without a
+    Lambda context (local runs) the budget never runs out.
+
+    Attributes:
+        context: The Lambda context object, or None.
+        safety_margin_ms (int): The time in milliseconds reserved for wrapping up the invocation.
+        max_message_timeout (float): The upper bound of a per-message timeout in seconds.
+    """
+
+    def __init__(self, context=None) -> None:
+        self.context = context
+        self.safety_margin_ms = int(
+            os.getenv('TIME_BUDGET_SAFETY_MARGIN_MS', CommonConstants.TIME_BUDGET_SAFETY_MARGIN_MS)
+        )
+        self.max_message_timeout = CommonConstants.SMTP_TIMEOUT_SECONDS
+
+    def remaining_ms(self) -> float:
+        if self.context is None:
+            return float('inf')
+        return self.context.get_remaining_time_in_millis()
+
+    def exhausted(self) -> bool:
+        return self.remaining_ms() < self.safety_margin_ms
+
+    def message_timeout(self) -> float:
+        """
+        Get the timeout for the next message, derived from the remaining budget.
+
+        Returns:
+            float: The timeout in seconds, between MIN_MESSAGE_TIMEOUT_SECONDS and SMTP_TIMEOUT_SECONDS.
+        """
+        available_seconds = (self.remaining_ms() - self.safety_margin_ms) / 1000
+        return max(min(available_seconds, self.max_message_timeout), CommonConstants.MIN_MESSAGE_TIMEOUT_SECONDS)
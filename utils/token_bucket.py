@@ -0,0 +1,84 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket rate limiter.
+
+    Tokens are added at rate per second up to capacity, and each acquire takes one. A rate of 0 disables the
+    limit.
+
+    Attributes:
+        rate (float): The number of tokens added per second.
+        capacity (float): The maximum number of tokens, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: float = None, clock=time.monotonic, sleep=time.sleep) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.capacity
+        self.updated_at = clock()
+        self.lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens if they are available.
+
+        Args:
+            tokens (float): The number of tokens to take.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds until they will be available.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.tokens + (now - self.updated_at) * self.rate, self.capacity)
+            self.updated_at = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+
+            return (tokens - self.tokens) / self.rate
+
+    def release(self, tokens: float = 1.0) -> None:
+        """
+        Give back tokens that were taken for a send that did not happen.
+
+        Args:
+            tokens (float): The number of tokens to give back.
+        """
+        if self.rate <= 0:
+            return
+
+        with self.lock:
+            self.tokens = min(self.tokens + tokens, self.capacity)
+
+    def acquire(self, tokens: float = 1.0, timeout: float = None) -> bool:
+        """
+        Block until tokens are available and take them.
+
+        Args:
+            tokens (float): The number of tokens to take.
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: Whether the tokens were taken before the timeout.
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            wait_seconds = self.try_acquire(tokens)
+            if not wait_seconds:
+                return True
+
+            if deadline is not None:
+                remaining = deadline - self.clock()
+                if remaining < wait_seconds:
+                    return False
+
+            self.sleep(wait_seconds)
@@ -1,8 +1,9 @@
-import logging
 import os
 
 from boto3.session import Session
 
+from utils.logger import logger
+
 
 class Utils:
     @staticmethod
@@ -14,7 +15,6 @@ class Utils:
             resp = client.get_parameter(Name=secret_name, WithDecryption=True)
             secret = resp['Parameter']['Value']
         except Exception as e:
-            message = f'Failed to get secret, {secret_name}, from AWS SSM: {str(e)}'
-            logging.error(message)
+            logger.error('Failed to get secret, %s, from AWS SSM: %s', secret_name, e, category='secrets')
 
         return secret
@@ -0,0 +1,297 @@
+import argparse
+import functools
+import multiprocessing.util
+import os
+import signal
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List
+
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+
+from constants.common_constants import CommonConstants
+from utils.logger import logger
+
+SQS_BATCH_LIMIT = 10
+
+
+class WorkerContext:
+    """
+    Stands in for the Lambda context of a batch, so the handler gets the same time budget as an invocation.
+    """
+
+    def __init__(self, timeout_ms: int) -> None:
+        self.aws_request_id = str(uuid.uuid4())
+        self.deadline = time.monotonic() + timeout_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        return int((self.deadline - time.monotonic()) * 1000)
+
+
+def init_worker_process() -> None:
+    # The parent handles shutdown signals and lets the in-flight batches finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    # Importing the handler builds the usecases once per process, so their secrets, caches and SMTP pools stay warm
+    import handler
+
+    multiprocessing.util.Finalize(None, handler.email_usecase.close_smtp_pools, exitpriority=10)
+
+
+def process_batch(event: dict, timeout_ms: int) -> dict:
+    import handler
+
+    return handler.send_email_handler(event, WorkerContext(timeout_ms))
+
+
+class InlineExecutor:
+    """
+    Runs batches in the calling process, for local runs against in-process stand-ins like moto.
+    """
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        handler = sys.modules.get('handler')
+        if handler is not None:
+            handler.email_usecase.close_smtp_pools()
+
+
+class QueueWorker:
+    """
+    Long-polls the email queue and runs send_email_handler on each batch in a pool of processes.
+
+    Every process imports the handler once and keeps its usecases warm between batches. While batches are in
+    flight, a heartbeat thread extends the visibility timeout of their messages, so a slow batch is not
+    delivered twice. The handler deletes the messages it finishes, and the messages it releases are made
+    visible again right away. On SIGTERM or SIGINT the worker stops polling, waits for the in-flight batches,
+    and exits.
+
+    Attributes:
+        queue_url (str): The URL of the email queue.
+        processes (int): The number of worker processes. With 0, batches run in the polling process.
+        batch_size (int): The maximum number of messages per batch.
+        wait_time_seconds (int): How long a receive waits for messages.
+        visibility_timeout (int): The visibility timeout of received messages, extended while in flight.
+        batch_timeout_ms (int): The time budget of a batch, like the Lambda timeout.
+    """
+
+    def __init__(
+        self,
+        queue_url: str,
+        processes: int,
+        batch_size: int = CommonConstants.WORKER_BATCH_SIZE,
+        wait_time_seconds: int = CommonConstants.WORKER_WAIT_TIME_SECONDS,
+        visibility_timeout: int = CommonConstants.WORKER_VISIBILITY_TIMEOUT_SECONDS,
+        batch_timeout_ms: int = CommonConstants.WORKER_BATCH_TIMEOUT_MS,
+        sqs=None,
+    ) -> None:
+        self.sqs = sqs or boto3.client('sqs')
+        self.queue_url = queue_url
+        self.processes = processes
+        self.batch_size = min(batch_size, SQS_BATCH_LIMIT)
+        self.wait_time_seconds = wait_time_seconds
+        self.visibility_timeout = visibility_timeout
+        self.batch_timeout_ms = batch_timeout_ms
+        self.heartbeat_interval = visibility_timeout / 3
+        self.in_flight: Dict[str, List[dict]] = {}
+        self.futures: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.heartbeat_stopped = threading.Event()
+        if processes > 0:
+            self.executor = ProcessPoolExecutor(max_workers=processes, initializer=init_worker_process)
+        else:
+            self.executor = InlineExecutor()
+
+    def request_stop(self, signum=None, frame=None) -> None:
+        logger.info('Stopping, waiting for %s in-flight batch(es)', len(self.in_flight), category='worker')
+        self.stopping.set()
+
+    def run(self, until: Callable[[], bool] = None) -> int:
+        """
+        Process batches until a stop is requested.
+
+        Args:
+            until (Callable[[], bool], optional): Also stop once this returns True, checked between receives.
+
+        Returns:
+            int: The number of batches processed.
+        """
+        heartbeat = threading.Thread(target=self.extend_visibility_loop, daemon=True)
+        heartbeat.start()
+        batches = 0
+        try:
+            while not self.stopping.is_set() and not (until and until()):
+                self.wait_for_slot()
+                messages = self.receive_messages()
+                if messages:
+                    self.submit_batch(messages)
+                    batches += 1
+
+        finally:
+            self.wait_for_batches()
+            self.heartbeat_stopped.set()
+            heartbeat.join()
+            self.executor.shutdown(wait=True)
+
+        logger.info('Worker stopped after %s batch(es)', batches, category='worker')
+        return batches
+
+    def receive_messages(self) -> List[dict]:
+        try:
+            response = self.sqs.receive_message(
+                QueueUrl=self.queue_url,
+                MaxNumberOfMessages=self.batch_size,
+                WaitTimeSeconds=self.wait_time_seconds,
+                VisibilityTimeout=self.visibility_timeout,
+                AttributeNames=['All'],
+                MessageAttributeNames=['All'],
+            )
+        except (BotoCoreError, ClientError) as e:
+            logger.error('Failed to receive messages: %s', e, category='worker')
+            self.stopping.wait(1)
+            return []
+
+        return response.get('Messages', [])
+
+    @staticmethod
+    def to_record(message: dict) -> dict:
+        """
+        Convert a received SQS message to the record format of the Lambda SQS event.
+        """
+        return {
+            'messageId': message['MessageId'],
+            'receiptHandle': message['ReceiptHandle'],
+            'body': message['Body'],
+            'attributes': message.get('Attributes', {}),
+            'messageAttributes': {
+                name: {
+                    'stringValue': attribute.get('StringValue'),
+                    'binaryValue': attribute.get('BinaryValue'),
+                    'dataType': attribute.get('DataType'),
+                }
+                for name, attribute in message.get('MessageAttributes', {}).items()
+            },
+            'eventSource': 'aws:sqs',
+        }
+
+    def submit_batch(self, messages: List[dict]) -> None:
+        batch_id = str(uuid.uuid4())
+        records = [self.to_record(message) for message in messages]
+        with self.lock:
+            self.in_flight[batch_id] = records
+
+        future = self.executor.submit(process_batch, {'Records': records}, self.batch_timeout_ms)
+        with self.lock:
+            self.futures[batch_id] = future
+        future.add_done_callback(functools.partial(self.complete_batch, batch_id))
+
+    def complete_batch(self, batch_id: str, future: Future) -> None:
+        with self.lock:
+            records = self.in_flight.pop(batch_id, [])
+            self.futures.pop(batch_id, None)
+
+        try:
+            result = future.result()
+            failed_ids = {failure['itemIdentifier'] for failure in result['batchItemFailures']}
+        except Exception as e:
+            logger.error('Batch %s failed: %s', batch_id, e, category='worker')
+            failed_ids = {record['messageId'] for record in records}
+
+        # Release unfinished records now rather than when their visibility timeout runs out
+        self.change_visibility([record for record in records if record['messageId'] in failed_ids], 0)
+
+    def wait_for_slot(self) -> None:
+        while True:
+            with self.lock:
+                futures = list(self.futures.values())
+            if len(futures) < max(self.processes, 1):
+                return
+            wait(futures, return_when=FIRST_COMPLETED)
+
+    def wait_for_batches(self) -> None:
+        with self.lock:
+            futures = list(self.futures.values())
+        wait(futures)
+
+    def extend_visibility_loop(self) -> None:
+        while not self.heartbeat_stopped.wait(self.heartbeat_interval):
+            with self.lock:
+                records = [record for batch in self.in_flight.values() for record in batch]
+            self.change_visibility(records, self.visibility_timeout)
+
+    def change_visibility(self, records: List[dict], visibility_timeout: int) -> None:
+        for start in range(0, len(records), SQS_BATCH_LIMIT):
+            entries = [
+                {'Id': str(index), 'ReceiptHandle': record['receiptHandle'], 'VisibilityTimeout': visibility_timeout}
+                for index, record in enumerate(records[start : start + SQS_BATCH_LIMIT])
+            ]
+            try:
+                response = self.sqs.change_message_visibility_batch(QueueUrl=self.queue_url, Entries=entries)
+            except (BotoCoreError, ClientError) as e:
+                logger.warning(
+                    'Failed to change the visibility of %s message(s): %s', len(entries), e, category='worker'
+                )
+                continue
+
+            # Messages the handler already deleted cannot be changed anymore
+            if response.get('Failed'):
+                logger.debug('%s visibility change(s) skipped', len(response['Failed']), category='worker')
+
+
+def get_queue_url(sqs, queue: str) -> str:
+    if queue.startswith(('http://', 'https://')):
+        return queue
+    return sqs.get_queue_url(QueueName=queue)['QueueUrl']
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Long-running email queue worker, for VMs and containers')
+    parser.add_argument('--queue', default=os.getenv('EMAIL_QUEUE'), help='Queue name or URL (default: EMAIL_QUEUE)')
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=int(os.getenv('WORKER_PROCESSES', os.cpu_count() or 1)),
+        help='Worker processes, 0 runs batches in the polling process (default: CPU count)',
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=int(os.getenv('WORKER_BATCH_SIZE', CommonConstants.WORKER_BATCH_SIZE)),
+        help='Messages per batch, at most 10',
+    )
+    parser.add_argument(
+        '--visibility-timeout',
+        type=int,
+        default=int(os.getenv('WORKER_VISIBILITY_TIMEOUT_SECONDS', CommonConstants.WORKER_VISIBILITY_TIMEOUT_SECONDS)),
+        help='Visibility timeout in seconds, extended while a batch is in flight',
+    )
+    args = parser.parse_args()
+
+    sqs_client = boto3.client('sqs')
+    queue_url = get_queue_url(sqs_client, args.queue)
+    # The handler deletes finished messages from EMAIL_QUEUE
+    os.environ['EMAIL_QUEUE'] = queue_url
+
+    queue_worker = QueueWorker(
+        queue_url=queue_url,
+        processes=args.processes,
+        batch_size=args.batch_size,
+        visibility_timeout=args.visibility_timeout,
+        sqs=sqs_client,
+    )
+    signal.signal(signal.SIGTERM, queue_worker.request_stop)
+    signal.signal(signal.SIGINT, queue_worker.request_stop)
+    queue_worker.run()